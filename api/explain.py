@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from services.explanation_jobs import READY, STREAM_ONLY, get_job, complete_job
+from services.llm_explainer import stream_explanation
+
+router = APIRouter()
+
+
+def sse_event(data: str, event: str | None = None) -> str:
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in data.split("\n")]
+    return "\n".join(lines) + "\n\n"
+
+
+def get_job_or_404(request_id: str) -> dict:
+    job = get_job(request_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired request_id")
+    return job
+
+
+@router.get("/explain/{request_id}")
+def explain(request_id: str):
+    job = get_job_or_404(request_id)
+    response = {
+        "request_id": request_id,
+        "status": job["status"],
+        "explanation": job["explanation"]
+    }
+    if job["status"] == STREAM_ONLY:
+        # Nothing generates it in the background; polling would never finish
+        response["stream_url"] = f"/api/explain/{request_id}/stream"
+    return response
+
+
+@router.get("/explain/{request_id}/stream")
+def explain_stream(request_id: str):
+    job = get_job_or_404(request_id)
+
+    def events():
+        if job["status"] == READY:
+            yield sse_event(job["explanation"])
+        else:
+            tokens = []
+            # /api/ask already missed the cache for this request
+            for token in stream_explanation(job["query"], job["results"], job["cities"], lookup=False):
+                tokens.append(token)
+                yield sse_event(token)
+            complete_job(request_id, "".join(tokens).strip())
+
+        yield sse_event("", event="done")
+
+    return StreamingResponse(events(), media_type="text/event-stream")
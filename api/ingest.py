@@ -1,7 +1,76 @@
-from fastapi import APIRouter
+import os
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+
+from models.ingest_schema import IngestRequest
+from services.ingest_jobs import PENDING, create_job, get_job, run_job
 
 router = APIRouter()
 
-@router.post("/ingest")
-def ingest():
-    return {"message": "Use script for ingestion"}
+# The API only reads CSVs from here (the CLI takes any path)
+INGEST_DATA_DIR = os.getenv("INGEST_DATA_DIR", "data/raw")
+
+
+def data_file(name: str) -> str:
+    root = os.path.realpath(INGEST_DATA_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.dirname(path) != root or not os.path.isfile(path):
+        raise HTTPException(status_code=400, detail=f"No CSV named {name} in {INGEST_DATA_DIR}")
+    return path
+
+
+def ingest_and_reload(**params) -> dict:
+    # Imported on use: pandas and the pipeline stay out of API startup
+    from services.ingestion import refresh_serving_state, run_ingest
+
+    result = run_ingest(**params)
+    # The next request loads the new store, spatial index, gazetteer and routes
+    refresh_serving_state()
+    return result
+
+
+@router.post("/ingest", status_code=202)
+def ingest(background_tasks: BackgroundTasks, request: Optional[IngestRequest] = None):
+    from services.ingestion import resolve_csv_path
+
+    request = request or IngestRequest()
+    try:
+        csv_path = data_file(request.csv) if request.csv else resolve_csv_path(request.city)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job_id = create_job({
+        "city": request.city,
+        "csv_path": csv_path,
+        "chunk_size": request.chunk_size,
+        "full": request.full,
+        "rebuild": request.rebuild,
+        "drop_previous": request.drop_previous
+    })
+    if job_id is None:
+        raise HTTPException(status_code=409, detail="Another ingest is already running")
+
+    background_tasks.add_task(run_job, job_id, ingest_and_reload)
+    return {
+        "job_id": job_id,
+        "status": PENDING,
+        "status_url": f"/api/ingest/{job_id}"
+    }
+
+
+@router.get("/ingest/{job_id}")
+def ingest_status(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job_id")
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "city": job["params"]["city"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"]
+    }
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response
 from models.query_schema import UserQuery
+from models.amenities import Amenity, mask_from_names, names_from_mask
 
-from services.embedding import embed
+from services.embedding import aembed
 from services.geocoding import geocode
-from services.query_parser import parse_query
+from services.gazetteer import focus_locality
+from services.city_router import get_router
+from services.spatial_index import result_distances
+from services.relevance import rerank
+from services.query_parser import extract, parse_query
 from services.llm_explainer import explain_results
-from db.vector_db import geo_vector_search
+from services.explanation_jobs import create_job, run_job
+from services.explanation_cache import cached_explanation
+from services.metrics import REJECTIONS, REQUEST_ERRORS, timed
+from db.vector_db import geo_vector_search, preference_conditions
+from db.property_store import get_property_store
 
 router = APIRouter()
 
@@ -14,42 +29,86 @@ from services.logger import get_logger
 
 logger = get_logger(__name__)
 
-SUPPORTED_CITY = os.getenv("SUPPORTED_CITY", "mumbai")
+# Query embedding is CPU-bound: keep it off the default pool used for I/O
+# (only used with EMBEDDING_BATCHING=false; the batcher has its own thread)
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "2"))
+embed_executor = ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="embed")
+
+# Results returned per request, and candidates fetched for hybrid re-ranking
+RESULT_LIMIT = 5
+HYBRID_CANDIDATE_POOL = int(os.getenv("HYBRID_CANDIDATE_POOL", "50"))
+
 
 #  Domain intent guard
 def is_real_estate_query(text: str) -> bool:
-    keywords = [
-        "flat", "flats", "apartment", "house", "bhk",
-        "property", "properties", "home",
-        "rent", "buy", "sale", "resale",
-        "lac", "lakh", "crore", "budget",
-        "sqft", "square", "area",
-        "gym", "parking", "lift"
-    ]
-    text = text.lower()
-    return any(word in text for word in keywords)
+    return extract(text)["is_real_estate"]
 
 
 #  City extraction from query
 def extract_city_from_query(text: str):
-    cities = ["mumbai", "pune", "delhi", "bangalore", "chennai", "hyderabad"]
-    text = text.lower()
-    for city in cities:
-        if city in text:
-            return city
-    return None
+    return extract(text)["city"]
+
+
+def explanation_links(request_id, mode) -> dict:
+    if request_id is None:
+        return {}
+    url = f"/api/explain/{request_id}"
+    return {
+        "request_id": request_id,
+        "explanation_url": f"{url}/stream" if mode == "stream" else url
+    }
+
+
+class StageTimer:
+    """
+    Collects per-stage wall-clock timings for the Server-Timing header.
+    """
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = (time.perf_counter() - started) * 1000
+
+    async def run(self, stage, func, *args, executor=None):
+        loop = asyncio.get_running_loop()
+        with self.measure(stage):
+            return await loop.run_in_executor(executor, func, *args)
+
+    async def wait(self, stage, awaitable):
+        with self.measure(stage):
+            return await awaitable
+
+    def header(self) -> str:
+        return ", ".join(
+            f"{stage};dur={ms:.1f}" for stage, ms in self.timings.items()
+        )
 
 
 #  Main endpoint
 @router.post("/ask")
-def ask(query: UserQuery):
+async def ask(query: UserQuery, response: Response, background_tasks: BackgroundTasks):
+    timer = StageTimer()
+    try:
+        return await _ask(query, timer, background_tasks)
+    finally:
+        response.headers["Server-Timing"] = timer.header()
+
+
+async def _ask(query: UserQuery, timer: StageTimer, background_tasks: BackgroundTasks):
     try:
         logger.info(
-     f"Incoming request | query='{query.query}' | location='{query.location}'"
+     "Incoming request | query='%s' | location='%s'", query.query, query.location
 )
 
         #  Parse intent
-        parsed = parse_query(query.query)
+        with timer.measure("parse"):
+            parsed = parse_query(query.query)
 
     
         bhk = query.bhk if query.bhk not in (None, 0) else parsed.get("bhk")
@@ -58,7 +117,11 @@ def ask(query: UserQuery):
             if query.max_price not in (None, 0)
             else parsed.get("max_price")
         )
-        require_gym = query.require_gym or parsed.get("require_gym", False)
+        amenities = mask_from_names(parsed.get("amenities", []))
+        if query.require_gym:
+            amenities |= Amenity.GYMNASIUM
+        require_gym = bool(amenities & Amenity.GYMNASIUM)
+        min_price = parsed.get("min_price")
 
         
         #  Normalize filter types (look into this later something fishy here)
@@ -69,14 +132,16 @@ def ask(query: UserQuery):
         if max_price is not None:
             max_price = int(max_price)
         logger.debug(
-    f"Parsed filters | bhk={bhk}, max_price={max_price}, require_gym={require_gym}"
+    "Parsed filters | bhk=%s, min_price=%s, max_price=%s, amenities=%s",
+    bhk, min_price, max_price, names_from_mask(amenities)
 )
 
 
 
         #  Reject non–real-estate queries
-        if not is_real_estate_query(query.query):
+        if not parsed["is_real_estate"]:
             logger.warning("Rejected query: not real estate related")
+            REJECTIONS.inc(reason="non_real_estate")
 
             return {
                 "query": query.query,
@@ -89,15 +154,16 @@ def ask(query: UserQuery):
             }
 
         #  Enforce query–location consistency
-        mentioned_city = extract_city_from_query(query.query)
+        mentioned_city = parsed["city"]
         requested_location = query.location.lower()
 
         if mentioned_city and mentioned_city not in requested_location:
 
             logger.warning(
-    f"Rejected query: city mismatch | query_city={mentioned_city}, "
-    f"location={query.location}"
+    "Rejected query: city mismatch | query_city=%s, location=%s",
+    mentioned_city, query.location
 )
+            REJECTIONS.inc(reason="city_mismatch")
 
             
             return {
@@ -111,12 +177,16 @@ def ask(query: UserQuery):
                 )
             }
 
-        #  Dataset scope guard (Mumbai only)
-        if SUPPORTED_CITY not in requested_location:
+        #  Dataset scope guard: route to the collections of the cities the location names
+        router = get_router()
+        cities = router.route(query.location, mentioned_city)
+        if not cities:
             logger.warning(
-    f"Rejected query: unsupported city '{query.location}'"
+    "Rejected query: unsupported city '%s'", query.location
 )
+            REJECTIONS.inc(reason="unsupported_city")
 
+            supported = ", ".join(city.title() for city in router.cities) or "no"
             return {
                 "query": query.query,
                 "interpreted_filters": {
@@ -126,93 +196,92 @@ def ask(query: UserQuery):
                 },
                 "results": [],
                 "explanation": (
-                    "This dataset currently supports Mumbai locations only. "
+                    f"This dataset currently supports {supported} locations only. "
                     f"No properties were found for {query.location}."
                 )
             }
 
-        #  Geocode location
-        logger.debug(f"Geocoding location: {query.location}")
+        #  Centre the search on a locality named in the query when the
+        #  selected location is just the city ("flat in Bandra", "Mumbai")
+        search_location = query.location
+        locality = focus_locality(query.query, query.location)
+        if locality is not None:
+            search_location = f"{locality['name']}, {query.location}"
+
+        #  Geocode location (I/O) and embed query (CPU) concurrently
+        logger.debug("Geocoding location: %s", search_location)
 
-        coords = geocode(f"{query.location}, India")
+        coords, query_vector = await asyncio.gather(
+            timer.run("geocode", geocode, f"{search_location}, India"),
+            timer.wait("embed", aembed(query.query, embed_executor))
+        )
         if not coords:
-            logger.error(f"Geocoding failed for location: {query.location}")
+            logger.error("Geocoding failed for location: %s", query.location)
             raise ValueError("Location not found")
 
         lat, lon = coords
 
-        #  Embed query
-        query_vector = embed(query.query)
-
-        #  Vector + geo search
+        #  Vector + geo search (preferences pushed into the index in hard mode)
+        conditions = None
+        required_amenities = 0
+        limit = RESULT_LIMIT
+        if query.filter_mode == "hard":
+            conditions = preference_conditions(bhk, max_price, min_price)
+            required_amenities = amenities
+        elif query.filter_mode == "hybrid":
+            limit = query.candidate_pool or HYBRID_CANDIDATE_POOL
 
         logger.debug("Calling vector + geo search")
 
-        results = geo_vector_search(
-            vector=query_vector,
-            latitude=lat,
-            longitude=lon,
-            radius_km=query.radius_km
+        results = await timer.run(
+            "search",
+            lambda: geo_vector_search(
+                vector=query_vector,
+                latitude=lat,
+                longitude=lon,
+                radius_km=query.radius_km,
+                limit=limit,
+                conditions=conditions,
+                required_amenities=required_amenities,
+                hnsw_ef=query.hnsw_ef,
+                exact=query.exact,
+                collections=router.collections(cities)
+            )
         )
-        logger.info(f"Vector DB returned {len(results.points)} candidates")
-
-        logger.debug("Applying filters to vector results")
-        clean_results = []
-        for r in results.points:
-            p = r.payload
-
-            score = r.score
-            reasons = []
-
-            #  SOFT BHK preference
-            if bhk not in (None, 0):
-                if p.get("bhk") == bhk:
-                    score += 0.15
-                    reasons.append(f"{bhk} BHK matched")
-                else:
-                    reasons.append("Different BHK")
-
-            #  SOFT price preference
-            if max_price not in (None, 0):
-                if p.get("price") <= max_price:
-                    score += 0.15
-                    reasons.append("Within budget")
-                else:
-                    reasons.append("Above budget")
-
-            #  SOFT gym preference
-            if require_gym:
-                if "Gymnasium" in p.get("amenities", []):
-                    score += 0.1
-                    reasons.append("Gym available")
-                else:
-                    reasons.append("No gym")
-
-            if not reasons:
-                reasons.append("Semantically relevant")
-
-            clean_results.append({
-                "locality": p.get("locality"),
-                "price": p.get("price"),
-                "bhk": p.get("bhk"),
-                "area_sqft": p.get("area_sqft"),
-                "amenities": p.get("amenities", [])[:5],
-                "score": round(score, 3),
-                "reason": ", ".join(reasons)
-            })
-        logger.info(f"Results after filtering: {len(clean_results)}")
-
-        # Sort by final relevance
-        clean_results.sort(key=lambda x: x["score"], reverse=True)
-
-        #  Explanation
+        logger.info("Vector DB returned %d candidates", len(results.points))
+
+        with timer.measure("rerank"), timed("rerank"):
+            logger.debug("Applying filters to vector results")
+            distances = result_distances(lat, lon, results.points)
+            # Sorted by final relevance, reasons built for the returned results only
+            clean_results = rerank(
+                results.points, bhk, max_price, amenities, min_price, distances,
+                top_k=RESULT_LIMIT, store=get_property_store()
+            )
+            logger.info("Results after filtering: %d", len(clean_results))
+
+        #  Explanation (off the critical path unless inline was requested)
+        request_id = None
+        explanation = None
         if not clean_results:
             explanation = (
                 f"No properties were found in {query.location}. "
                 "Try adjusting filters or using a broader search."
             )
-        else:
-            explanation = explain_results(query.query, clean_results)
+        elif query.explanation_mode == "inline":
+            explanation = await timer.run(
+                "explain", explain_results, query.query, clean_results, cities
+            )
+        elif query.explanation_mode in ("async", "stream"):
+            # Popular searches are answered from the cache right away; the
+            # job skips the lookup, so a request counts as one hit or miss
+            explanation = cached_explanation(query.query, clean_results, cities)
+            if explanation is None:
+                request_id = create_job(
+                    query.query, clean_results, cities, stream=query.explanation_mode == "stream"
+                )
+                if query.explanation_mode == "async":
+                    background_tasks.add_task(run_job, request_id, partial(explain_results, lookup=False))
 
         #  Final response
         logger.info("Request processed successfully")
@@ -220,17 +289,23 @@ def ask(query: UserQuery):
             "query": query.query,
             "interpreted_filters": {
                 "bhk": bhk,
+                "min_price": min_price,
                 "max_price": max_price,
-                "require_gym": require_gym
+                "require_gym": require_gym,
+                "amenities": names_from_mask(amenities),
+                "cities": cities,
+                "filter_mode": query.filter_mode
             },
             "results": clean_results,
-            "explanation": explanation
+            "explanation": explanation,
+            **explanation_links(request_id, query.explanation_mode)
         }
 
     # except Exception as e:
     #     raise HTTPException(status_code=400, detail=str(e))
     except Exception:
        logger.exception("Unhandled error in /api/ask")
+       REQUEST_ERRORS.inc(endpoint="/api/ask")
        raise HTTPException(
         status_code=400,
         detail="Internal error while processing request"
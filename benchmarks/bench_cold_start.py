@@ -0,0 +1,61 @@
+"""
+Cold-start time of each entry point, each in a fresh interpreter:
+importing the API app, importing the ingest script, pytest collection,
+and the API's warm-up (model load + Qdrant bootstrap).
+
+    python -m benchmarks.bench_cold_start --runs 5 --out cold_start.json
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import summarize, write_report
+
+ENTRY_POINTS = {
+    "import_api": [sys.executable, "-c", "import main"],
+    "import_ingest": [sys.executable, "-c", "import scripts.ingest_dataset"],
+    "pytest_collect": [sys.executable, "-m", "pytest", "--collect-only", "-q"],
+    "api_warm_up": [sys.executable, "-c", "import main; main.warm_up()"]
+}
+
+
+def run_once(command: list[str], env: dict, timeout: float) -> tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(command, env=env, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return time.perf_counter() - started, False
+    return time.perf_counter() - started, completed.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", choices=list(ENTRY_POINTS), action="append",
+                        help="measure only these entry points")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds before a run counts as failed")
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    # A throwaway embedded Qdrant, so runs don't touch (or lock) the real one
+    env = {**os.environ, "QDRANT_PATH": tempfile.mkdtemp(prefix="georag-cold-")}
+    env.pop("QDRANT_URL", None)
+
+    results = {}
+    for name in args.only or ENTRY_POINTS:
+        timings, failures = [], 0
+        for _ in range(args.runs):
+            seconds, ok = run_once(ENTRY_POINTS[name], env, args.timeout)
+            timings.append(seconds)
+            failures += not ok
+        results[name] = {**summarize(timings), "failures": failures}
+        print(f"{name:<16} p50={results[name]['p50_ms']:.0f}ms max={results[name]['max_ms']:.0f}ms failures={failures}")
+
+    write_report(args.out, "cold_start", results, {"runs": args.runs})
+
+
+if __name__ == "__main__":
+    main()
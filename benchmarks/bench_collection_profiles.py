@@ -0,0 +1,157 @@
+"""
+Recall vs latency of the collection profiles (quantization, on-disk
+vectors, HNSW m / ef_construct) at several search-time hnsw_ef values,
+on Mumbai1.csv listing vectors.
+
+Recall@k is measured against an exact NumPy search. --scale grows the
+dataset with jittered copies of the real vectors to preview millions of
+listings. Needs a Qdrant server: the embedded mode always searches
+exactly, so every profile would score the same.
+
+    QDRANT_URL=http://localhost:6333 python -m benchmarks.bench_collection_profiles \\
+        --scale 1000000 --ef 32 64 128 256 --out profiles.json
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import SAMPLE_QUERIES, summarize, write_report
+
+UPLOAD_BATCH = 1000
+
+
+def dataset_vectors(csv_path: str, cache_path: str | None) -> np.ndarray:
+    if cache_path and os.path.exists(cache_path):
+        return np.load(cache_path)
+
+    from services.ingestion import build_amenities, build_texts
+    from services.embedding import embed_batch
+
+    raw = pd.read_csv(csv_path)
+    chunk = pd.DataFrame({
+        "locality": raw["Location"],
+        "bhk": raw["No. of Bedrooms"].astype(int),
+        "price": raw["Price"].astype(float),
+        "area_sqft": raw["Area"].astype(float),
+    })
+    chunk["amenities"] = build_amenities(raw)
+    vectors = embed_batch(build_texts(chunk).tolist())
+    if cache_path:
+        np.save(cache_path, vectors)
+    return vectors
+
+
+def normalized(vectors: np.ndarray) -> np.ndarray:
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def scaled(vectors: np.ndarray, size: int, rng, jitter: float = 0.05) -> np.ndarray:
+    if size <= len(vectors):
+        return vectors[:size]
+    picks = rng.integers(0, len(vectors), size - len(vectors))
+    copies = vectors[picks] + rng.normal(0, jitter, (len(picks), vectors.shape[1])).astype(np.float32)
+    return normalized(np.vstack([vectors, copies]))
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> list[set]:
+    truth = []
+    for query in queries:
+        scores = vectors @ query
+        truth.append(set(np.argpartition(-scores, k)[:k].tolist()))
+    return truth
+
+
+def wait_for_index(client, name: str, timeout: float = 3600):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        info = client.get_collection(name)
+        if info.status.value == "green":
+            return
+        time.sleep(1)
+    raise TimeoutError(f"{name} still indexing after {timeout:.0f}s")
+
+
+def build(client, name: str, profile, vectors: np.ndarray) -> float:
+    started = time.perf_counter()
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(collection_name=name, **profile.collection_config())
+    client.upload_collection(
+        collection_name=name, vectors=vectors, ids=range(len(vectors)), batch_size=UPLOAD_BATCH
+    )
+    wait_for_index(client, name)
+    return time.perf_counter() - started
+
+
+def measure(client, name: str, profile, queries, truth, k: int, hnsw_ef: int) -> dict:
+    params = profile.search_params(hnsw_ef=hnsw_ef)
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        result = client.query_points(collection_name=name, query=query, limit=k, search_params=params)
+        latencies.append(time.perf_counter() - t0)
+        hits += len(expected & {p.id for p in result.points})
+    return {**summarize(latencies), "recall": round(hits / (k * len(queries)), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="data/raw/Mumbai1.csv")
+    parser.add_argument("--vectors-cache", help="reuse (or write) the embedded dataset vectors here")
+    parser.add_argument("--scale", type=int, help="grow the dataset to this many vectors")
+    parser.add_argument("--profiles", nargs="+", help="default: all of COLLECTION_PROFILES")
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="leave the benchmark collections in place")
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    from qdrant_client import QdrantClient
+    from db.vector_db import COLLECTION_PROFILES
+    from services.embedding import embed_batch
+
+    url = os.getenv("QDRANT_URL")
+    if not url:
+        print("⚠ QDRANT_URL not set: the embedded mode searches exactly, so profiles won't differ")
+    client = QdrantClient(url=url) if url else QdrantClient(":memory:")
+
+    rng = np.random.default_rng(args.seed)
+    vectors = normalized(dataset_vectors(args.csv, args.vectors_cache))
+    vectors = scaled(vectors, args.scale or len(vectors), rng)
+
+    # Real queries, then held-out-style perturbed listings
+    queries = normalized(np.asarray(embed_batch(SAMPLE_QUERIES)))
+    extra = max(0, args.queries - len(queries))
+    picks = vectors[rng.integers(0, len(vectors), extra)]
+    queries = np.vstack([queries, normalized(picks + rng.normal(0, 0.1, picks.shape).astype(np.float32))])
+    truth = exact_top_k(vectors, queries, args.k)
+
+    results = {}
+    for name in args.profiles or COLLECTION_PROFILES:
+        profile = COLLECTION_PROFILES[name]
+        collection = f"bench_profile_{name.replace('-', '_')}"
+        build_seconds = build(client, collection, profile, vectors)
+        results[name] = {"build_s": round(build_seconds, 1), "ef": {}}
+        for ef in args.ef:
+            summary = measure(client, collection, profile, queries, truth, args.k, ef)
+            results[name]["ef"][ef] = summary
+            print(f"{name:<12} ef={ef:<4} recall@{args.k}={summary['recall']:.3f} "
+                  f"p50={summary['p50_ms']:.2f}ms p99={summary['p99_ms']:.2f}ms")
+        if not args.keep:
+            client.delete_collection(collection)
+
+    write_report(args.out, "collection_profiles", results, {
+        "vectors": len(vectors),
+        "queries": len(queries),
+        "k": args.k,
+        "qdrant": "server" if url else "embedded"
+    })
+
+
+if __name__ == "__main__":
+    main()
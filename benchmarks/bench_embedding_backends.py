@@ -0,0 +1,124 @@
+"""
+Embedding backends (torch, onnx, onnx-int8) compared on load time, peak
+memory, single-query latency and batched throughput, plus a parity check:
+cosine similarity of each backend's vectors to the torch reference.
+
+Each backend runs in its own interpreter so memory is measured cleanly.
+
+    python -m benchmarks.bench_embedding_backends --out backends.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import SAMPLE_QUERIES, time_calls, write_report
+
+# Ingest-style texts for the batch measurement and the parity check
+DOCUMENTS = [
+    f"{bhk} BHK apartment in {locality}, Mumbai. Area: {area} sqft. Price: {price}. Amenities: {amenities}"
+    for bhk, locality, area, price, amenities in [
+        (1, "Andheri West", 550, 7500000, "Gymnasium, Lift Available"),
+        (2, "Powai", 900, 15000000, "Swimming Pool, Clubhouse, 24x7 Security"),
+        (3, "Bandra West", 1400, 42000000, "Car Parking, Intercom"),
+        (2, "Kharghar", 1000, 8200000, "Basic amenities"),
+        (4, "Juhu", 2600, 90000000, "Landscaped Gardens, Jogging Track, Indoor Games")
+    ]
+]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(backend: str, vectors_path: str, repeat: int, batch_size: int) -> dict:
+    from services.embedding import load_model
+
+    started = time.perf_counter()
+    model = load_model(backend)
+    load_seconds = time.perf_counter() - started
+
+    model.encode("warm up")
+    texts = SAMPLE_QUERIES + DOCUMENTS
+    np.save(vectors_path, model.encode(texts, convert_to_numpy=True))
+
+    batch = DOCUMENTS * (batch_size // len(DOCUMENTS) + 1)
+    return {
+        "load_s": round(load_seconds, 3),
+        "query": time_calls(model.encode, [(q,) for q in SAMPLE_QUERIES], repeat),
+        "batch": time_calls(lambda: model.encode(batch[:batch_size], batch_size=batch_size), [()], repeat),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def cosine_parity(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosine = np.sum(reference * candidate, axis=1)
+    return {"min_cosine": round(float(cosine.min()), 5), "mean_cosine": round(float(cosine.mean()), 5)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--min-cosine", type=float, default=0.99,
+                        help="parity threshold against the torch vectors")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--vectors", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.vectors, args.repeat, args.batch_size)))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="georag-backends-")
+    backends = ["torch"] + [b for b in args.backends if b != "torch"]
+    results, vectors = {}, {}
+    for backend in backends:
+        path = os.path.join(workdir, f"{backend}.npy")
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_embedding_backends", "--worker", backend,
+             "--vectors", path, "--repeat", str(args.repeat), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            print(f"{backend:<10} failed: {completed.stderr.strip().splitlines()[-1:]}")
+            results[backend] = {"error": completed.stderr.strip().splitlines()[-1:]}
+            continue
+        results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+        vectors[backend] = np.load(path)
+
+    failed_parity = []
+    for backend, result in results.items():
+        if backend in vectors and "torch" in vectors:
+            result["parity"] = cosine_parity(vectors["torch"], vectors[backend])
+            if result["parity"]["min_cosine"] < args.min_cosine:
+                failed_parity.append(backend)
+        if "error" not in result:
+            print(
+                f"{backend:<10} load={result['load_s']:.2f}s rss={result['peak_rss_mb']:.0f}MB "
+                f"query p50={result['query']['p50_ms']:.2f}ms batch p50={result['batch']['p50_ms']:.1f}ms "
+                f"min_cos={result.get('parity', {}).get('min_cosine')}"
+            )
+
+    write_report(args.out, "embedding_backends", results, {
+        "repeat": args.repeat,
+        "batch_size": args.batch_size,
+        "min_cosine": args.min_cosine
+    })
+    if failed_parity:
+        sys.exit(f"Parity below {args.min_cosine} for: {', '.join(failed_parity)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Throughput of query embedding with and without micro-batching, called
+directly or (--through-api) via concurrent /api/ask requests, with the
+search stubbed out so the embedding stage dominates.
+
+    python -m benchmarks.bench_embedding_batcher --requests 512
+    python -m benchmarks.bench_embedding_batcher --requests 512 --through-api
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from services.embedding import get_model, embed_batch
+from services.embedding_batcher import EmbeddingBatcher
+
+CONCURRENCY_LEVELS = [1, 8, 32, 128]
+
+QUERIES = [
+    "2 bhk flat under 80 lakh in andheri west with gym",
+    "3 bhk apartment under 1.5 crore near powai lake",
+    "1 bhk flat for rent in kharghar",
+    "spacious 4 bhk with swimming pool and clubhouse",
+    "affordable home near thane station under 50 lac",
+    "resale flat in navi mumbai with car parking"
+]
+
+
+def run(embed_fn, concurrency: int, total: int) -> float:
+    texts = [f"{QUERIES[i % len(QUERIES)]} #{i}" for i in range(total)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(embed_fn, texts))
+    return total / (time.perf_counter() - started)
+
+
+def run_api(concurrency: int, total: int, batching: bool, batch_sizes: list) -> float:
+    import httpx
+
+    import services.embedding as embedding
+    from main import app
+    from services.city_router import CityRouter
+
+    # Unique texts and a cold cache, so every request reaches the model
+    texts = [f"{QUERIES[i % len(QUERIES)]} {i}" for i in range(total)]
+    embedding.query_cache.clear()
+    counter = iter(texts)
+    router = CityRouter({"mumbai": {"collection": "properties"}})
+
+    async def drive():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench"
+        ) as client:
+
+            async def worker():
+                for text in counter:
+                    payload = {"query": text, "location": "Mumbai", "explanation_mode": "none"}
+                    r = await client.post("/api/ask", json=payload)
+                    r.raise_for_status()
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    def counted(texts):
+        batch_sizes.append(len(texts))
+        return embed_batch(texts)
+
+    with patch.object(embedding, "EMBEDDING_BATCHING", batching), \
+            patch.object(embedding.batcher, "encode_batch", counted), \
+            patch("api.query.geocode", return_value=(19.076, 72.8777)), \
+            patch("api.query.get_router", return_value=router), \
+            patch("api.query.geo_vector_search", return_value=SimpleNamespace(points=[])):
+        started = time.perf_counter()
+        asyncio.run(drive())
+        return total / (time.perf_counter() - started)
+
+
+def main_api(args):
+    from services.embedding import aembed
+
+    get_model().encode("warm up")
+    asyncio.run(aembed("warm up"))
+
+    rows = []
+    print(f"{'callers':>8} {'direct q/s':>12} {'batched q/s':>12} {'mean batch':>11} {'speedup':>8}")
+    for concurrency in CONCURRENCY_LEVELS:
+        direct = run_api(concurrency, args.requests, False, [])
+        sizes = []
+        batched = run_api(concurrency, args.requests, True, sizes)
+        mean_batch = sum(sizes) / len(sizes) if sizes else 0.0
+        rows.append({
+            "concurrency": concurrency,
+            "direct_qps": round(direct, 1),
+            "batched_qps": round(batched, 1),
+            "mean_batch": round(mean_batch, 1)
+        })
+        print(f"{concurrency:>8} {direct:>12.1f} {batched:>12.1f} {mean_batch:>11.1f} {batched / direct:>7.2f}x")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--through-api", action="store_true",
+                        help="send the queries through /api/ask (EMBEDDING_BATCH_WINDOW_MS / EMBEDDING_MAX_BATCH apply)")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.through_api:
+        rows = main_api(args)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump({"benchmark": "embedding_batcher_api", "results": rows}, f, indent=2)
+        return
+
+    batcher = EmbeddingBatcher(embed_batch, args.max_batch, args.window_ms)
+
+    # Warm up both paths so model load / first-call costs are excluded
+    model = get_model()
+    model.encode("warm up")
+    batcher.embed("warm up")
+
+    rows = []
+    print(f"{'callers':>8} {'direct q/s':>12} {'batched q/s':>12} {'speedup':>8}")
+    for concurrency in CONCURRENCY_LEVELS:
+        direct = run(model.encode, concurrency, args.requests)
+        batched = run(batcher.embed, concurrency, args.requests)
+        rows.append({
+            "concurrency": concurrency,
+            "direct_qps": round(direct, 1),
+            "batched_qps": round(batched, 1)
+        })
+        print(f"{concurrency:>8} {direct:>12.1f} {batched:>12.1f} {batched / direct:>7.2f}x")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "benchmark": "embedding_batcher",
+                "window_ms": args.window_ms,
+                "max_batch": args.max_batch,
+                "results": rows
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
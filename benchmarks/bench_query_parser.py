@@ -0,0 +1,125 @@
+"""
+Single-pass query extractor vs the previous regex/substring functions.
+
+The legacy path is what one /api/ask request used to run: parse_query
+plus the is_real_estate_query and extract_city_from_query guards, each
+lowercasing and rescanning the text.
+
+    python -m benchmarks.bench_query_parser --out parser.json
+"""
+import argparse
+import re
+
+from services.query_parser import extract
+from benchmarks.common import SAMPLE_QUERIES, time_calls, write_report
+
+
+# --- Legacy copies, kept verbatim for comparison -------------------------
+
+def legacy_parse_query(text: str) -> dict:
+    text = text.lower()
+
+    filters = {
+        "bhk": None,
+        "max_price": None,
+        "require_gym": False
+    }
+
+    bhk_match = re.search(r"(\d+)\s*bhk", text)
+    if bhk_match:
+        filters["bhk"] = int(bhk_match.group(1))
+
+    price_match = re.search(r"(\d+(?:\.\d+)?)\s*(lac|lakh)", text)
+    if price_match:
+        filters["max_price"] = int(float(price_match.group(1)) * 100_000)
+
+    price_match = re.search(r"(\d+(?:\.\d+)?)\s*(cr|crore)", text)
+    if price_match:
+        filters["max_price"] = int(float(price_match.group(1)) * 10_000_000)
+
+    if "gym" in text:
+        filters["require_gym"] = True
+
+    return filters
+
+
+def legacy_is_real_estate_query(text: str) -> bool:
+    keywords = [
+        "flat", "flats", "apartment", "house", "bhk",
+        "property", "properties", "home",
+        "rent", "buy", "sale", "resale",
+        "lac", "lakh", "crore", "budget",
+        "sqft", "square", "area",
+        "gym", "parking", "lift"
+    ]
+    text = text.lower()
+    return any(word in text for word in keywords)
+
+
+def legacy_extract_city_from_query(text: str):
+    cities = ["mumbai", "pune", "delhi", "bangalore", "chennai", "hyderabad"]
+    text = text.lower()
+    for city in cities:
+        if city in text:
+            return city
+    return None
+
+
+def legacy_request(text: str):
+    return (
+        legacy_parse_query(text),
+        legacy_is_real_estate_query(text),
+        legacy_extract_city_from_query(text)
+    )
+
+
+# -------------------------------------------------------------------------
+
+def check_agreement(queries) -> list[str]:
+    """
+    Queries where the new extractor disagrees with the legacy functions.
+    """
+    mismatches = []
+    for text in queries:
+        new = extract(text)
+        old = legacy_parse_query(text)
+        if (
+            {k: new[k] for k in old} != old
+            or new["is_real_estate"] != legacy_is_real_estate_query(text)
+            or new["city"] != legacy_extract_city_from_query(text)
+        ):
+            mismatches.append(text)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    queries = [(q,) for q in SAMPLE_QUERIES]
+    results = {
+        "legacy_parse_query": time_calls(legacy_parse_query, queries, args.repeat),
+        "legacy_request": time_calls(legacy_request, queries, args.repeat),
+        "extract": time_calls(extract, queries, args.repeat)
+    }
+
+    for name, summary in results.items():
+        print(f"{name:<20} p50={summary['p50_ms']:.4f}ms p99={summary['p99_ms']:.4f}ms")
+
+    speedup = results["legacy_request"]["p50_ms"] / max(results["extract"]["p50_ms"], 1e-9)
+    print(f"Per-request speedup (p50): {speedup:.2f}x")
+
+    # Differences are expected where the new parser is stricter or richer
+    # (word boundaries, ranges, "under X"); list them so they can be reviewed
+    mismatches = check_agreement(SAMPLE_QUERIES)
+    for text in mismatches:
+        print(f"  differs: {text}")
+    results["mismatches"] = mismatches
+
+    write_report(args.out, "query_parser", results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
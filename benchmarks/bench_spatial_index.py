@@ -0,0 +1,83 @@
+"""
+Grid spatial index vs a full haversine scan over every point.
+
+Points are scattered around Mumbai; queries are radius and k-nearest
+lookups from random centres inside the same area.
+
+    python -m benchmarks.bench_spatial_index --points 100000 --out spatial.json
+"""
+import argparse
+
+import numpy as np
+
+from services.spatial_index import SpatialIndex, haversine_km
+from benchmarks.common import time_calls, write_report
+
+CENTER_LAT, CENTER_LON = 19.12, 72.88
+SPREAD_DEG = 0.4
+
+
+def full_scan_radius(ids, lats, lons, lat, lon, radius_km):
+    distances = haversine_km(lat, lon, lats, lons)
+    inside = np.flatnonzero(distances <= radius_km)
+    order = np.argsort(distances[inside], kind="stable")
+    return ids[inside[order]], distances[inside[order]]
+
+
+def full_scan_nearest(ids, lats, lons, lat, lon, k):
+    distances = haversine_km(lat, lon, lats, lons)
+    order = np.argsort(distances, kind="stable")[:k]
+    return ids[order], distances[order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--radius-km", type=float, default=5)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    ids = np.arange(args.points, dtype=np.int64)
+    lats = CENTER_LAT + rng.uniform(-SPREAD_DEG, SPREAD_DEG, args.points)
+    lons = CENTER_LON + rng.uniform(-SPREAD_DEG, SPREAD_DEG, args.points)
+    centres = [
+        (CENTER_LAT + rng.uniform(-SPREAD_DEG, SPREAD_DEG), CENTER_LON + rng.uniform(-SPREAD_DEG, SPREAD_DEG))
+        for _ in range(args.queries)
+    ]
+
+    index = SpatialIndex(ids, lats, lons)
+
+    # Same answers, or the timings mean nothing
+    for lat, lon in centres[:20]:
+        got, _ = index.radius(lat, lon, args.radius_km)
+        want, _ = full_scan_radius(ids, lats, lons, lat, lon, args.radius_km)
+        assert np.array_equal(np.sort(got), np.sort(want))
+
+    results = {
+        "grid_radius": time_calls(index.radius, [(lat, lon, args.radius_km) for lat, lon in centres]),
+        "scan_radius": time_calls(
+            full_scan_radius, [(ids, lats, lons, lat, lon, args.radius_km) for lat, lon in centres]
+        ),
+        "grid_nearest": time_calls(index.nearest, [(lat, lon, args.k) for lat, lon in centres]),
+        "scan_nearest": time_calls(
+            full_scan_nearest, [(ids, lats, lons, lat, lon, args.k) for lat, lon in centres]
+        )
+    }
+
+    for name, summary in results.items():
+        print(f"{name:<14} p50={summary['p50_ms']:.4f}ms p99={summary['p99_ms']:.4f}ms")
+
+    write_report(args.out, "spatial_index", results, {
+        "points": args.points,
+        "queries": args.queries,
+        "radius_km": args.radius_km,
+        "k": args.k
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+# Representative /api/ask queries (mix of BHK, budget, amenity and plain searches)
+SAMPLE_QUERIES = [
+    "2 bhk flat under 80 lakh with gym",
+    "3 bhk apartment under 1.5 crore",
+    "1 bhk flat for rent near station",
+    "spacious 4 bhk with swimming pool and clubhouse",
+    "affordable home under 50 lac",
+    "resale flat with car parking and lift",
+    "2 bhk property with jogging track",
+    "flat near metro station"
+]
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], elapsed: float | None = None) -> dict:
+    """
+    Latency distribution in milliseconds (input in seconds), plus QPS.
+    """
+    values = sorted(latencies)
+    summary = {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values) * 1000, 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 4),
+        "p95_ms": round(percentile(values, 95) * 1000, 4),
+        "p99_ms": round(percentile(values, 99) * 1000, 4),
+        "max_ms": round(values[-1] * 1000, 4) if values else 0.0
+    }
+    if elapsed:
+        summary["qps"] = round(len(values) / elapsed, 2)
+    return summary
+
+
+def time_calls(func, args_list, repeat: int = 1) -> dict:
+    """
+    Times func(*args) for every args tuple, `repeat` times over.
+    """
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            t0 = time.perf_counter()
+            func(*args)
+            latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(path: str | None, benchmark: str, results: dict, config: dict | None = None):
+    report = {
+        "benchmark": benchmark,
+        "git_revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config or {},
+        "results": results
+    }
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+        print(f"📝 Report written to {path}")
+    else:
+        print(text)
+    return report
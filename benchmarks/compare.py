@@ -0,0 +1,51 @@
+"""
+Compares two benchmark reports (e.g. from two commits).
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "qps"]
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """
+    {name: summary} pairs for every nested summary in a report.
+    """
+    rows = {}
+    if any(metric in results for metric in METRICS):
+        rows[prefix or "total"] = results
+    for key, value in results.items():
+        if isinstance(value, dict):
+            rows.update(flatten(value, f"{prefix}.{key}" if prefix else key))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"{before.get('git_revision')} -> {after.get('git_revision')}")
+    old_rows = flatten(before["results"])
+    new_rows = flatten(after["results"])
+
+    for name in sorted(old_rows.keys() & new_rows.keys()):
+        cells = []
+        for metric in METRICS:
+            if metric in old_rows[name] and metric in new_rows[name]:
+                old, new = old_rows[name][metric], new_rows[name][metric]
+                change = (new - old) / old * 100 if old else 0.0
+                cells.append(f"{metric}={new:.3f} ({change:+.1f}%)")
+        print(f"{name:<30} " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
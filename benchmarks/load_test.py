@@ -0,0 +1,151 @@
+"""
+Macro load test: drives /api/ask in-process at a fixed concurrency against
+a local Qdrant collection built from Mumbai1.csv. Geocoding and the LLM are
+stubbed so only our own pipeline is measured.
+
+    python -m benchmarks.load_test --requests 500 --concurrency 16 --out load.json
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from benchmarks.common import SAMPLE_QUERIES, summarize, write_report
+
+# Rough centre of the Mumbai dataset
+CENTER_LAT, CENTER_LON = 19.076, 72.8777
+
+
+def stub_geocode(location: str, delay: float = 0.0):
+    """
+    Deterministic coordinates within ~25 km of Mumbai for any location string.
+    """
+    if delay:
+        time.sleep(delay)
+    digest = hashlib.sha256(location.lower().encode("utf-8")).digest()
+    lat = CENTER_LAT + (digest[0] / 255 - 0.5) * 0.45
+    lon = CENTER_LON + (digest[1] / 255 - 0.5) * 0.45
+    return lat, lon
+
+
+def build_collection(csv_path: str, rows: int | None, chunk_size: int):
+    from services import ingestion
+
+    started = time.perf_counter()
+    with patch.object(ingestion, "geocode", stub_geocode):
+        if rows:
+            import pandas as pd
+            trimmed = os.path.join(os.environ["QDRANT_PATH"], "dataset.csv")
+            pd.read_csv(csv_path, nrows=rows).to_csv(trimmed, index=False)
+            csv_path = trimmed
+        # The city's collection, metadata, gazetteer and store, as the API routes them
+        ingestion.run_ingest(city="Mumbai", csv_path=csv_path, chunk_size=chunk_size, full=True)
+    return time.perf_counter() - started
+
+
+async def drive(app, total: int, concurrency: int, mode: str):
+    import httpx
+
+    latencies = []
+    stages = {}
+    errors = 0
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench"
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                payload = {
+                    "query": SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)],
+                    "location": "Mumbai",
+                    "radius_km": 10,
+                    "filter_mode": mode,
+                    "explanation_mode": "none"
+                }
+                t0 = time.perf_counter()
+                r = await client.post("/api/ask", json=payload)
+                latencies.append(time.perf_counter() - t0)
+
+                if r.status_code != 200:
+                    errors += 1
+                    continue
+                for part in r.headers.get("server-timing", "").split(","):
+                    if ";dur=" in part:
+                        stage, dur = part.strip().split(";dur=")
+                        stages.setdefault(stage, []).append(float(dur) / 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies, elapsed)
+    summary["errors"] = errors
+    summary["stages"] = {stage: summarize(values) for stage, values in stages.items()}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", default="data/raw/Mumbai1.csv")
+    parser.add_argument("--rows", type=int, help="only ingest the first N rows")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--filter-mode", default="soft", choices=["soft", "hard", "hybrid"])
+    parser.add_argument("--geocode-ms", type=float, default=0, help="simulated geocoding latency")
+    parser.add_argument("--qdrant-path", help="reuse a collection built by an earlier run")
+    parser.add_argument("--no-property-store", action="store_true",
+                        help="read Qdrant payloads and use its geo filter instead of the local store / spatial index")
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    # Must be set before db.vector_db is imported; nothing is read from or written to data/
+    reuse = bool(args.qdrant_path)
+    os.environ["QDRANT_PATH"] = workdir = args.qdrant_path or tempfile.mkdtemp(prefix="georag-bench-")
+    os.environ.pop("QDRANT_URL", None)
+    os.environ["PROPERTY_STORE_PATH"] = os.path.join(workdir, "property_store")
+    os.environ["DATASET_METADATA_PATH"] = os.path.join(workdir, "dataset_metadata.json")
+    os.environ["GAZETTEER_PATH"] = os.path.join(workdir, "gazetteer.json")
+    os.environ["INGEST_MANIFEST_DIR"] = os.path.join(workdir, "ingest_manifests")
+
+    build_seconds = None
+    if not reuse:
+        build_seconds = build_collection(args.csv, args.rows, chunk_size=1000)
+        print(f"🏗 Collection built in {build_seconds:.1f}s at {os.environ['QDRANT_PATH']}")
+
+    from main import app
+    from services.llm_explainer import template_explanation
+    if args.no_property_store:
+        import db.property_store as property_store
+        property_store._store, property_store._store_loaded = None, True
+
+    delay = args.geocode_ms / 1000
+    with patch("api.query.geocode", lambda location: stub_geocode(location, delay)), \
+            patch("api.query.explain_results", template_explanation):
+        # One warm-up request so model / collection load is not measured
+        asyncio.run(drive(app, 1, 1, args.filter_mode))
+        summary = asyncio.run(drive(app, args.requests, args.concurrency, args.filter_mode))
+
+    print(
+        f"QPS={summary['qps']} p50={summary['p50_ms']:.1f}ms "
+        f"p95={summary['p95_ms']:.1f}ms p99={summary['p99_ms']:.1f}ms errors={summary['errors']}"
+    )
+    write_report(args.out, "load_test", summary, {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "filter_mode": args.filter_mode,
+        "geocode_ms": args.geocode_ms,
+        "rows": args.rows,
+        "property_store": not args.no_property_store,
+        "build_seconds": build_seconds
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Micro-benchmarks for the CPU-side pieces of /api/ask.
+
+    python -m benchmarks.micro --out micro.json
+"""
+import argparse
+import random
+
+from api.query import is_real_estate_query, extract_city_from_query
+from services.relevance import rerank
+from models.amenities import Amenity, mask_from_names
+from services.query_parser import parse_query
+from services import embedding
+from benchmarks.common import SAMPLE_QUERIES, time_calls, write_report
+
+AMENITIES = ["Gymnasium", "Lift Available", "Car Parking", "Swimming Pool", "Clubhouse"]
+
+
+class Candidate:
+    """Stand-in for a Qdrant ScoredPoint."""
+
+    def __init__(self, id, score, payload):
+        self.id = id
+        self.score = score
+        self.payload = payload
+
+
+def make_candidates(n: int, seed: int = 7) -> list[Candidate]:
+    rng = random.Random(seed)
+    return [
+        Candidate(i, rng.random(), {
+            "locality": f"Locality {i % 50}",
+            "price": rng.randint(20, 300) * 100_000,
+            "bhk": rng.randint(1, 4),
+            "area_sqft": rng.randint(300, 2000),
+            "amenity_mask": mask_from_names(rng.sample(AMENITIES, rng.randint(0, len(AMENITIES))))
+        })
+        for i in range(n)
+    ]
+
+
+def uncached_embed(text):
+    embedding.query_cache.clear()
+    return embedding.embed(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--embed-repeat", type=int, default=10)
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    queries = [(q,) for q in SAMPLE_QUERIES]
+    results = {
+        "parse_query": time_calls(parse_query, queries, args.repeat),
+        "is_real_estate_query": time_calls(is_real_estate_query, queries, args.repeat),
+        "extract_city_from_query": time_calls(extract_city_from_query, queries, args.repeat)
+    }
+
+    # Model forward pass vs cache hit
+    embedding.embed("warm up")
+    results["embed_uncached"] = time_calls(uncached_embed, queries, args.embed_repeat)
+    for query in SAMPLE_QUERIES:
+        embedding.embed(query)
+    results["embed_cached"] = time_calls(embedding.embed, queries, args.repeat)
+
+    for n in (5, 50, 500):
+        candidates = make_candidates(n)
+        distances = [c.id % 20 * 0.5 for c in candidates]
+        results[f"rerank_{n}"] = time_calls(
+            rerank, [(candidates, 2, 8_000_000, Amenity.GYMNASIUM, None, distances)], args.repeat
+        )
+
+    for name, summary in results.items():
+        print(f"{name:<26} p50={summary['p50_ms']:.4f}ms p99={summary['p99_ms']:.4f}ms")
+
+    write_report(args.out, "micro", results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Replays a JSONL query log against the API and reports latency, error rate
+and (with --diff) how result sets changed between two builds.
+
+Each line is a JSON object with the /api/ask fields (query, location,
+radius_km, bhk, ...). Optional keys: "request_id" (used to match requests
+across runs) and "ts" (epoch seconds, used by --pace original). Lines
+without a "query" are skipped.
+
+    python -m benchmarks.replay requests.jsonl --target http://127.0.0.1:8000 --out a.json
+    python -m benchmarks.replay requests.jsonl --target direct --stub-external --out b.json
+    python -m benchmarks.replay --diff a.json b.json
+"""
+import argparse
+import asyncio
+import json
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from benchmarks.common import summarize, write_report
+from models.query_schema import UserQuery
+
+# Every /api/ask field, so search settings such as hnsw_ef and exact are replayed too
+ASK_FIELDS = set(UserQuery.model_fields)
+
+
+def read_log(paths: list[str], limit: int | None = None):
+    """
+    Streams replayable requests from one or more JSONL files.
+    """
+    count = 0
+    for path in paths:
+        with open(path) as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+
+                payload = {k: v for k, v in record.items() if k in ASK_FIELDS}
+                if not payload.get("query"):
+                    continue
+                # Replays measure search; explanations are off unless the log asks for them
+                payload.setdefault("explanation_mode", "none")
+
+                yield {
+                    "key": str(record.get("request_id", f"{path}:{line_no}")),
+                    "ts": record.get("ts"),
+                    "payload": payload
+                }
+                count += 1
+                if limit and count >= limit:
+                    return
+
+
+def schedule(requests, pace: str, speedup: float, rate: float | None):
+    """
+    Attaches a send offset (seconds from start) to every request.
+    """
+    first_ts = None
+    for i, request in enumerate(requests):
+        if rate:
+            offset = i / rate
+        elif pace == "original" and request["ts"] is not None:
+            first_ts = request["ts"] if first_ts is None else first_ts
+            offset = (request["ts"] - first_ts) / speedup
+        else:
+            offset = 0.0
+        yield offset, request
+
+
+def make_sender(target: str):
+    """
+    Returns (async send(payload) -> (status, body), async close()).
+    """
+    if target == "direct":
+        from fastapi import BackgroundTasks, HTTPException
+        from api.query import StageTimer, _ask
+        from models.query_schema import UserQuery
+
+        async def send(payload):
+            try:
+                body = await _ask(UserQuery(**payload), StageTimer(), BackgroundTasks())
+                return 200, body
+            except HTTPException as e:
+                return e.status_code, {"detail": e.detail}
+
+        async def close():
+            pass
+
+        return send, close
+
+    import httpx
+
+    if target == "inprocess":
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay")
+    else:
+        client = httpx.AsyncClient(base_url=target, timeout=120)
+
+    async def send(payload):
+        r = await client.post("/api/ask", json=payload)
+        try:
+            return r.status_code, r.json()
+        except ValueError:
+            return r.status_code, {}
+
+    return send, client.aclose
+
+
+async def replay(requests, target: str, concurrency: int):
+    send, close = make_sender(target)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    records = []
+    started = time.perf_counter()
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            offset, request = item
+
+            # Pacing: wait until this request's slot
+            delay = offset - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            t0 = time.perf_counter()
+            try:
+                status, body = await send(request["payload"])
+                error = None if status == 200 else f"HTTP {status}"
+            except Exception as e:
+                status, body, error = None, {}, repr(e)
+
+            records.append({
+                "key": request["key"],
+                "query": request["payload"]["query"],
+                "status": status,
+                "error": error,
+                "latency_ms": round((time.perf_counter() - t0) * 1000, 3),
+                "result_ids": [r.get("id") for r in body.get("results", [])]
+            })
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    for item in requests:
+        await queue.put(item)
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    await close()
+
+    elapsed = time.perf_counter() - started
+    return records, elapsed
+
+
+def report(records: list[dict], elapsed: float) -> dict:
+    ok = [r for r in records if r["error"] is None]
+    summary = summarize([r["latency_ms"] / 1000 for r in ok], elapsed)
+    summary["requests"] = len(records)
+    summary["errors"] = len(records) - len(ok)
+    summary["error_rate"] = round(summary["errors"] / len(records), 4) if records else 0.0
+    summary["empty_results"] = sum(1 for r in ok if not r["result_ids"])
+    return summary
+
+
+def diff(before_path: str, after_path: str):
+    with open(before_path) as f:
+        before = {r["key"]: r for r in json.load(f)["results"]["requests"]}
+    with open(after_path) as f:
+        after = {r["key"]: r for r in json.load(f)["results"]["requests"]}
+
+    common = sorted(before.keys() & after.keys())
+    identical = top1_changed = 0
+    overlaps = []
+    changed = []
+
+    for key in common:
+        old, new = before[key]["result_ids"], after[key]["result_ids"]
+        if old == new:
+            identical += 1
+            overlaps.append(1.0)
+            continue
+
+        union = set(old) | set(new)
+        overlap = len(set(old) & set(new)) / len(union) if union else 1.0
+        overlaps.append(overlap)
+        if old[:1] != new[:1]:
+            top1_changed += 1
+        changed.append((overlap, key, before[key]["query"]))
+
+    print(f"Requests compared: {len(common)} "
+          f"(only before: {len(before.keys() - after.keys())}, only after: {len(after.keys() - before.keys())})")
+    print(f"Identical result lists: {identical}")
+    print(f"Top-1 changed: {top1_changed}")
+    if overlaps:
+        print(f"Mean Jaccard overlap: {sum(overlaps) / len(overlaps):.3f}")
+
+    for overlap, key, query in sorted(changed)[:10]:
+        print(f"  {overlap:.2f}  {key}  {query[:60]}")
+
+    for label, path in (("before", before_path), ("after", after_path)):
+        with open(path) as f:
+            summary = json.load(f)["results"]["summary"]
+        print(f"{label:>6}: p50={summary['p50_ms']}ms p99={summary['p99_ms']}ms "
+              f"error_rate={summary['error_rate']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("logs", nargs="*", help="JSONL files to replay")
+    parser.add_argument("--target", default="http://127.0.0.1:8000",
+                        help="API base URL, 'inprocess' (ASGI app) or 'direct' (service pipeline)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pace", choices=["none", "original"], default="none",
+                        help="original: keep the log's inter-arrival times (see --speedup)")
+    parser.add_argument("--speedup", type=float, default=1.0, help="time compression for --pace original")
+    parser.add_argument("--rate", type=float, help="fixed send rate in requests/sec")
+    parser.add_argument("--limit", type=int, help="replay at most N requests")
+    parser.add_argument("--stub-external", action="store_true",
+                        help="with inprocess/direct targets, stub geocoding and the LLM")
+    parser.add_argument("--out", help="write the JSON report to this path")
+    parser.add_argument("--diff", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two replay reports")
+    args = parser.parse_args()
+
+    if args.diff:
+        diff(*args.diff)
+        return
+    if not args.logs:
+        parser.error("no log files given")
+
+    requests = schedule(read_log(args.logs, args.limit), args.pace, args.speedup, args.rate)
+
+    with ExitStack() as stack:
+        if args.stub_external and args.target in ("inprocess", "direct"):
+            from benchmarks.load_test import stub_geocode
+            from services.llm_explainer import template_explanation
+            stack.enter_context(patch("api.query.geocode", stub_geocode))
+            stack.enter_context(patch("api.query.explain_results", template_explanation))
+
+        records, elapsed = asyncio.run(replay(requests, args.target, args.concurrency))
+
+    summary = report(records, elapsed)
+    print(f"{summary['requests']} requests in {elapsed:.1f}s | QPS={summary.get('qps')} "
+          f"p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms p99={summary['p99_ms']}ms "
+          f"error_rate={summary['error_rate']}")
+
+    write_report(args.out, "replay", {"summary": summary, "requests": records}, {
+        "logs": args.logs,
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "pace": args.pace,
+        "speedup": args.speedup,
+        "rate": args.rate
+    })
+
+
+if __name__ == "__main__":
+    main()
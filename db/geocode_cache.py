@@ -0,0 +1,114 @@
+import os
+import sqlite3
+import threading
+import time
+
+from services.cache import LRUCache
+from services.cache import MISS as MEMORY_MISS
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", "data/geocode_cache.db")
+
+# Found coordinates rarely move; failed lookups are retried sooner
+GEOCODE_TTL_SECONDS = int(os.getenv("GEOCODE_TTL_SECONDS", 30 * 24 * 3600))
+GEOCODE_NEGATIVE_TTL_SECONDS = int(os.getenv("GEOCODE_NEGATIVE_TTL_SECONDS", 24 * 3600))
+# Hot keys kept in memory in front of SQLite
+GEOCODE_MEMORY_SIZE = int(os.getenv("GEOCODE_MEMORY_SIZE", "4096"))
+
+# Returned by get() when a key is absent or expired (None is a cached "not found")
+MISS = object()
+
+
+class GeocodeCache:
+    """
+    SQLite-backed geocode cache shared by the API and the ingest scripts.
+    Keys are normalized location strings; a NULL lat/lon row is a cached
+    negative result. Hot keys are also kept in a process-local LRU.
+    """
+
+    def __init__(
+        self,
+        path: str = GEOCODE_CACHE_PATH,
+        ttl: int = GEOCODE_TTL_SECONDS,
+        negative_ttl: int = GEOCODE_NEGATIVE_TTL_SECONDS,
+        memory_size: int = GEOCODE_MEMORY_SIZE
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        # Expiry is checked here per entry (negative results expire sooner)
+        self._memory = LRUCache(maxsize=memory_size)
+        self.hits = 0
+        self.misses = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                key TEXT PRIMARY KEY,
+                lat REAL,
+                lon REAL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is MEMORY_MISS:
+                row = self._conn.execute(
+                    "SELECT lat, lon, expires_at FROM geocode_cache WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return MISS
+                lat, lon, expires_at = row
+                coords = (lat, lon) if lat is not None else None
+                entry = (coords, expires_at)
+                self._memory.set(key, entry)
+
+        coords, expires_at = entry
+        if expires_at < now:
+            self.misses += 1
+            return MISS
+        self.hits += 1
+        return coords
+
+    def set(self, key: str, coords):
+        ttl = self.ttl if coords else self.negative_ttl
+        expires_at = time.time() + ttl
+        lat, lon = coords if coords else (None, None)
+
+        with self._lock:
+            self._memory.set(key, (coords, expires_at))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (key, lat, lon, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, lat, lon, expires_at)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            self._memory.clear()
+            cur = self._conn.execute(
+                "DELETE FROM geocode_cache WHERE expires_at < ?",
+                (time.time(),)
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self._memory.evictions}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
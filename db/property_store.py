@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+PROPERTY_STORE_PATH = os.getenv("PROPERTY_STORE_PATH", "data/property_store")
+
+# Column -> on-disk dtype. Localities and cities are stored as codes into
+# localities.json / cities.json.
+COLUMNS = {
+    "price": np.float64,
+    "bhk": np.int16,
+    "area_sqft": np.float32,
+    "lat": np.float64,
+    "lon": np.float64,
+    "amenity_mask": np.int64,
+    "locality_code": np.int32,
+    "city_code": np.int16
+}
+
+
+class PropertyStore:
+    """
+    Columnar copy of the searchable payload fields, one .npy file per
+    column, sorted by point id. Loaded memory-mapped, so every worker
+    shares the same pages and a search only touches the rows it returns.
+    """
+
+    def __init__(self, ids, columns: dict, localities: list[str], cities: list[str]):
+        self.ids = ids
+        self.columns = columns
+        self.localities = localities
+        self.cities = cities
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Builds the store from a DataFrame indexed by point id with the
+        payload fields (city, locality, price, bhk, area_sqft, lat, lon, amenity_mask).
+        """
+        frame = frame.sort_index()
+        columns = {
+            name: frame[name].to_numpy(dtype=dtype)
+            for name, dtype in COLUMNS.items() if name not in ("locality_code", "city_code")
+        }
+        locality_codes, localities = frame["locality"].factorize()
+        city_codes, cities = frame["city"].factorize()
+        columns["locality_code"] = locality_codes.astype(COLUMNS["locality_code"])
+        columns["city_code"] = city_codes.astype(COLUMNS["city_code"])
+        return cls(
+            frame.index.to_numpy(dtype=np.int64), columns,
+            [str(l) for l in localities], [str(c) for c in cities]
+        )
+
+    def to_frame(self):
+        """
+        The inverse of from_frame (e.g. to merge a re-ingested city in).
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame({
+            name: np.asarray(values) for name, values in self.columns.items()
+            if name not in ("locality_code", "city_code")
+        }, index=pd.Index(np.asarray(self.ids), name="id"))
+        frame["locality"] = np.asarray(self.localities, dtype=object)[self.columns["locality_code"]]
+        frame["city"] = np.asarray(self.cities, dtype=object)[self.columns["city_code"]]
+        return frame
+
+    def positions(self, ids):
+        """
+        Row of each id, and whether the id is in the store at all.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        rows = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return rows, self.ids[rows] == ids
+
+    def record(self, row: int) -> dict:
+        """
+        One row as a payload-shaped dict of plain Python values.
+        """
+        c = self.columns
+        return {
+            "city": self.cities[int(c["city_code"][row])],
+            "locality": self.localities[int(c["locality_code"][row])],
+            "price": float(c["price"][row]),
+            "bhk": int(c["bhk"][row]),
+            "area_sqft": float(c["area_sqft"][row]),
+            "amenity_mask": int(c["amenity_mask"][row]),
+            "geo": {"lat": float(c["lat"][row]), "lon": float(c["lon"][row])}
+        }
+
+    def save(self, path: str = PROPERTY_STORE_PATH):
+        """
+        Each file is written aside and renamed into place, so a serving
+        process keeps reading its (old) mapped pages until it reloads.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, values in self.columns.items():
+            _replace(os.path.join(path, f"{name}.npy"), lambda f, v=values: np.save(f, v), "wb")
+        for values, file_name in ((self.localities, "localities.json"), (self.cities, "cities.json")):
+            _replace(os.path.join(path, file_name), lambda f, v=values: json.dump(v, f), "w")
+        # Last: get_property_store() treats a directory with ids.npy as a complete store
+        _replace(os.path.join(path, "ids.npy"), lambda f: np.save(f, self.ids), "wb")
+
+    @classmethod
+    def load(cls, path: str = PROPERTY_STORE_PATH, mmap: bool = True):
+        mode = "r" if mmap else None
+        ids = np.load(os.path.join(path, "ids.npy"), mmap_mode=mode)
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+            for name in COLUMNS
+        }
+        with open(os.path.join(path, "localities.json")) as f:
+            localities = json.load(f)
+        with open(os.path.join(path, "cities.json")) as f:
+            cities = json.load(f)
+        return cls(ids, columns, localities, cities)
+
+
+def _replace(target: str, write, mode: str):
+    with open(target + ".tmp", mode) as f:
+        write(f)
+    os.replace(target + ".tmp", target)
+
+
+# How often (seconds) a worker checks whether an ingest, in this process or
+# another one, has replaced the store on disk
+STORE_CHECK_SECONDS = float(os.getenv("STORE_CHECK_SECONDS", "1"))
+
+_UNLOADED = object()
+
+_store = None
+_store_loaded = False
+# Version of the files _store was loaded from; a store set directly is kept as is
+_store_version = _UNLOADED
+_store_checked_at = 0.0
+_store_lock = threading.Lock()
+
+
+def store_version(path: str | None = None):
+    """
+    Identity of the store on disk, or None when there is none. ids.npy
+    is renamed into place last by save(), so it changes once a new store
+    is complete.
+    """
+    try:
+        stat = os.stat(os.path.join(path or PROPERTY_STORE_PATH, "ids.npy"))
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _store_replaced() -> bool:
+    global _store_checked_at
+    if _store_version is _UNLOADED:
+        return False
+    now = time.monotonic()
+    if now - _store_checked_at < STORE_CHECK_SECONDS:
+        return False
+    _store_checked_at = now
+    return store_version() != _store_version
+
+
+def _load_store():
+    global _store, _store_version
+    version = store_version()
+    if version is None:
+        logger.warning("No property store at %s; hydrating from Qdrant payloads", PROPERTY_STORE_PATH)
+        _store, _store_version = None, None
+        return
+
+    store = PropertyStore.load(PROPERTY_STORE_PATH)
+    if any(len(values) != len(store) for values in store.columns.values()):
+        # Loaded between a writer's renames; the next check sees ids.npy change
+        logger.warning("Property store at %s is being rewritten; keeping the loaded one", PROPERTY_STORE_PATH)
+        if _store_version is _UNLOADED:
+            _store_version = None
+        return
+    _store, _store_version = store, version
+    logger.info("Property store loaded with %d rows", len(store))
+
+
+def get_property_store():
+    """
+    The store written by the last ingest, or None when there is none
+    (search then reads Qdrant payloads as before). Reloaded when an
+    ingest in any process replaces it.
+    """
+    global _store_loaded
+    if not _store_loaded or _store_replaced():
+        with _store_lock:
+            if not _store_loaded or store_version() != _store_version:
+                _load_store()
+                _store_loaded = True
+    return _store
@@ -4,77 +4,353 @@ from qdrant_client.models import (
     VectorParams,
     PayloadSchemaType,
     PointStruct,
+    PointIdsList,
     Filter,
     FieldCondition,
     GeoRadius,
     GeoPoint,
-    SearchParams
+    HasIdCondition,
+    SearchParams,
+    HnswConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    QuantizationSearchParams,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    MatchValue,
+    Range
 )
 from services.logger import get_logger
+from services.metrics import timed
+from services.spatial_index import get_spatial_index
+from db.property_store import get_property_store
+from models.amenities import has_all, payload_mask
 logger = get_logger(__name__)
 
 # QDRANT CLIENT
 import os
+import numpy as np
+import re
+import threading
+from dataclasses import dataclass, replace
 from dotenv import load_dotenv
 load_dotenv()
 
+QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_PATH = os.getenv("QDRANT_PATH", "qdrant_data")
 COLLECTION_NAME = os.getenv("QDRANT_COLLECTION", "properties")
 
-client = QdrantClient(path=QDRANT_PATH)
+VECTOR_SIZE = 384
+VECTOR_DISTANCE = Distance.COSINE
 
+_client = None
+_client_ready = False
+# Re-entrant: ensure_collection() calls back into get_client() while it holds the lock
+_client_lock = threading.RLock()
 
 
-# CREATE COLLECTION
-logger.info(f"Ensuring Qdrant collection exists: {COLLECTION_NAME}")
+def get_client() -> QdrantClient:
+    """
+    Opens the client and bootstraps the collections searches are routed
+    to on first use, so importing this module stays cheap. Thread-safe.
+    """
+    global _client, _client_ready
+    if not _client_ready:
+        with _client_lock:
+            if _client is None:
+                # A Qdrant server (QDRANT_URL) lets the API serve while a re-ingest runs;
+                # the embedded store in QDRANT_PATH is locked by a single process.
+                _client = QdrantClient(url=QDRANT_URL) if QDRANT_URL else QdrantClient(path=QDRANT_PATH)
+                try:
+                    for alias in served_collections():
+                        ensure_collection(alias)
+                except Exception:
+                    _client.close()
+                    _client = None
+                    raise
+                _client_ready = True
+    return _client
+
+
+def client_ready() -> bool:
+    return _client_ready
+
+
+def served_collections() -> list[str]:
+    """
+    The per-city collections listed in the dataset metadata (see
+    services.dataset_scope); the ingest creates the ones for new cities.
+    """
+    # Imported here: dataset_scope imports this module
+    from services.dataset_scope import load_metadata
+
+    return list(dict.fromkeys(entry["collection"] for entry in load_metadata()["cities"].values()))
+
+
+# Payload indexes (warning OK in local mode)
+PAYLOAD_INDEXES = {
+    "geo": PayloadSchemaType.GEO,
+    "bhk": PayloadSchemaType.INTEGER,
+    "price": PayloadSchemaType.FLOAT
+}
+
+# Radius fallback for broad or sparse locations
+RADIUS_EXPANSION_FACTOR = 2
+MAX_SEARCH_RADIUS_KM = float(os.getenv("MAX_SEARCH_RADIUS_KM", "50"))
+
+# Above this many points in the circle, an id list costs more than Qdrant's geo filter
+SPATIAL_MAX_IDS = int(os.getenv("SPATIAL_MAX_IDS", "5000"))
+
+# Qdrant can't test bits: without the local index, amenity filters run on
+# an over-fetched batch of this many times the requested limit
+AMENITY_OVERFETCH = int(os.getenv("AMENITY_OVERFETCH", "5"))
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """
+    How a collection stores and indexes its vectors. Quantized profiles
+    search compressed vectors kept in RAM, then rescore the best
+    `oversampling` x limit candidates with the originals.
+    """
+    # None, "scalar" (int8, 4x smaller) or "binary" (1 bit per dimension, 32x smaller)
+    quantization: str | None = None
+    # Original vectors memory-mapped from disk instead of held in RAM
+    on_disk: bool = False
+    m: int = 16
+    ef_construct: int = 100
+    oversampling: float = 1.0
 
-client.recreate_collection(
-    collection_name=COLLECTION_NAME,
-    vectors_config=VectorParams(
-        size=384,
-        distance=Distance.COSINE
+    def collection_config(self) -> dict:
+        """
+        Keyword arguments for QdrantClient.create_collection.
+        """
+        quantization_config = None
+        if self.quantization == "scalar":
+            quantization_config = ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8, quantile=0.99, always_ram=True
+            ))
+        elif self.quantization == "binary":
+            quantization_config = BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+
+        return {
+            "vectors_config": VectorParams(size=VECTOR_SIZE, distance=VECTOR_DISTANCE, on_disk=self.on_disk),
+            "hnsw_config": HnswConfigDiff(m=self.m, ef_construct=self.ef_construct),
+            "quantization_config": quantization_config
+        }
+
+    def search_params(self, hnsw_ef: int | None = None, exact: bool = False) -> SearchParams | None:
+        # None when everything is at Qdrant's defaults (the local mode warns on any params)
+        if not (hnsw_ef or exact or self.quantization):
+            return None
+        return SearchParams(
+            hnsw_ef=hnsw_ef,
+            exact=exact,
+            quantization=(
+                QuantizationSearchParams(rescore=True, oversampling=self.oversampling)
+                if self.quantization else None
+            )
+        )
+
+
+COLLECTION_PROFILES = {
+    # Qdrant defaults: float32 vectors in RAM
+    "default": CollectionProfile(),
+    "scalar": CollectionProfile(quantization="scalar", oversampling=1.5),
+    # For collections larger than RAM: int8 copies in RAM, originals on disk for rescoring
+    "scalar-disk": CollectionProfile(quantization="scalar", on_disk=True, oversampling=2.0),
+    # Loses more on 384-dim MiniLM vectors than on large models; check the benchmark first
+    "binary": CollectionProfile(quantization="binary", on_disk=True, m=32, ef_construct=256, oversampling=3.0)
+}
+
+
+def profile_from_env() -> CollectionProfile:
+    name = os.getenv("COLLECTION_PROFILE", "default")
+    if name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown COLLECTION_PROFILE {name!r}, expected one of {sorted(COLLECTION_PROFILES)}")
+    profile = COLLECTION_PROFILES[name]
+    if os.getenv("HNSW_M"):
+        profile = replace(profile, m=int(os.getenv("HNSW_M")))
+    if os.getenv("HNSW_EF_CONSTRUCT"):
+        profile = replace(profile, ef_construct=int(os.getenv("HNSW_EF_CONSTRUCT")))
+    return profile
+
+
+# Applied when a collection is created; search params follow it
+PROFILE = profile_from_env()
+
+# Search-time HNSW beam width (None: Qdrant's default, ef_construct); overridable per request
+HNSW_EF = int(os.getenv("HNSW_EF")) if os.getenv("HNSW_EF") else None
+
+
+# CREATE COLLECTION
+def create_collection(name: str, profile: CollectionProfile | None = None):
+    client = get_client()
+    client.create_collection(
+        collection_name=name,
+        **(profile or PROFILE).collection_config()
     )
-)
-logger.info("Qdrant collection ready")
 
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(
+            collection_name=name,
+            field_name=field_name,
+            field_schema=field_schema
+        )
 
-# Geo index (warning OK in local mode)
-client.create_payload_index(
-    collection_name=COLLECTION_NAME,
-    field_name="geo",
-    field_schema=PayloadSchemaType.GEO
-)
+
+def versioned_name(version: int, alias: str = COLLECTION_NAME) -> str:
+    return f"{alias}_v{version}"
+
+
+def collection_versions(alias: str = COLLECTION_NAME) -> list[int]:
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    versions = []
+    for collection in get_client().get_collections().collections:
+        match = pattern.match(collection.name)
+        if match:
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def alias_target(alias: str = COLLECTION_NAME) -> str | None:
+    for entry in get_client().get_aliases().aliases:
+        if entry.alias_name == alias:
+            return entry.collection_name
+    return None
+
+
+def ensure_collection(alias: str = COLLECTION_NAME):
+    """
+    Idempotent bootstrap: creates `<name>_v1` behind the `<name>` alias
+    only when nothing is there yet, and refuses to serve a collection
+    whose vector config doesn't match the embedding model.
+    """
+    logger.info("Ensuring Qdrant collection exists: %s", alias)
+    client = get_client()
+
+    if not client.collection_exists(alias):
+        name = versioned_name(1, alias)
+        if not client.collection_exists(name):
+            create_collection(name)
+        swap_alias(name, alias=alias)
+        logger.info("Created collection %s behind alias %s", name, alias)
+        return
+
+    params = client.get_collection(alias).config.params.vectors
+    if params.size != VECTOR_SIZE or params.distance != VECTOR_DISTANCE:
+        raise RuntimeError(
+            f"Collection {alias} has vectors of size {params.size} "
+            f"({params.distance}), expected {VECTOR_SIZE} ({VECTOR_DISTANCE})"
+        )
+    logger.info("Qdrant collection ready")
+
+
+def create_next_version(alias: str = COLLECTION_NAME) -> str:
+    """
+    Creates the next `<name>_vN` collection for a background rebuild.
+    """
+    versions = collection_versions(alias)
+    name = versioned_name(versions[-1] + 1 if versions else 1, alias)
+    create_collection(name)
+    logger.info("Created collection %s for rebuild", name)
+    return name
+
+
+def swap_alias(new_collection: str, drop_previous: bool = False, alias: str = COLLECTION_NAME):
+    """
+    Atomically points the serving alias at `new_collection`.
+    """
+    client = get_client()
+    previous = alias_target(alias)
+    operations = []
+
+    if previous is not None:
+        operations.append(DeleteAliasOperation(
+            delete_alias=DeleteAlias(alias_name=alias)
+        ))
+    elif client.collection_exists(alias):
+        # Legacy un-versioned collection: it has to go before the alias can take its name
+        logger.warning("Replacing un-versioned collection %s with an alias", alias)
+        client.delete_collection(alias)
+
+    operations.append(CreateAliasOperation(
+        create_alias=CreateAlias(collection_name=new_collection, alias_name=alias)
+    ))
+    client.update_collection_aliases(change_aliases_operations=operations)
+    logger.info("Alias %s -> %s (was %s)", alias, new_collection, previous)
+
+    if drop_previous and previous and previous != new_collection:
+        client.delete_collection(previous)
+        logger.info("Dropped previous collection %s", previous)
 
 
 # INSERT DATA
-def insert(points: list[PointStruct]):
-    logger.info(f"Inserting {len(points)} points into Qdrant")
+def insert(points: list[PointStruct], collection_name: str = COLLECTION_NAME):
+    logger.info("Inserting %d points into Qdrant", len(points))
 
-    client.upsert(
-        collection_name=COLLECTION_NAME,
+    get_client().upsert(
+        collection_name=collection_name,
         points=points
     )
 
+
+def delete_points(ids: list[int], collection_name: str = COLLECTION_NAME):
+    if not ids:
+        return
+    logger.info("Deleting %d points from Qdrant", len(ids))
+
+    get_client().delete(
+        collection_name=collection_name,
+        points_selector=PointIdsList(points=list(ids))
+    )
+
+
+def point_ids(collection_name: str = COLLECTION_NAME) -> list[int]:
+    """
+    Every point id in the collection, scrolled without payloads or vectors.
+    """
+    ids, offset = [], None
+    while True:
+        points, offset = get_client().scroll(
+            collection_name=collection_name,
+            limit=10000,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        ids.extend(point.id for point in points)
+        if offset is None:
+            return ids
+
+
 # GEO + VECTOR SEARCH 
-from qdrant_client.models import (
-    Filter,
-    FieldCondition,
-    GeoRadius,
-    GeoPoint,
-    Prefetch
-)
+def preference_conditions(bhk=None, max_price=None, min_price=None) -> list[FieldCondition]:
+    """
+    Hard filters on the indexed payload fields. Amenities are a bitmask
+    and are filtered separately (see geo_vector_search).
+    """
+    conditions = []
 
-def geo_vector_search(
-          
-    vector,
-    latitude,
-    longitude,
-    radius_km=5,
-    limit=5
-):
-    logger.debug("Executing geo + vector search")
+    if bhk not in (None, 0):
+        conditions.append(FieldCondition(key="bhk", match=MatchValue(value=bhk)))
 
-    geo_filter = Filter(
+    if max_price not in (None, 0) or min_price not in (None, 0):
+        conditions.append(FieldCondition(key="price", range=Range(
+            gte=min_price or None,
+            lte=max_price or None
+        )))
+
+    return conditions
+
+
+def geo_filter(latitude, longitude, radius_km, conditions=None) -> Filter:
+    return Filter(
         must=[
             FieldCondition(
                 key="geo",
@@ -85,19 +361,169 @@ def geo_vector_search(
                     ),
                     radius=radius_km * 1000
                 )
-            )
+            ),
+            *(conditions or [])
         ]
     )
 
-    return client.query_points(
-        collection_name=COLLECTION_NAME,
+
+def spatial_filter(latitude, longitude, radius_km, conditions=None, required_amenities=0):
+    """
+    Pre-selects the points inside the circle (and with every required
+    amenity) with the local spatial index and hands them to Qdrant as an
+    id set; falls back to the geo filter. Also returns whether the filter
+    already enforces required_amenities.
+    """
+    index = get_spatial_index()
+    if index is not None:
+        mask = required_amenities if index.has_masks else 0
+        ids, _ = index.radius(latitude, longitude, radius_km, mask)
+        if len(ids) <= SPATIAL_MAX_IDS:
+            query_filter = Filter(must=[HasIdCondition(has_id=ids.tolist()), *(conditions or [])])
+            return query_filter, mask == required_amenities
+
+    return geo_filter(latitude, longitude, radius_km, conditions), not required_amenities
+
+
+def _result_masks(points, store) -> list[int]:
+    if store is None:
+        return [payload_mask(p.payload) for p in points]
+    rows, found = store.positions([p.id for p in points])
+    masks = np.where(found, store.columns["amenity_mask"][rows], 0)
+    return [
+        mask if known else payload_mask(p.payload)
+        for p, mask, known in zip(points, masks.tolist(), found.tolist())
+    ]
+
+
+def _fill_missing_payloads(points, store, collection_name):
+    """
+    Payloads for the results the store doesn't know yet (upserted by an
+    ingest whose store this process hasn't loaded), so they are hydrated
+    from Qdrant instead of coming back empty.
+    """
+    _, found = store.positions([p.id for p in points])
+    missing = [p for p, known in zip(points, found.tolist()) if not known]
+    if not missing:
+        return
+    payloads = {
+        record.id: record.payload
+        for record in get_client().retrieve(collection_name=collection_name, ids=[p.id for p in missing])
+    }
+    for point in missing:
+        point.payload = payloads.get(point.id) or {}
+
+
+def _query(
+    vector,
+    query_filter,
+    limit,
+    amenities_applied=True,
+    required_amenities=0,
+    params=None,
+    collection_name=COLLECTION_NAME
+):
+    # With a property store, fetch ids and scores only; results are hydrated from its columns
+    store = get_property_store()
+    results = get_client().query_points(
+        collection_name=collection_name,
         query=vector,
-        limit=limit,
-        with_payload=True,
-        prefetch=[
-            # Prefetch(filter=geo_filter) cant use this is not working for broder queries
-        ]
+        limit=limit if amenities_applied else limit * AMENITY_OVERFETCH,
+        with_payload=store is None,
+        query_filter=query_filter,
+        search_params=params
+    )
+    if store is not None:
+        _fill_missing_payloads(results.points, store, collection_name)
+    if not amenities_applied:
+        masks = _result_masks(results.points, store)
+        results.points = [
+            p for p, mask in zip(results.points, masks)
+            if has_all(mask, required_amenities)
+        ][:limit]
+    return results
+
+
+def _search_collection(
+    collection_name,
+    vector,
+    latitude,
+    longitude,
+    radius_km,
+    limit,
+    conditions,
+    required_amenities,
+    params
+):
+    # Filter inside the index; widen the circle until enough candidates are found
+    radius = radius_km
+    while True:
+        query_filter, applied = spatial_filter(latitude, longitude, radius, conditions, required_amenities)
+        results = _query(
+            vector, query_filter, limit, applied, required_amenities, params, collection_name
+        )
+        if len(results.points) >= limit or radius >= MAX_SEARCH_RADIUS_KM:
+            break
+
+        radius = min(radius * RADIUS_EXPANSION_FACTOR, MAX_SEARCH_RADIUS_KM)
+        logger.debug("Only %d results, expanding radius to %.1f km", len(results.points), radius)
+
+    if results.points:
+        return results
+
+    # Nothing within the maximum radius: fall back to pure semantic search
+    logger.warning(
+        "No results within %.1f km of (%s, %s) in %s, searching without geo filter",
+        radius, latitude, longitude, collection_name
+    )
+    return _query(
+        vector,
+        Filter(must=conditions) if conditions else None,
+        limit,
+        not required_amenities,
+        required_amenities,
+        params,
+        collection_name
     )
 
-def debug_count():
-    return client.count(collection_name=COLLECTION_NAME, exact=True)
+
+@timed("search")
+def geo_vector_search(
+          
+    vector,
+    latitude,
+    longitude,
+    radius_km=5,
+    limit=5,
+    conditions=None,
+    required_amenities=0,
+    hnsw_ef=None,
+    exact=False,
+    collections=None
+):
+    """
+    Searches each collection (one per city; the default collection when
+    None) and merges the hits by score.
+    """
+    logger.debug("Executing geo + vector search")
+    params = PROFILE.search_params(hnsw_ef or HNSW_EF, exact)
+
+    collections = collections or [COLLECTION_NAME]
+    results = [
+        _search_collection(
+            name, vector, latitude, longitude, radius_km, limit, conditions, required_amenities, params
+        )
+        for name in collections
+    ]
+    if len(results) == 1:
+        return results[0]
+
+    merged = results[0]
+    merged.points = sorted(
+        (p for r in results for p in r.points), key=lambda p: p.score, reverse=True
+    )[:limit]
+    return merged
+
+
+def debug_count(collection_name: str = COLLECTION_NAME):
+    return get_client().count(collection_name=collection_name, exact=True)
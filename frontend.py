@@ -7,7 +7,8 @@ st.set_page_config(
     layout="wide"
 )
 
-API_URL = "http://127.0.0.1:8000/api/ask"
+API_BASE = "http://127.0.0.1:8000"
+API_URL = f"{API_BASE}/api/ask"
 
 
 
@@ -45,6 +46,22 @@ query = st.text_input(
 
 search_btn = st.button("Search")
 
+
+def stream_explanation(url):
+    """
+    Yields explanation tokens from the backend's Server-Sent Events stream.
+    """
+    with requests.get(url, stream=True, timeout=90) as r:
+        event = None
+        for line in r.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:") and event != "done":
+                yield line[len("data: "):]
+            elif not line:
+                event = None
+
+
 # Search action
 if search_btn:
     if not query.strip():
@@ -56,7 +73,8 @@ if search_btn:
             "radius_km": radius_km,
             "bhk": bhk,
             "max_price": max_price,
-            "require_gym": require_gym
+            "require_gym": require_gym,
+            "explanation_mode": "stream"
         }
 
         with st.spinner("Searching properties..."):
@@ -69,9 +87,10 @@ if search_btn:
                     data = response.json()
 
                     
-                    # Explanation
+                    # Explanation (placeholder, streamed in after the results render)
                     st.subheader("📌 Explanation")
-                    st.write(data.get("explanation", ""))
+                    explanation_box = st.empty()
+                    explanation_box.write(data.get("explanation") or "")
 
                     
                     # Results
@@ -97,6 +116,11 @@ if search_btn:
                                 st.caption(f"Reason: {r['reason']}")
                                 st.divider()
 
+                    if data.get("explanation_url"):
+                        explanation_box.write_stream(
+                            stream_explanation(API_BASE + data["explanation_url"])
+                        )
+
             except Exception as e:
                 st.error(f"Request failed: {e}")
 
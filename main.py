@@ -1,16 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from api.query import router as query_router
 from api.ingest import router as ingest_router
+from api.explain import router as explain_router
+from services.metrics import render_prometheus
+from services.warmup import WARMUP_ON_STARTUP, readiness, warm_up
 # from api.auth import router as auth_router
 
 
 
-app = FastAPI(title="Geo-Spatial RAG Real Estate Agent")
+async def background_warm_up():
+    try:
+        await asyncio.to_thread(warm_up)
+    except Exception:
+        # Already logged; /ready keeps reporting the error and requests load lazily
+        pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # In the background: the port opens at once and /ready reports when loading is done
+    task = asyncio.create_task(background_warm_up()) if WARMUP_ON_STARTUP else None
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+
+
+app = FastAPI(title="Geo-Spatial RAG Real Estate Agent", lifespan=lifespan)
 
 
 app.include_router(query_router, prefix="/api")
 app.include_router(ingest_router, prefix="/api")
+app.include_router(explain_router, prefix="/api")
 
 @app.get("/")
 def health():
     return {"status": "running"}
+
+
+@app.get("/ready")
+def ready():
+    # 503 until the model and Qdrant are loaded, for load balancer / k8s readiness probes
+    status = readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
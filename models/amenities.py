@@ -0,0 +1,67 @@
+from enum import IntFlag
+
+
+class Amenity(IntFlag):
+    """
+    One bit per amenity column of the dataset. Masks are stored in the
+    Qdrant payloads and the local index: append new members, never
+    reorder or reuse a bit.
+    """
+    NONE = 0
+    GYMNASIUM = 1 << 0
+    LIFT_AVAILABLE = 1 << 1
+    CAR_PARKING = 1 << 2
+    MAINTENANCE_STAFF = 1 << 3
+    SECURITY_24X7 = 1 << 4
+    CHILDRENS_PLAY_AREA = 1 << 5
+    CLUBHOUSE = 1 << 6
+    INTERCOM = 1 << 7
+    LANDSCAPED_GARDENS = 1 << 8
+    INDOOR_GAMES = 1 << 9
+    GAS_CONNECTION = 1 << 10
+    JOGGING_TRACK = 1 << 11
+    SWIMMING_POOL = 1 << 12
+
+
+# CSV column name -> flag, in bit order
+AMENITY_COLUMNS = {
+    "Gymnasium": Amenity.GYMNASIUM,
+    "Lift Available": Amenity.LIFT_AVAILABLE,
+    "Car Parking": Amenity.CAR_PARKING,
+    "Maintenance Staff": Amenity.MAINTENANCE_STAFF,
+    "24x7 Security": Amenity.SECURITY_24X7,
+    "Children's Play Area": Amenity.CHILDRENS_PLAY_AREA,
+    "Clubhouse": Amenity.CLUBHOUSE,
+    "Intercom": Amenity.INTERCOM,
+    "Landscaped Gardens": Amenity.LANDSCAPED_GARDENS,
+    "Indoor Games": Amenity.INDOOR_GAMES,
+    "Gas Connection": Amenity.GAS_CONNECTION,
+    "Jogging Track": Amenity.JOGGING_TRACK,
+    "Swimming Pool": Amenity.SWIMMING_POOL
+}
+
+
+def mask_from_names(names) -> int:
+    mask = 0
+    for name in names:
+        mask |= AMENITY_COLUMNS.get(name, 0)
+    return int(mask)
+
+
+def names_from_mask(mask: int) -> list[str]:
+    return [name for name, flag in AMENITY_COLUMNS.items() if mask & flag]
+
+
+def payload_mask(payload: dict) -> int:
+    """
+    Amenity mask of a point; payloads ingested before the mask existed
+    only carry the list of names.
+    """
+    mask = payload.get("amenity_mask")
+    if mask is not None:
+        return int(mask)
+    return mask_from_names(payload.get("amenities", ()))
+
+
+def has_all(mask: int, required: int) -> bool:
+    return mask & required == required
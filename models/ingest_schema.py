@@ -0,0 +1,14 @@
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class IngestRequest(BaseModel):
+    city: str = "Mumbai"
+    # File name under INGEST_DATA_DIR; defaults to the Mumbai dataset
+    csv: Optional[str] = None
+    chunk_size: int = Field(default=1000, ge=1, le=100_000)
+
+    # full: re-embed every row; rebuild: into a new collection version behind the alias
+    full: bool = False
+    rebuild: bool = False
+    drop_previous: bool = False
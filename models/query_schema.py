@@ -1,6 +1,6 @@
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 
 class UserQuery(BaseModel):
     query: str
@@ -10,3 +10,18 @@ class UserQuery(BaseModel):
     bhk: Optional[int] = None
     max_price: Optional[float] = None
     require_gym: bool = False
+
+    # soft: boost matches after search; hard: filter in Qdrant;
+    # hybrid: over-fetch a candidate pool, then soft re-rank it
+    filter_mode: Literal["soft", "hard", "hybrid"] = "soft"
+    candidate_pool: Optional[int] = Field(default=None, ge=1, le=500)
+
+    # HNSW beam width for this search (higher: better recall, slower);
+    # exact: brute-force search, e.g. to check recall
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=4096)
+    exact: bool = False
+
+    # inline: wait for the LLM; async: poll /api/explain/{request_id};
+    # stream: SSE from /api/explain/{request_id}/stream (only generated
+    # there; polling reports "stream_only" until it is read); none: skip it
+    explanation_mode: Literal["inline", "async", "stream", "none"] = "async"
@@ -1,122 +1,52 @@
 
-import pandas as pd
-import json
-from pathlib import Path
-from qdrant_client.models import PointStruct
-from services.geocoding import geocode
-from services.embedding import embed
-from db.vector_db import insert
+import argparse
 
-CSV_PATH = "data/raw/Mumbai1.csv"
-CITY = "Mumbai"
+from services.ingestion import CHUNK_SIZE, CITY, CSV_PATH, run_ingest
 
-geo_cache = {}
 
-def cached_geocode(location):
-    if location in geo_cache:
-        return geo_cache[location]
-    coords = geocode(location)
-    geo_cache[location] = coords
-    return coords
-
-
-# 🔹 Load dataset
-df = pd.read_csv(CSV_PATH)
-
-points = []
-
-# 🔐 Dataset geographic bounds (initialized)
-min_lat = float("inf")
-max_lat = float("-inf")
-min_lon = float("inf")
-max_lon = float("-inf")
-
-# 🔹 Ingest loop
-for idx, row in df.iterrows():
-
-    if idx % 10 == 0:
-        print(f"⏳ Processed {idx} rows...")
-
-    locality = row["Location"]
-    bhk = int(row["No. of Bedrooms"])
-    price = float(row["Price"])
-    area = float(row["Area"])
-
-    # 🔹 Build amenities list
-    amenities = []
-    for col in [
-        "Gymnasium",
-        "Lift Available",
-        "Car Parking",
-        "24x7 Security",
-        "Children's Play Area",
-        "Clubhouse",
-        "Swimming Pool",
-        "Jogging Track",
-        "Gas Connection"
-    ]:
-        if col in df.columns and row[col] == 1:
-            amenities.append(col)
-
-    # 🔹 Geocode (cached)
-    coords = cached_geocode(f"{locality}, {CITY}, India")
-    if not coords:
-        continue
-
-    lat, lon = coords
-
-    #  Update dataset bounds (ONLY for valid rows)
-    min_lat = min(min_lat, lat)
-    max_lat = max(max_lat, lat)
-    min_lon = min(min_lon, lon)
-    max_lon = max(max_lon, lon)
-
-    # Text for embedding
-    text = f"""
-    {bhk} BHK apartment in {locality}, {CITY}.
-    Area: {area} sqft.
-    Price: {price}.
-    Amenities: {', '.join(amenities) if amenities else 'Basic amenities'}.
-    """
-
-    vector = embed(text)
-
-    points.append(
-        PointStruct(
-            id=idx,
-            vector=vector,
-            payload={
-                "city": CITY,
-                "locality": locality,
-                "price": price,
-                "bhk": bhk,
-                "area_sqft": area,
-                "amenities": amenities,
-                "geo": {
-                    "lat": lat,
-                    "lon": lon
-                }
-            }
-        )
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sync a city's property CSV into its own Qdrant collection: "
+                    "only new or changed listings are embedded, removed ones are deleted"
     )
+    parser.add_argument("--city", default=CITY)
+    parser.add_argument("--csv", help=f"default: {CSV_PATH} for {CITY}; required for other cities")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="re-embed every row, ignoring the manifest of the last run"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="build a new versioned collection and switch the alias to it when done"
+    )
+    parser.add_argument(
+        "--drop-previous",
+        action="store_true",
+        help="with --rebuild, delete the collection the alias pointed at before"
+    )
+    args = parser.parse_args()
+
+    try:
+        result = run_ingest(
+            city=args.city,
+            csv_path=args.csv,
+            chunk_size=args.chunk_size,
+            full=args.full,
+            rebuild=args.rebuild,
+            drop_previous=args.drop_previous
+        )
+    except ValueError as e:
+        parser.error(str(e))
 
-#  Insert into Qdrant
-insert(points)
-
-print(f"✅ Ingested {len(points)} properties successfully")
-
-#  Save dataset geographic metadata
-metadata = {
-    "dataset_name": f"{CITY} Real Estate Dataset",
-    "min_lat": min_lat,
-    "max_lat": max_lat,
-    "min_lon": min_lon,
-    "max_lon": max_lon
-}
-
-Path("data").mkdir(exist_ok=True)
+    print(
+        f"✅ {result['city']}: {result['added']} added, {result['changed']} changed, "
+        f"{result['removed']} removed, {result['unchanged']} unchanged "
+        f"({result['skipped']} not geocoded) in {result['collection']}"
+    )
 
-with open("data/dataset_metadata.json", "w") as f:
-    json.dump(metadata, f, indent=2)
 
-print(" Dataset geographic bounds saved to data/dataset_metadata.json")
+if __name__ == "__main__":
+    main()
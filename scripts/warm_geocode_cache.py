@@ -0,0 +1,44 @@
+import argparse
+import time
+
+import pandas as pd
+from services.geocoding import geocode
+
+CSV_PATH = "data/raw/Mumbai1.csv"
+CITY = "Mumbai"
+
+
+def warm(csv_path: str = CSV_PATH, city: str = CITY):
+    """
+    Fills the persistent geocode cache from the distinct localities
+    in the dataset, so neither the API nor re-ingestion has to call
+    Nominatim for them again.
+    """
+    locations = pd.read_csv(csv_path, usecols=["Location"])["Location"].dropna().unique()
+    started = time.perf_counter()
+    found = 0
+
+    for i, locality in enumerate(locations, 1):
+        # Same key the ingest script uses
+        coords = geocode(f"{locality}, {city}, India")
+        if coords:
+            found += 1
+
+        if i % 25 == 0:
+            print(f"⏳ Warmed {i}/{len(locations)} localities...")
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {found}/{len(locations)} localities resolved in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the geocode cache from the dataset localities")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--city", default=CITY)
+    args = parser.parse_args()
+
+    warm(args.csv, args.city)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import threading
+
+from services.dataset_scope import load_metadata
+from services.gazetteer import Gazetteer, get_gazetteer
+from services.query_parser import KNOWN_CITIES
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+
+def _centre(entry: dict) -> tuple[float, float]:
+    return (
+        (entry.get("min_lat", 0) + entry.get("max_lat", 0)) / 2,
+        (entry.get("min_lon", 0) + entry.get("max_lon", 0)) / 2
+    )
+
+
+class CityRouter:
+    """
+    Picks the per-city collections a search has to touch, so adding a
+    city never widens a search in another. Cities are read from the
+    location ("Navi Mumbai" wins over "Mumbai"), else from a dataset
+    locality it names ("Andheri West").
+    """
+
+    def __init__(self, cities: dict):
+        self.cities = cities
+        self._names = Gazetteer()
+        for key, entry in cities.items():
+            self._names.add(key, *_centre(entry), kind="city", city=key)
+        for alias, canonical in KNOWN_CITIES.items():
+            if canonical in cities:
+                self._names.add(alias, *_centre(cities[canonical]), kind="city", city=canonical)
+        self._names.build()
+
+    def route(self, location: str, mentioned_city: str | None = None) -> list[str]:
+        """
+        Supported cities for the location, most specific mention first;
+        the city named in the query breaks ties ("Mumbai or Pune").
+        """
+        cities = [m["city"] for m in self._names.find(location)]
+        if not cities:
+            # Every city with a locality of that name ("Andheri" may be in two)
+            gazetteer = get_gazetteer()
+            cities = [
+                place["city"]
+                for m in gazetteer.find(location) if m["kind"] == "locality"
+                for place in gazetteer.candidates(m["name"])
+                if place["kind"] == "locality" and place["city"] in self.cities
+            ]
+        cities = list(dict.fromkeys(cities))
+
+        if mentioned_city in cities:
+            return [mentioned_city]
+        return cities
+
+    def collections(self, cities: list[str]) -> list[str]:
+        return [self.cities[city]["collection"] for city in cities]
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> CityRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = CityRouter(load_metadata()["cities"])
+                logger.info("Routing searches for cities: %s", ", ".join(_router.cities) or "none")
+    return _router
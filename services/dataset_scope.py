@@ -1,16 +1,60 @@
 import json
+import os
 
-# Load dataset geographic bounds
-with open("data/dataset_metadata.json", "r") as f:
-    DATASET_BOUNDS = json.load(f)
+from db.vector_db import COLLECTION_NAME
+from services.query_parser import KNOWN_CITIES
+from services.text_utils import normalize_text
 
+DATASET_METADATA_PATH = os.getenv("DATASET_METADATA_PATH", "data/dataset_metadata.json")
 
-def is_inside_dataset(lat: float, lon: float) -> bool:
+# The city of a metadata file written before per-city collections
+LEGACY_CITY = "mumbai"
+
+
+def city_key(name: str) -> str:
+    """
+    Canonical lowercase key of a city name ("Bombay" -> "mumbai").
+    """
+    key = normalize_text(name)
+    return KNOWN_CITIES.get(key, key)
+
+
+def city_collection(city: str) -> str:
+    return f"{COLLECTION_NAME}_{city_key(city).replace(' ', '_')}"
+
+
+def load_metadata(path: str = DATASET_METADATA_PATH) -> dict:
+    """
+    Per-city dataset metadata: {"cities": {key: {"collection", "min_lat", ...}}}.
+    A single-city file (flat bounds) reads as Mumbai in the default collection.
+    """
+    if not os.path.exists(path):
+        return {"cities": {}}
+    with open(path) as f:
+        metadata = json.load(f)
+    if "cities" not in metadata:
+        metadata = {"cities": {LEGACY_CITY: {**metadata, "collection": COLLECTION_NAME}}}
+    return metadata
+
+
+def save_city_metadata(city: str, entry: dict, path: str = DATASET_METADATA_PATH):
+    """
+    Adds or replaces one city, keeping the others.
+    """
+    metadata = load_metadata(path)
+    metadata["cities"][city_key(city)] = entry
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def is_inside_dataset(lat: float, lon: float, city: str) -> bool:
     """
     Checks whether a given latitude and longitude
-    fall inside the geographic bounds of the dataset.
+    fall inside the geographic bounds of the city's dataset.
     """
-    return (
-        DATASET_BOUNDS["min_lat"] <= lat <= DATASET_BOUNDS["max_lat"]
-        and DATASET_BOUNDS["min_lon"] <= lon <= DATASET_BOUNDS["max_lon"]
+    bounds = load_metadata()["cities"].get(city_key(city))
+    return bounds is not None and (
+        bounds["min_lat"] <= lat <= bounds["max_lat"]
+        and bounds["min_lon"] <= lon <= bounds["max_lon"]
     )
@@ -1,13 +1,145 @@
-from sentence_transformers import SentenceTransformer
+from services.cache import LRUCache, MISS
+from services.embedding_batcher import EmbeddingBatcher
+from services.text_utils import normalize_text
+from services.metrics import register_cache, timed
+from services.logger import get_logger
+import asyncio
+import numpy as np
 import os
+import threading
+import time
+logger = get_logger(__name__)
 
 MODEL_NAME = os.getenv(
     "EMBEDDING_MODEL",
     "sentence-transformers/all-MiniLM-L6-v2"
 )
 
-model = SentenceTransformer(MODEL_NAME)
+# torch (full precision), onnx (ONNX Runtime) or onnx-int8 (dynamically quantized
+# ONNX); the ONNX ones need `pip install "sentence-transformers[onnx]"`
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Quantized export inside the model repo; pick the one matching the CPU (avx2, avx512, arm64)
+EMBEDDING_ONNX_INT8_FILE = os.getenv("EMBEDDING_ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")
 
+# Backend name -> SentenceTransformer keyword arguments
+BACKENDS = {
+    "torch": {"backend": "torch"},
+    "onnx": {"backend": "onnx"},
+    "onnx-int8": {"backend": "onnx", "model_kwargs": {"file_name": EMBEDDING_ONNX_INT8_FILE}}
+}
+
+# Micro-batching of concurrent embed() calls
+EMBEDDING_BATCHING = os.getenv("EMBEDDING_BATCHING", "true").lower() == "true"
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "32"))
+
+# Query vectors keyed on the normalized query text
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def load_model(backend: str | None = None):
+    """
+    A new model instance on the given backend (default EMBEDDING_BACKEND).
+    """
+    backend = backend or EMBEDDING_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}, expected one of {sorted(BACKENDS)}")
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME, **BACKENDS[backend])
+
+
+def get_model():
+    """
+    Loads the model on first use (torch and the weights take seconds),
+    so importing this module stays cheap. Thread-safe.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                started = time.perf_counter()
+                _model = load_model()
+                logger.info(
+                    "Embedding model %s (%s) loaded in %.1fs",
+                    MODEL_NAME, EMBEDDING_BACKEND, time.perf_counter() - started
+                )
+    return _model
+
+
+def model_loaded() -> bool:
+    return _model is not None
+
+
+def embed_batch(texts: list[str], batch_size: int = 64):
+    """
+    Encodes many texts in a single batched forward pass.
+    Returns a float32 array of shape (len(texts), dim).
+    """
+    return get_model().encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        show_progress_bar=False
+    )
+
+
+batcher = EmbeddingBatcher(
+    embed_batch,
+    max_batch_size=EMBEDDING_MAX_BATCH,
+    max_wait_ms=EMBEDDING_BATCH_WINDOW_MS
+)
+
+
+query_cache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+register_cache("embedding", query_cache)
+
+
+@timed("embed")
 def embed(text: str):
-    
-    return model.encode(text).tolist()
+    """
+    Query embedding as a read-only float32 array. Repeated queries
+    (up to case, whitespace and punctuation) skip the model entirely.
+    """
+    key = normalize_text(text)
+    vector = query_cache.get(key)
+    if vector is not MISS:
+        return vector
+
+    if EMBEDDING_BATCHING:
+        vector = batcher.embed(text)
+    else:
+        vector = get_model().encode(text)
+
+    return _remember(key, vector)
+
+
+async def aembed(text: str, executor=None):
+    """
+    embed() for the event loop. A miss waits on the batcher's future
+    without holding a thread, so every in-flight request can share a
+    batch; without batching it encodes on `executor`.
+    """
+    with timed("embed"):
+        key = normalize_text(text)
+        vector = query_cache.get(key)
+        if vector is not MISS:
+            return vector
+
+        if EMBEDDING_BATCHING:
+            vector = await asyncio.wrap_future(batcher.submit(text))
+        else:
+            loop = asyncio.get_running_loop()
+            vector = await loop.run_in_executor(executor, lambda: get_model().encode(text))
+
+        return _remember(key, vector)
+
+
+def _remember(key: str, vector):
+    vector = np.array(vector, dtype=np.float32)
+    vector.flags.writeable = False
+    query_cache.set(key, vector)
+    return vector
@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    In-process micro-batcher. Callers submit single texts; a worker thread
+    collects them for up to `max_wait_ms` or `max_batch_size` items, runs one
+    batched encode call and resolves each caller's future with its row.
+    A lone text is encoded at once: batches form from the callers that
+    queue up while the previous batch is encoding.
+    """
+
+    def __init__(self, encode_batch, max_batch_size: int = 32, max_wait_ms: float = 5):
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str):
+        return self.submit(text).result()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                if self._worker is not None:
+                    logger.error("Embedding batcher thread died; restarting it")
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="embedding-batcher",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self):
+        # Block for the first item, then gather until the window closes or the batch is full
+        batch = [self._queue.get()]
+        if self._queue.empty():
+            # Nobody else waiting: don't make a single query sit out the window
+            return batch
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            try:
+                self._process(self._collect())
+            except Exception:
+                # One bad batch must not take the worker (and every later caller) down
+                logger.error("Embedding batcher loop failed", exc_info=True)
+
+    def _process(self, batch):
+        # Callers that gave up (e.g. a cancelled request) are dropped before encoding
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = [text for text, _ in batch]
+
+        try:
+            vectors = self.encode_batch(texts)
+        except Exception as e:
+            logger.error("Batched embedding failed", exc_info=True)
+            for _, future in batch:
+                _resolve(future.set_exception, e)
+            return
+
+        logger.debug("Encoded micro-batch of %d texts", len(batch))
+        for (_, future), vector in zip(batch, vectors):
+            _resolve(future.set_result, vector)
+
+
+def _resolve(setter, value):
+    try:
+        setter(value)
+    except InvalidStateError:
+        # Resolved or cancelled elsewhere meanwhile; nobody is waiting for it
+        pass
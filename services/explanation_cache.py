@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from services.cache import LRUCache, MISS
+from services.text_utils import normalize_text
+from services.metrics import register_cache
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "1024"))
+EXPLANATION_CACHE_TTL_SECONDS = int(os.getenv("EXPLANATION_CACHE_TTL_SECONDS", 24 * 3600))
+# Optional SQLite file so cached explanations survive restarts
+EXPLANATION_CACHE_PATH = os.getenv("EXPLANATION_CACHE_PATH")
+
+# Results that make it into the prompt
+PROMPT_RESULTS = 3
+
+
+def explanation_key(user_query: str, results: list, cities: list | None = None) -> str:
+    """
+    Content address of an explanation: the normalized query, the cities
+    searched, and the ordered ids and facts of the results the prompt is
+    built from.
+    """
+    facts = [
+        [r.get("id"), r["bhk"], r["locality"], r["price"], r["area_sqft"]]
+        for r in results[:PROMPT_RESULTS]
+    ]
+    content = json.dumps(
+        [normalize_text(user_query), len(results), facts, list(cities or [])],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """
+    Size-bounded LRU with TTL, optionally written through to SQLite.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = EXPLANATION_CACHE_SIZE,
+        ttl: int = EXPLANATION_CACHE_TTL_SECONDS,
+        path: str | None = EXPLANATION_CACHE_PATH
+    ):
+        self.ttl = ttl
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.disk_hits = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS explanation_cache (
+                    key TEXT PRIMARY KEY,
+                    explanation TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, key: str):
+        explanation = self.memory.get(key)
+        if explanation is not MISS or self._conn is None:
+            return explanation
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT explanation FROM explanation_cache WHERE key = ? AND expires_at >= ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return MISS
+
+        self.disk_hits += 1
+        self.memory.set(key, row[0])
+        return row[0]
+
+    def set(self, key: str, explanation: str):
+        self.memory.set(key, explanation)
+        if self._conn is None:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO explanation_cache (key, explanation, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, explanation, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        lookups = stats["hits"] + stats["misses"]
+        served = stats["hits"] + self.disk_hits
+        return {
+            **stats,
+            "disk_hits": self.disk_hits,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "persistent": self._conn is not None
+        }
+
+
+explanation_cache = ExplanationCache()
+register_cache("explanation", explanation_cache)
+
+
+def cached_explanation(user_query: str, results: list, cities: list | None = None):
+    """
+    Cached explanation for this query, cities and result set, or None.
+    """
+    explanation = explanation_cache.get(explanation_key(user_query, results, cities))
+    return None if explanation is MISS else explanation
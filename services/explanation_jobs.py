@@ -0,0 +1,53 @@
+import os
+import uuid
+
+from services.cache import LRUCache, MISS
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+# Explanations are only kept long enough for the client to come back for them
+EXPLANATION_JOB_TTL_SECONDS = int(os.getenv("EXPLANATION_JOB_TTL_SECONDS", "600"))
+EXPLANATION_JOB_MAX = int(os.getenv("EXPLANATION_JOB_MAX", "1000"))
+
+PENDING = "pending"
+READY = "ready"
+# Generated only while the client reads /api/explain/{request_id}/stream
+STREAM_ONLY = "stream_only"
+
+jobs = LRUCache(maxsize=EXPLANATION_JOB_MAX, ttl=EXPLANATION_JOB_TTL_SECONDS)
+
+
+def create_job(user_query: str, results: list, cities: list | None = None, stream: bool = False) -> str:
+    request_id = uuid.uuid4().hex
+    jobs.set(request_id, {
+        "status": STREAM_ONLY if stream else PENDING,
+        "query": user_query,
+        "results": results,
+        "cities": cities,
+        "explanation": None
+    })
+    return request_id
+
+
+def get_job(request_id: str):
+    job = jobs.get(request_id)
+    return None if job is MISS else job
+
+
+def complete_job(request_id: str, explanation: str):
+    job = get_job(request_id)
+    if job is None:
+        logger.warning("Explanation job expired before completion: %s", request_id)
+        return
+    job["explanation"] = explanation
+    job["status"] = READY
+
+
+def run_job(request_id: str, explain):
+    """
+    Background task body: generates the explanation for a pending job.
+    """
+    job = get_job(request_id)
+    if job is None:
+        return
+    complete_job(request_id, explain(job["query"], job["results"], job["cities"]))
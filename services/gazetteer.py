@@ -0,0 +1,241 @@
+import json
+import os
+import threading
+from collections import deque
+
+from services.query_parser import KNOWN_CITIES
+from services.text_utils import normalize_text
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", "data/gazetteer.json")
+
+# City centres, keyed by the canonical names the query parser returns
+CITY_CENTERS = {
+    "mumbai": (19.0760, 72.8777),
+    "pune": (18.5204, 73.8567),
+    "delhi": (28.6139, 77.2090),
+    "bangalore": (12.9716, 77.5946),
+    "chennai": (13.0827, 80.2707),
+    "hyderabad": (17.3850, 78.4867)
+}
+
+# Words a location string may carry besides the place names ("Andheri West, Mumbai, India")
+IGNORED_WORDS = frozenset({"india"})
+
+
+class Gazetteer:
+    """
+    Place names (dataset localities and known cities) with coordinates,
+    matched against free text by an Aho-Corasick automaton: every mention
+    is found in a single pass, on word boundaries only. Entries are keyed
+    by (name, city), so a locality name shared by two cities keeps both.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self._names = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._built = False
+
+    def add(self, name: str, lat: float, lon: float, kind: str = "locality", city: str | None = None):
+        key = normalize_text(name)
+        if not key or (key, city) in self.entries:
+            return
+        entry = {"name": name, "kind": kind, "city": city, "lat": lat, "lon": lon}
+        self.entries[(key, city)] = entry
+        self._names.setdefault(key, []).append(entry)
+        self._built = False
+
+    def candidates(self, name: str) -> list[dict]:
+        """
+        Every entry with this name, in the order they were added.
+        """
+        return list(self._names.get(normalize_text(name), []))
+
+    def build(self):
+        self._goto, self._fail, self._out = [{}], [0], [[]]
+
+        # Trie of all names
+        for key in self._names:
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(key)
+
+        # Failure links, breadth first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        self._built = True
+
+    def _scan(self, text: str):
+        if not self._built:
+            self.build()
+
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for key in self._out[state]:
+                start = end - len(key)
+                # Whole words only: "pune" must not match inside "punetha"
+                if (start == 0 or text[start - 1] == " ") and (end == len(text) or text[end] == " "):
+                    yield start, end, key
+
+    def find(self, text: str, city: str | None = None) -> list[dict]:
+        """
+        Place mentions in the text, longest first where they overlap
+        ("Andheri West" over "Andheri"), in reading order. A name several
+        cities share reads as the one in `city` if given, else the first added.
+        """
+        spans = sorted(self._scan(normalize_text(text)), key=lambda s: (s[0], -s[1]))
+
+        mentions = []
+        last_end = -1
+        for start, end, key in spans:
+            if start < last_end:
+                continue
+            candidates = self._names[key]
+            entry = next((e for e in candidates if e["city"] == city), candidates[0])
+            mentions.append({**entry, "start": start, "end": end})
+            last_end = end
+        return mentions
+
+    def resolve(self, location: str, city: str | None = None):
+        """
+        Entry for a location string made up only of known place names,
+        e.g. "Andheri West, Mumbai, India". None for anything else, and for
+        a locality several cities share when neither the string nor `city`
+        says which.
+        """
+        text = normalize_text(location)
+        mentions = self.find(text, city)
+        if not mentions:
+            return None
+
+        named = {m["city"] for m in mentions if m["kind"] == "city"}
+        if city is None and len(named) == 1:
+            # "Andheri, Pune": the Pune Andheri
+            city = next(iter(named))
+            mentions = self.find(text, city)
+
+        rest = list(text)
+        for m in mentions:
+            rest[m["start"]:m["end"]] = " " * (m["end"] - m["start"])
+        if not set("".join(rest).split()) <= IGNORED_WORDS:
+            return None
+
+        cities = {m["city"] for m in mentions if m["kind"] == "city"}
+        localities = [m for m in mentions if m["kind"] == "locality"]
+        if localities:
+            locality = localities[0]
+            # "Andheri West, Pune" is not a place we know
+            if cities and cities != {locality["city"]}:
+                return None
+            shared = {e["city"] for e in self._names[normalize_text(locality["name"])] if e["kind"] == "locality"}
+            if city is None and len(shared) > 1:
+                return None
+            return locality
+        return mentions[0] if len(cities) == 1 else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self, path: str = GAZETTEER_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(list(self.entries.values()), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH):
+        gazetteer = cls()
+        with open(path) as f:
+            for entry in json.load(f):
+                gazetteer.add(entry["name"], entry["lat"], entry["lon"], entry["kind"], entry.get("city"))
+        gazetteer.build()
+        return gazetteer
+
+
+def build_gazetteer(localities: dict, city: str, base: Gazetteer | None = None) -> Gazetteer:
+    """
+    Known cities plus the dataset's localities ({name: (lat, lon)}), and
+    the other cities' places from `base` when adding a city to it.
+    """
+    gazetteer = Gazetteer()
+    for name, canonical in KNOWN_CITIES.items():
+        lat, lon = CITY_CENTERS[canonical]
+        gazetteer.add(name, lat, lon, kind="city", city=canonical)
+
+    city = normalize_text(city)
+    city = KNOWN_CITIES.get(city, city)
+    if city and city not in CITY_CENTERS and localities:
+        # A city the parser doesn't know: centred on its localities
+        lats, lons = zip(*localities.values())
+        lat = sum(map(float, lats)) / len(lats)
+        lon = sum(map(float, lons)) / len(lons)
+        gazetteer.add(city, lat, lon, kind="city", city=city)
+
+    for name, (lat, lon) in localities.items():
+        gazetteer.add(name, float(lat), float(lon), kind="locality", city=city)
+
+    if base is not None:
+        for entry in base.entries.values():
+            if entry["city"] != city:
+                gazetteer.add(entry["name"], entry["lat"], entry["lon"], entry["kind"], entry["city"])
+
+    gazetteer.build()
+    return gazetteer
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                if os.path.exists(GAZETTEER_PATH):
+                    _gazetteer = Gazetteer.load(GAZETTEER_PATH)
+                else:
+                    logger.warning("No gazetteer at %s; run the ingest script to build one", GAZETTEER_PATH)
+                    _gazetteer = build_gazetteer({}, "")
+                logger.info("Gazetteer loaded with %d places", len(_gazetteer))
+    return _gazetteer
+
+
+def focus_locality(query_text: str, location: str):
+    """
+    Locality named in the query when the selected location is just its
+    city ("flat in Bandra" with location "Mumbai"); otherwise None.
+    """
+    gazetteer = get_gazetteer()
+    place = gazetteer.resolve(location)
+    if place is None or place["kind"] != "city":
+        return None
+
+    # A locality name other cities share too reads as the one in this city
+    for mention in gazetteer.find(query_text, place["city"]):
+        if mention["kind"] == "locality" and mention["city"] == place["city"]:
+            return mention
+    return None
@@ -1,6 +1,10 @@
 import requests
+import threading
 import time
-time.sleep(1)
+from db.geocode_cache import GeocodeCache, MISS
+from services.gazetteer import get_gazetteer
+from services.text_utils import normalize_text
+from services.metrics import register_cache, timed
 from services.logger import get_logger
 logger = get_logger(__name__)
 
@@ -8,9 +12,65 @@ logger = get_logger(__name__)
 
 HEADERS = {"User-Agent": "GeoRAG/1.0"}
 
+# Nominatim usage policy: at most one request per second
+MIN_REQUEST_INTERVAL = 1.0
 
+_cache = None
+_cache_lock = threading.Lock()
+_throttle_lock = threading.Lock()
+_last_request_at = 0.0
+
+
+def get_cache() -> GeocodeCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GeocodeCache()
+                register_cache("geocode", _cache)
+    return _cache
+
+
+def _throttle():
+    global _last_request_at
+    with _throttle_lock:
+        wait = MIN_REQUEST_INTERVAL - (time.monotonic() - _last_request_at)
+        if wait > 0:
+            time.sleep(wait)
+        _last_request_at = time.monotonic()
+
+
+class GeocodingError(Exception):
+    """Transient lookup failure (network, rate limit); never cached."""
+
+
+@timed("geocode")
 def geocode(location: str):
-    logger.debug(f"Requesting geocode for: {location}")
+    # Dataset localities and known cities resolve without a lookup
+    place = get_gazetteer().resolve(location)
+    if place is not None:
+        logger.debug("Gazetteer hit for: %s", location)
+        return place["lat"], place["lon"]
+
+    key = normalize_text(location)
+    cached = get_cache().get(key)
+    if cached is not MISS:
+        logger.debug("Geocode cache hit for: %s", location)
+        return cached
+
+    try:
+        coords = geocode_remote(location)
+    except GeocodingError:
+        logger.error("Geocoding API failed for location: %s", location)
+        return None
+
+    # Store "not found" too, so unknown strings don't hit Nominatim again
+    get_cache().set(key, coords)
+    return coords
+
+
+def geocode_remote(location: str):
+    logger.debug("Requesting geocode for: %s", location)
 
     url = "https://nominatim.openstreetmap.org/search"
     params = {
@@ -19,10 +79,17 @@ def geocode(location: str):
         "limit": 1
     }
 
-    r = requests.get(url, params=params, headers=HEADERS, timeout=10)
-    if r.status_code != 200 or not r.json():
-        logger.error(f"Geocoding API failed for location: {location}")
+    _throttle()
+    try:
+        r = requests.get(url, params=params, headers=HEADERS, timeout=10)
+    except requests.RequestException as e:
+        raise GeocodingError(str(e)) from e
+
+    if r.status_code != 200:
+        raise GeocodingError(f"HTTP {r.status_code}")
 
+    if not r.json():
+        logger.warning("No geocoding result for location: %s", location)
         return None
 
     data = r.json()[0]
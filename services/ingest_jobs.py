@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+import uuid
+
+from services.cache import LRUCache, MISS
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+# Finished ingest jobs stay pollable for a day
+INGEST_JOB_TTL_SECONDS = int(os.getenv("INGEST_JOB_TTL_SECONDS", "86400"))
+INGEST_JOB_MAX = int(os.getenv("INGEST_JOB_MAX", "100"))
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+jobs = LRUCache(maxsize=INGEST_JOB_MAX, ttl=INGEST_JOB_TTL_SECONDS)
+
+# One ingest at a time: two runs would race on the manifest and the property store
+_active_job = None
+_active_lock = threading.Lock()
+
+
+def create_job(params: dict):
+    """
+    New pending job id, or None while another ingest is pending or running.
+    """
+    global _active_job
+    with _active_lock:
+        if _active_job is not None:
+            return None
+        job_id = uuid.uuid4().hex
+        jobs.set(job_id, {
+            "status": PENDING,
+            "params": params,
+            "progress": {},
+            "result": None,
+            "error": None,
+            "started_at": None,
+            "finished_at": None
+        })
+        _active_job = job_id
+    return job_id
+
+
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    return None if job is MISS else job
+
+
+def active_job():
+    return _active_job
+
+
+def run_job(job_id: str, ingest):
+    """
+    Background task body: runs ingest(**params, progress=...) for a pending
+    job, recording the row counts as each chunk is done.
+    """
+    global _active_job
+    job = get_job(job_id)
+    try:
+        if job is None:
+            logger.warning("Ingest job expired before it started: %s", job_id)
+            return
+
+        job["status"] = RUNNING
+        job["started_at"] = time.time()
+
+        def progress(counts: dict):
+            job["progress"] = counts
+
+        job["result"] = ingest(**job["params"], progress=progress)
+        job["status"] = DONE
+    except Exception as e:
+        logger.exception("Ingest job %s failed", job_id)
+        job["error"] = str(e)
+        job["status"] = FAILED
+    finally:
+        if job is not None:
+            job["finished_at"] = time.time()
+        with _active_lock:
+            _active_job = None
@@ -0,0 +1,452 @@
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from qdrant_client.models import PointStruct
+
+import db.property_store as property_store
+import services.city_router as city_router
+import services.gazetteer as gazetteer_module
+import services.spatial_index as spatial_index
+from models.amenities import AMENITY_COLUMNS
+from services.geocoding import geocode
+from services.gazetteer import GAZETTEER_PATH, Gazetteer, build_gazetteer
+from services.dataset_scope import city_collection, city_key, save_city_metadata
+from db.property_store import PROPERTY_STORE_PATH, PropertyStore
+from services.embedding import EMBEDDING_BACKEND, MODEL_NAME, embed_batch
+from db.vector_db import (
+    COLLECTION_NAME, create_next_version, delete_points, ensure_collection,
+    get_client, insert, point_ids, swap_alias
+)
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CSV_PATH = "data/raw/Mumbai1.csv"
+CITY = "Mumbai"
+
+# Rows read, embedded and upserted at a time (bounds peak memory)
+CHUNK_SIZE = 1000
+
+# Payload fields kept for the property store and the gazetteer
+STORE_FIELDS = ["city", "locality", "price", "bhk", "area_sqft", "lat", "lon", "amenity_mask"]
+
+# Per-city {point id: row hash} of the last ingest, for incremental runs
+INGEST_MANIFEST_DIR = os.getenv("INGEST_MANIFEST_DIR", "data/ingest_manifests")
+
+# The columns that identify a listing. Everything else (price, amenities...)
+# can change in place and is upserted under the same id.
+KEY_COLUMNS = ["Location", "Area", "No. of Bedrooms"]
+
+# Point ids and hashes are 63-bit, so they fit int64 arrays and Qdrant's unsigned ids
+HASH_MASK = (1 << 63) - 1
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big") & HASH_MASK
+
+
+def _value_text(value) -> str:
+    # 720 and 720.0 are the same area whichever dtype pandas inferred for the chunk
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _row_texts(frame: pd.DataFrame) -> list[str]:
+    return ["\x1f".join(map(_value_text, row)) for row in frame.itertuples(index=False)]
+
+
+def row_ids(raw: pd.DataFrame, city: str, seen: dict) -> pd.Index:
+    """
+    Stable point id per row, derived from the city and the listing's key
+    columns. The n-th identical listing gets the n-th id (`seen` counts
+    them across chunks), so duplicates don't collide.
+    """
+    city = city_key(city)
+    ids = []
+    for key in _row_texts(raw[KEY_COLUMNS]):
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        ids.append(_digest(f"{city}\x1f{key}\x1f{n}"))
+    return pd.Index(ids, dtype=np.int64, name="id")
+
+
+def row_hashes(raw: pd.DataFrame) -> np.ndarray:
+    """
+    Content hash per row, over every column but the CSV's own row numbers
+    (which shift when a listing above is removed).
+    """
+    columns = [c for c in raw.columns if not str(c).startswith("Unnamed:")]
+    return np.array([_digest(text) for text in _row_texts(raw[columns])], dtype=np.int64)
+
+
+def manifest_path(city: str, directory: str = INGEST_MANIFEST_DIR) -> str:
+    return os.path.join(directory, f"{city_key(city).replace(' ', '_')}.npz")
+
+
+def load_manifest(city: str, directory: str = INGEST_MANIFEST_DIR):
+    """
+    ({point id: row hash}, collection) of the city's last ingest, or None.
+    """
+    path = manifest_path(city, directory)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return dict(zip(data["ids"].tolist(), data["hashes"].tolist())), str(data["collection"])
+
+
+def save_manifest(manifest: dict, city: str, collection_name: str, directory: str = INGEST_MANIFEST_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = manifest_path(city, directory)
+    # Written aside and renamed, so a failed run leaves the previous manifest
+    with open(path + ".tmp", "wb") as f:
+        np.savez(
+            f,
+            ids=np.fromiter(manifest.keys(), dtype=np.int64, count=len(manifest)),
+            hashes=np.fromiter(manifest.values(), dtype=np.int64, count=len(manifest)),
+            collection=np.array(collection_name)
+        )
+    os.replace(path + ".tmp", path)
+
+
+def build_amenities(chunk: pd.DataFrame) -> pd.Series:
+    """
+    Column-wise amenity lists: one boolean matrix, one string dot product.
+    """
+    cols = [c for c in AMENITY_COLUMNS if c in chunk.columns]
+    if not cols:
+        return pd.Series([[] for _ in range(len(chunk))], index=chunk.index)
+
+    flags = chunk[cols].eq(1)
+    joined = flags.dot(pd.Index(cols) + "|").str.rstrip("|")
+    return joined.str.split("|").map(lambda names: [n for n in names if n])
+
+
+def build_amenity_masks(chunk: pd.DataFrame) -> pd.Series:
+    """
+    Amenity flags packed into one integer per row (see models.amenities).
+    """
+    cols = [c for c in AMENITY_COLUMNS if c in chunk.columns]
+    bits = np.array([int(AMENITY_COLUMNS[c]) for c in cols], dtype=np.int64)
+    return pd.Series(chunk[cols].eq(1).to_numpy() @ bits, index=chunk.index)
+
+
+def build_texts(chunk: pd.DataFrame, city: str = CITY) -> pd.Series:
+    amenity_text = chunk["amenities"].str.join(", ").replace("", "Basic amenities")
+    return (
+        chunk["bhk"].astype(str) + " BHK apartment in "
+        + chunk["locality"] + f", {city}. "
+        + "Area: " + chunk["area_sqft"].astype(str) + " sqft. "
+        + "Price: " + chunk["price"].astype(str) + ". "
+        + "Amenities: " + amenity_text + "."
+    )
+
+
+def attach_coordinates(chunk: pd.DataFrame, city: str = CITY) -> pd.DataFrame:
+    # Geocode each distinct locality once (persistent cache), then map back onto the rows
+    coords = {
+        loc: geocode(f"{loc}, {city}, India")
+        for loc in chunk["locality"].unique()
+    }
+    chunk["lat"] = chunk["locality"].map(lambda loc: coords[loc][0] if coords[loc] else None)
+    chunk["lon"] = chunk["locality"].map(lambda loc: coords[loc][1] if coords[loc] else None)
+    return chunk.dropna(subset=["lat", "lon"])
+
+
+def prepare_chunk(raw: pd.DataFrame, city: str = CITY) -> pd.DataFrame:
+    """
+    Payload columns and embedding text for raw CSV rows, keeping their
+    index (the point ids). Rows that can't be geocoded are dropped.
+    """
+    chunk = pd.DataFrame({
+        "city": city_key(city),
+        "locality": raw["Location"],
+        "bhk": raw["No. of Bedrooms"].astype(int),
+        "price": raw["Price"].astype(float),
+        "area_sqft": raw["Area"].astype(float),
+    }, index=raw.index)
+    chunk["amenities"] = build_amenities(raw)
+    chunk["amenity_mask"] = build_amenity_masks(raw)
+    chunk = attach_coordinates(chunk, city)
+    chunk["text"] = build_texts(chunk, city)
+    return chunk
+
+
+def build_points(chunk: pd.DataFrame, vectors) -> list[PointStruct]:
+    return [
+        PointStruct(
+            id=int(idx),
+            vector=vector.tolist(),
+            payload={
+                "city": city,
+                "locality": locality,
+                "price": price,
+                "bhk": bhk,
+                "area_sqft": area,
+                "amenity_mask": mask,
+                "geo": {
+                    "lat": lat,
+                    "lon": lon
+                }
+            }
+        )
+        for idx, vector, city, locality, price, bhk, area, mask, lat, lon in zip(
+            chunk.index,
+            vectors,
+            chunk["city"],
+            chunk["locality"],
+            chunk["price"],
+            chunk["bhk"],
+            chunk["area_sqft"],
+            chunk["amenity_mask"],
+            chunk["lat"],
+            chunk["lon"]
+        )
+    ]
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def ingest(
+    csv_path: str = CSV_PATH,
+    chunk_size: int = CHUNK_SIZE,
+    collection_name: str = COLLECTION_NAME,
+    city: str = CITY,
+    previous: dict | None = None,
+    progress=None
+):
+    """
+    Streams the CSV and embeds / upserts only the rows whose hash differs
+    from `previous` ({point id: row hash}; None: every row). Returns the
+    new manifest, the catalog of upserted rows and the row counts;
+    `progress(counts)` is called after every chunk.
+    """
+    started = time.perf_counter()
+    previous = previous or {}
+    manifest = {}
+    seen = {}
+    # Compact per-point columns for the gazetteer and the property store
+    catalog = []
+    counts = {"rows": 0, "added": 0, "changed": 0, "unchanged": 0, "skipped": 0, "removed": 0}
+
+    logger.info(
+        "%s: embedding with %s (%s backend) into %s",
+        city, MODEL_NAME, EMBEDDING_BACKEND, collection_name
+    )
+
+    # 🔹 Stream the dataset chunk by chunk
+    for raw in pd.read_csv(csv_path, chunksize=chunk_size):
+        counts["rows"] += len(raw)
+        raw.index = row_ids(raw, city, seen)
+        hashes = row_hashes(raw)
+
+        known = [previous.get(pid) for pid in raw.index.tolist()]
+        unchanged = np.array([old == new for old, new in zip(known, hashes.tolist())], dtype=bool)
+        counts["unchanged"] += int(unchanged.sum())
+        manifest.update(zip(raw.index[unchanged].tolist(), hashes[unchanged].tolist()))
+
+        # Only new and changed listings are geocoded and embedded
+        work = raw[~unchanged]
+        chunk = prepare_chunk(work, city) if len(work) else work
+        counts["skipped"] += len(work) - len(chunk)
+
+        if not chunk.empty:
+            vectors = embed_batch(chunk["text"].tolist())
+            # Same id: a changed listing overwrites its point
+            insert(build_points(chunk, vectors), collection_name)
+            catalog.append(chunk[STORE_FIELDS])
+
+            ids = chunk.index.tolist()
+            added = sum(pid not in previous for pid in ids)
+            counts["added"] += added
+            counts["changed"] += len(ids) - added
+            manifest.update(zip(ids, hashes[raw.index.get_indexer(chunk.index)].tolist()))
+
+        logger.info("Processed %d rows...", counts["rows"])
+        if progress is not None:
+            progress(dict(counts))
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "%d rows in %.1fs (%.1f rows/sec): %d added, %d changed, %d unchanged, %d skipped",
+        counts["rows"], elapsed, counts["rows"] / elapsed if elapsed else 0.0,
+        counts["added"], counts["changed"], counts["unchanged"], counts["skipped"]
+    )
+
+    peak = peak_memory_mb()
+    if peak is not None:
+        logger.info("Peak memory: %.1f MB", peak)
+
+    catalog = pd.concat(catalog) if catalog else pd.DataFrame(columns=STORE_FIELDS)
+    return manifest, catalog, counts
+
+
+def dataset_bounds(rows: pd.DataFrame) -> dict:
+    return {
+        "min_lat": float(rows["lat"].min()),
+        "max_lat": float(rows["lat"].max()),
+        "min_lon": float(rows["lon"].min()),
+        "max_lon": float(rows["lon"].max())
+    }
+
+
+def save_metadata(bounds: dict, city: str = CITY, collection_name: str | None = None):
+    #  Save the city's geographic metadata next to the other cities'
+    save_city_metadata(city, {
+        "dataset_name": f"{city} Real Estate Dataset",
+        "collection": collection_name or city_collection(city),
+        # Vectors from another backend are close but not identical; query with the same one
+        "embedding_model": MODEL_NAME,
+        "embedding_backend": EMBEDDING_BACKEND,
+        **bounds
+    })
+
+    logger.info("%s geographic bounds saved to the dataset metadata", city)
+
+
+def save_gazetteer(catalog: pd.DataFrame, path: str = GAZETTEER_PATH):
+    #  Locality names + coordinates, so queries resolve them without geocoding;
+    #  the other cities' localities are kept
+    base = Gazetteer.load(path) if os.path.exists(path) else None
+    gazetteer = base
+    for city, places in catalog.drop_duplicates("locality").groupby("city"):
+        localities = dict(zip(places["locality"], zip(places["lat"], places["lon"])))
+        gazetteer = build_gazetteer(localities, city, gazetteer)
+    if gazetteer is None:
+        gazetteer = build_gazetteer({}, "")
+    gazetteer.save(path)
+    logger.info("Gazetteer with %d places saved to %s", len(gazetteer), path)
+
+
+def save_property_store(catalog: pd.DataFrame, path: str = PROPERTY_STORE_PATH, keep_ids=None) -> pd.DataFrame:
+    """
+    Merges upserted rows into the columnar store and returns the merged
+    rows. Rows of the catalog's cities are replaced, except `keep_ids`
+    (the unchanged listings of an incremental run); other cities' are kept.
+    """
+    frames = [catalog]
+    if os.path.exists(os.path.join(path, "ids.npy")):
+        existing = PropertyStore.load(path, mmap=False).to_frame()
+        kept = ~existing["city"].isin(catalog["city"].unique())
+        if keep_ids is not None:
+            kept |= existing.index.isin(list(keep_ids))
+        frames.insert(0, existing[kept & ~existing.index.isin(catalog.index)])
+    merged = pd.concat(frames)
+    store = PropertyStore.from_frame(merged)
+    store.save(path)
+    logger.info("Property store with %d rows saved to %s", len(store), path)
+    return merged
+
+
+def resolve_csv_path(city: str, csv_path: str | None = None) -> str:
+    if csv_path:
+        return csv_path
+    if city_key(city) == city_key(CITY):
+        return CSV_PATH
+    raise ValueError(f"A CSV path is required for {city}")
+
+
+def run_ingest(
+    city: str = CITY,
+    csv_path: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    full: bool = False,
+    rebuild: bool = False,
+    drop_previous: bool = False,
+    progress=None
+) -> dict:
+    """
+    Brings the city's collection, property store, gazetteer and metadata
+    in line with the CSV. Incremental by default: only listings that are
+    new or changed since the last run (per the manifest) are embedded, and
+    listings gone from the CSV are deleted. `full` re-embeds every row;
+    `rebuild` does so into a new collection version behind the alias.
+    """
+    csv_path = resolve_csv_path(city, csv_path)
+    collection = city_collection(city)
+
+    if rebuild:
+        # Searches keep hitting the current version until the alias swap
+        target = create_next_version(collection)
+        previous = None
+    else:
+        ensure_collection(collection)
+        target = collection
+        previous = None if full else _usable_manifest(city, collection)
+
+    manifest, catalog, counts = ingest(csv_path, chunk_size, target, city, previous, progress)
+
+    # Listings gone from the CSV (or that no longer geocode); after a full run
+    # into the live collection, any point this run didn't write
+    if previous is not None:
+        removed = [pid for pid in previous if pid not in manifest]
+    elif not rebuild:
+        removed = [pid for pid in point_ids(target) if pid not in manifest]
+    else:
+        removed = []
+    delete_points(removed, target)
+    counts["removed"] = len(removed)
+
+    if rebuild:
+        swap_alias(target, drop_previous=drop_previous, alias=collection)
+        logger.info("Alias %s now points to %s", collection, target)
+
+    merged = save_property_store(catalog, PROPERTY_STORE_PATH, keep_ids=manifest.keys() if previous is not None else None)
+    rows = merged[merged["city"] == city_key(city)]
+    if rows.empty:
+        logger.warning("%s has no geocoded listings; metadata and gazetteer left as they were", city)
+    else:
+        save_metadata(dataset_bounds(rows), city, collection)
+        save_gazetteer(rows, GAZETTEER_PATH)
+    save_manifest(manifest, city, collection, INGEST_MANIFEST_DIR)
+
+    if progress is not None:
+        progress(dict(counts))
+    return {"city": city_key(city), "collection": collection, **counts}
+
+
+def _usable_manifest(city: str, collection: str):
+    """
+    The previous run's {point id: row hash}, unless the collection or the
+    property store it describes is gone (then everything is re-ingested).
+    """
+    loaded = load_manifest(city, INGEST_MANIFEST_DIR)
+    if loaded is None:
+        return None
+    manifest, manifest_collection = loaded
+    if manifest_collection != collection:
+        return None
+    if not os.path.exists(os.path.join(PROPERTY_STORE_PATH, "ids.npy")):
+        logger.warning("No property store at %s; re-ingesting %s in full", PROPERTY_STORE_PATH, city)
+        return None
+    if manifest and get_client().count(collection_name=collection, exact=False).count == 0:
+        logger.warning("Collection %s is empty; re-ingesting %s in full", collection, city)
+        return None
+    return manifest
+
+
+def refresh_serving_state():
+    """
+    Makes this process pick up what an ingest wrote: the property store,
+    spatial index, gazetteer and city routes are reloaded on next use.
+    Other processes reload the store and index on their own once its
+    version changes (see get_property_store()), within STORE_CHECK_SECONDS.
+    """
+    property_store._store, property_store._store_loaded = None, False
+    spatial_index._index, spatial_index._index_loaded = None, False
+    gazetteer_module._gazetteer = None
+    city_router._router = None
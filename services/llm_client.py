@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+# Local model server (Ollama HTTP API)
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# Connection-level failures worth retrying
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+class LLMUnavailable(Exception):
+    """The model server failed, timed out, or the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls until
+    `cooldown` seconds have passed; then half-open: a single trial call
+    goes through while the others are still rejected, and its outcome
+    closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+        self._lock = threading.Lock()
+
+    def _rejecting(self, now: float) -> bool:
+        if self.opened_at is None:
+            return False
+        if now - self.opened_at < self.cooldown:
+            return True
+        # A trial that never reported back frees its slot after another cooldown
+        return self.trial_started_at is not None and now - self.trial_started_at < self.cooldown
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._rejecting(now):
+                return False
+            if self.opened_at is not None:
+                self.trial_started_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("LLM circuit breaker closed")
+            self.failures = 0
+            self.opened_at = None
+            self.trial_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    logger.warning("LLM circuit breaker opened")
+                self.opened_at = time.monotonic()
+                self.trial_started_at = None
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._rejecting(time.monotonic())
+
+
+class LLMClient:
+    """
+    Shared client for the local model server: one pooled HTTP session,
+    a bounded number of in-flight calls, retries and a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_URL,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        retries: int = LLM_RETRIES,
+        breaker: CircuitBreaker | None = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.breaker = breaker or CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_COOLDOWN_SECONDS)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _acquire_slot(self, timeout: float | None):
+        # Waiting for a slot counts against the same budget as the call itself
+        if not self._slots.acquire(timeout=timeout or self.timeout):
+            raise LLMUnavailable("no free LLM slot")
+
+    def _post(self, payload: dict, timeout: float | None, stream: bool = False):
+        if not self.breaker.allow():
+            raise LLMUnavailable("circuit breaker open")
+
+        for attempt in range(self.retries + 1):
+            try:
+                r = self.session.post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=timeout or self.timeout,
+                    stream=stream
+                )
+                if r.status_code >= 500:
+                    raise requests.ConnectionError(f"HTTP {r.status_code}")
+                r.raise_for_status()
+                return r
+
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.retries:
+                    self.breaker.record_failure()
+                    raise LLMUnavailable(str(e)) from e
+                logger.debug("LLM call failed (%s), retrying", e)
+                time.sleep(0.2 * 2 ** attempt)
+
+            except requests.RequestException as e:
+                self.breaker.record_failure()
+                raise LLMUnavailable(str(e)) from e
+
+    def generate(self, prompt: str, model: str, timeout: float | None = None, format: str | None = None) -> str:
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if format:
+            payload["format"] = format
+
+        self._acquire_slot(timeout)
+        try:
+            r = self._post(payload, timeout)
+            try:
+                text = r.json()["response"]
+            except (ValueError, KeyError) as e:
+                self.breaker.record_failure()
+                raise LLMUnavailable("malformed response") from e
+        finally:
+            self._slots.release()
+
+        self.breaker.record_success()
+        return text
+
+    def stream(self, prompt: str, model: str, timeout: float | None = None):
+        """
+        Yields response tokens as the server produces them.
+        """
+        payload = {"model": model, "prompt": prompt, "stream": True}
+
+        self._acquire_slot(timeout)
+        try:
+            r = self._post(payload, timeout, stream=True)
+            try:
+                for line in r.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+            except (requests.RequestException, ValueError) as e:
+                self.breaker.record_failure()
+                raise LLMUnavailable(str(e)) from e
+            finally:
+                r.close()
+        finally:
+            self._slots.release()
+
+        self.breaker.record_success()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
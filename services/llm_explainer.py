@@ -1,22 +1,55 @@
-import subprocess
+import os
+from services.llm_client import get_llm_client
+from services.explanation_cache import explanation_cache, explanation_key
+from services.cache import MISS
+from services.metrics import timed
 from services.logger import get_logger
 logger = get_logger(__name__)
 
+EXPLAINER_MODEL = os.getenv("EXPLAINER_MODEL", "llama3.2")
+
+
+def template_explanation(user_query, results, cities=None):
+    """
+    Fact-only fallback used when the LLM is unavailable.
+    """
+    if not results:
+        return "No matching properties were found."
+
+    top = results[0]
+    noun = "property matches" if len(results) == 1 else "properties match"
+    return (
+        f"{len(results)} {noun} your search. "
+        f"The top result is a {top['bhk']} BHK in {top['locality']} priced at "
+        f"Rs {top['price']} with an area of {top['area_sqft']} square feet."
+    )
+
+
+def city_context(cities) -> str:
+    """
+    Prompt line naming the cities the search was routed to.
+    """
+    names = [city.title() for city in cities or []]
+    if len(names) == 1:
+        return f"- All properties belong to the city of {names[0]}."
+    if names:
+        return f"- The properties are in {', '.join(names[:-1])} or {names[-1]}."
+    return ""
 
-def explain_results(user_query, results):
-    try:
-        count = len(results)
 
-        # Build grounded summary (facts only)
-        summary = "\n".join([
+def build_prompt(user_query, results, cities=None):
+    count = len(results)
+
+    # Build grounded summary (facts only)
+    summary = "\n".join([
     f"{r['bhk']} BHK in {r['locality']} priced at Rs {r['price']} with area {r['area_sqft']} square feet"
     for r in results[:3]
 ])
 
-        prompt = f"""
+    return f"""
  You are generating a natural language explanation for real estate search results.
         IMPORTANT CONTEXT:
-- All properties belong to the city of Mumbai.
+{city_context(cities)}
 
 
 
@@ -46,30 +79,66 @@ STRICT RULES:
 
 Now write the explanation.
 """
-        logger.info("Generating explanation using LLM")
 
-        result = subprocess.run(
-            ["ollama", "run", "llama3.2"],
-            input=prompt,
-            text=True,
-            capture_output=True,
-            encoding="utf-8",
-            timeout=60
-        )
 
-        output = result.stdout.strip()
+@timed("explain")
+def explain_results(user_query, results, cities=None, lookup=True):
+    """
+    lookup=False when the caller has already missed the cache for this
+    request (async jobs), so each request counts as a single lookup.
+    """
+    key = explanation_key(user_query, results, cities)
+    cached = explanation_cache.get(key) if lookup else MISS
+    if cached is not MISS:
+        logger.info("Explanation served from cache")
+        return cached
+
+    try:
+        prompt = build_prompt(user_query, results, cities)
+        logger.info("Generating explanation using LLM")
+
+        output = get_llm_client().generate(prompt, model=EXPLAINER_MODEL).strip()
 
         if not output:
             logger.warning("LLM returned empty output")
 
 
-            return "Explanation could not be generated."
-        
+            return template_explanation(user_query, results, cities)
+
         logger.info("LLM explanation generated successfully")
+        explanation_cache.set(key, output)
         return output
 
     except Exception:
         logger.error("LLM explanation failed", exc_info=True)
 
-        return "Explanation could not be generated."
+        return template_explanation(user_query, results, cities)
+
+
+def stream_explanation(user_query, results, cities=None, lookup=True):
+    """
+    Yields the explanation in chunks as the LLM produces them.
+    """
+    key = explanation_key(user_query, results, cities)
+    cached = explanation_cache.get(key) if lookup else MISS
+    if cached is not MISS:
+        yield cached
+        return
+
+    tokens = []
+    try:
+        prompt = build_prompt(user_query, results, cities)
+        logger.info("Streaming explanation from LLM")
+
+        for token in get_llm_client().stream(prompt, model=EXPLAINER_MODEL):
+            tokens.append(token)
+            yield token
+
+        if tokens:
+            explanation_cache.set(key, "".join(tokens).strip())
+
+    except Exception:
+        logger.error("LLM explanation stream failed", exc_info=True)
 
+    if not tokens:
+        yield template_explanation(user_query, results, cities)
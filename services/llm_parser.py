@@ -1,5 +1,10 @@
 import json
-import subprocess
+import os
+from services.llm_client import LLMUnavailable, get_llm_client
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+PARSER_MODEL = os.getenv("PARSER_MODEL", "mistral")
 
 SYSTEM_PROMPT = """
 You are an assistant that extracts structured filters from real estate queries.
@@ -18,14 +23,9 @@ Query:
 {user_query}
 """
 
-    result = subprocess.run(
-        ["ollama", "run", "mistral"],
-        input=prompt,
-        text=True,
-        capture_output=True
-    )
-
     try:
-        return json.loads(result.stdout)
-    except Exception:
+        output = get_llm_client().generate(prompt, model=PARSER_MODEL, format="json")
+        return json.loads(output)
+    except (LLMUnavailable, ValueError):
+        logger.warning("LLM query parsing failed", exc_info=True)
         return {}
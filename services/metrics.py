@@ -0,0 +1,189 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator
+
+# Latency buckets in seconds, from cache hits up to LLM generations
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+_registry = []
+_caches = {}
+
+
+def _format_labels(labelnames, values, extra=()) -> str:
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{str(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=(), register: bool = True):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if register:
+            _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets=DEFAULT_BUCKETS,
+        register: bool = True
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+        if register:
+            _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        series = self._series.get(key)
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, [("le", bound)])
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+STAGE_LATENCY = Histogram(
+    "georag_stage_latency_seconds",
+    "Latency of each /api/ask pipeline stage",
+    ["stage"]
+)
+STAGE_ERRORS = Counter(
+    "georag_stage_errors_total",
+    "Exceptions raised inside a pipeline stage",
+    ["stage"]
+)
+REJECTIONS = Counter(
+    "georag_rejections_total",
+    "Queries rejected by the /api/ask guards",
+    ["reason"]
+)
+REQUEST_ERRORS = Counter(
+    "georag_request_errors_total",
+    "Requests that failed with an internal error",
+    ["endpoint"]
+)
+
+
+class timed(ContextDecorator):
+    """
+    Records the wrapped block or function in the stage latency histogram.
+
+        @timed("embed")
+        def embed(text): ...
+
+        with timed("rerank"):
+            ...
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_LATENCY.observe(time.perf_counter() - self._started, stage=self.stage)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(stage=self.stage)
+        return False
+
+    def _recreate_cm(self):
+        # A fresh instance per call keeps the start time thread-safe
+        return timed(self.stage)
+
+
+def register_cache(name: str, cache):
+    """
+    Exposes a cache's stats() (hits / misses / evictions, size) on /metrics.
+    """
+    _caches[name] = cache
+
+
+def _render_caches() -> list[str]:
+    lines = []
+    for metric, documentation in (
+        ("hits", "Cache lookups served from the cache"),
+        ("misses", "Cache lookups that fell through"),
+        ("evictions", "Entries evicted to respect the size bound"),
+    ):
+        name = f"georag_cache_{metric}_total"
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} counter"]
+        for cache_name, cache in sorted(_caches.items()):
+            stats = cache.stats()
+            lines.append(f'{name}{{cache="{cache_name}"}} {stats.get(metric, 0)}')
+    for metric, documentation in (
+        ("size", "Entries currently cached"),
+        ("maxsize", "Size bound of the cache"),
+    ):
+        name = f"georag_cache_{metric}"
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+        for cache_name, cache in sorted(_caches.items()):
+            stats = cache.stats()
+            if metric in stats:
+                lines.append(f'{name}{{cache="{cache_name}"}} {stats[metric]}')
+    return lines
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    lines += _render_caches()
+    return "\n".join(lines) + "\n"
@@ -1,64 +1,184 @@
-
 import re
 from services.logger import get_logger
+from services.metrics import timed
 logger = get_logger(__name__)
 
-
-def parse_query(text: str) -> dict:
-    logger.debug(f"Parsing query text: {text}")
-
+LAKH = 100_000
+CRORE = 10_000_000
+
+DOMAIN_WORDS = frozenset({
+    "flat", "flats", "apartment", "apartments", "house", "houses", "housing",
+    "bhk", "property", "properties", "home", "homes", "villa", "villas", "studio",
+    "rent", "rental", "rentals", "renting", "buy", "buying", "sale", "resale",
+    "lac", "lacs", "lakh", "lakhs", "crore", "crores", "budget",
+    "sqft", "square", "area",
+    "gym", "parking", "lift"
+})
+
+# Query word -> dataset amenity column
+AMENITY_WORDS = {
+    "gym": "Gymnasium",
+    "gymnasium": "Gymnasium",
+    "lift": "Lift Available",
+    "elevator": "Lift Available",
+    "parking": "Car Parking",
+    "security": "24x7 Security",
+    "playground": "Children's Play Area",
+    "clubhouse": "Clubhouse",
+    "intercom": "Intercom",
+    "garden": "Landscaped Gardens",
+    "gardens": "Landscaped Gardens",
+    "jogging": "Jogging Track",
+    "pool": "Swimming Pool",
+    "swimming": "Swimming Pool"
+}
+
+KNOWN_CITIES = {
+    "mumbai": "mumbai",
+    "bombay": "mumbai",
+    "pune": "pune",
+    "delhi": "delhi",
+    "bangalore": "bangalore",
+    "bengaluru": "bangalore",
+    "chennai": "chennai",
+    "hyderabad": "hyderabad"
+}
+
+
+UNITS = {
+    "lakh": LAKH, "lakhs": LAKH, "lac": LAKH, "lacs": LAKH,
+    "crore": CRORE, "crores": CRORE, "cr": CRORE
+}
+
+# Words that turn the next number into an upper / lower price bound
+BOUND_WORDS = {
+    "under": "max", "below": "max", "upto": "max", "up": "max", "within": "max",
+    "less": "max", "max": "max", "maximum": "max", "budget": "max",
+    "above": "min", "over": "min", "more": "min", "min": "min", "minimum": "min"
+}
+# Allowed between a bound word and its number ("up to", "less than", "budget of rs")
+FILLER_WORDS = frozenset({"to", "than", "of", "rs"})
+# A unitless "under 5" is a price unless one of these follows
+NON_PRICE_UNITS = frozenset({
+    "km", "kms", "kilometer", "kilometers", "kilometre", "kilometres",
+    "m", "meter", "meters", "metre", "metres",
+    "min", "mins", "minute", "minutes", "hour", "hours", "hr", "hrs",
+    "year", "years", "yr", "yrs",
+    "sqft", "sq", "square", "floor", "floors"
+})
+
+# Numbers, words and the range dash. Everything else is whitespace or noise.
+_TOKEN = re.compile(r"\d+(?:\.\d+)?|[a-z]+|-")
+
+
+def extract(text: str) -> dict:
     """
-    Extract ONLY explicit intent from the query.
-    No defaults. No guessing.
+    Single pass over the query tokens: BHK, price bounds, amenities,
+    city and whether it reads as a real-estate query at all.
     """
-    text = text.lower()
-
-    filters = {
+    result = {
         "bhk": None,
+        "min_price": None,
         "max_price": None,
-        "require_gym": False
+        "require_gym": False,
+        "amenities": [],
+        "city": None,
+        "is_real_estate": False
     }
+    # A bare "80 lakh" is only used when no explicit bound was given
+    bare_price = None
+    bound = None
+
+    tokens = _TOKEN.findall(text.lower())
+    n = len(tokens)
+    i = 0
+    while i < n:
+        token = tokens[i]
+        i += 1
+
+        if not token[0].isdigit():
+            if token in DOMAIN_WORDS:
+                result["is_real_estate"] = True
+            amenity = AMENITY_WORDS.get(token)
+            if amenity and amenity not in result["amenities"]:
+                result["amenities"].append(amenity)
+            if result["city"] is None and token in KNOWN_CITIES:
+                result["city"] = KNOWN_CITIES[token]
+
+            if token in BOUND_WORDS:
+                bound = BOUND_WORDS[token]
+            elif token not in FILLER_WORDS:
+                bound = None
+            continue
+
+        following = tokens[i] if i < n else None
+
+        # -------- BHK --------
+        if following == "bhk":
+            if result["bhk"] is None:
+                result["bhk"] = int(float(token))
+            result["is_real_estate"] = True
+            bound = None
+            i += 1
+            continue
+
+        unit = UNITS.get(following)
+        if unit:
+            i += 1
+
+        # -------- RANGE ("50-80 lac", "50 lakh to 1.2 cr") --------
+        if i + 2 < n and tokens[i] in ("-", "to") and tokens[i + 1][0].isdigit():
+            high_unit = UNITS.get(tokens[i + 2])
+            if high_unit:
+                result["min_price"] = int(float(token) * (unit or high_unit))
+                result["max_price"] = int(float(tokens[i + 1]) * high_unit)
+                result["is_real_estate"] = True
+                bound = None
+                i += 3
+                continue
+
+        # -------- PRICE --------
+        if unit:
+            price = int(float(token) * unit)
+            result["is_real_estate"] = True
+        elif bound and following not in NON_PRICE_UNITS:
+            # "under 80" means lakh (Indian context) unless it is already rupees
+            amount = float(token)
+            price = int(amount) if amount >= LAKH else int(amount * LAKH)
+        else:
+            bound = None
+            continue
+
+        if bound == "max":
+            if result["max_price"] is None:
+                result["max_price"] = price
+        elif bound == "min":
+            if result["min_price"] is None:
+                result["min_price"] = price
+        elif bare_price is None:
+            bare_price = price
+        bound = None
+
+    if result["max_price"] is None and result["min_price"] is None:
+        result["max_price"] = bare_price
+
+    result["require_gym"] = "Gymnasium" in result["amenities"]
+    return result
+
+
+@timed("parse")
+def parse_query(text: str) -> dict:
+    """
+    Extract ONLY explicit intent from the query.
+    No defaults. No guessing.
+    """
+    logger.debug("Parsing query text: %s", text)
 
-    # -------- BHK --------
-    bhk_match = re.search(r"(\d+)\s*bhk", text)
-    if bhk_match:
-        filters["bhk"] = int(bhk_match.group(1))
-
-    # -------- PRICE (lac/lakh) --------
-    price_match = re.search(r"(\d+(?:\.\d+)?)\s*(lac|lakh)", text)
-    if price_match:
-        filters["max_price"] = int(float(price_match.group(1)) * 100_000)
-
-    # -------- PRICE (crore) --------
-    price_match = re.search(r"(\d+(?:\.\d+)?)\s*(cr|crore)", text)
-    if price_match:
-        filters["max_price"] = int(float(price_match.group(1)) * 10_000_000)
-
-    # -------- AMENITIES --------
-    if "gym" in text:
-        filters["require_gym"] = True
-    logger.debug(f"Parsed intent: {filters}")
+    filters = extract(text)
+    logger.debug("Parsed intent: %s", filters)
 
     return filters
 
 
 def parse_max_price(text: str):
-    text = text.lower()
-
-    # 1️⃣ lakh / lac
-    match = re.search(r"(\d+(?:\.\d+)?)\s*(lac|lakh)", text)
-    if match:
-        return int(float(match.group(1)) * 100_000)
-
-    # 2️⃣ crore / cr
-    match = re.search(r"(\d+(?:\.\d+)?)\s*(cr|crore)", text)
-    if match:
-        return int(float(match.group(1)) * 10_000_000)
-
-    # 3️⃣ under X (fallback ONLY if no unit)
-    match = re.search(r"under\s*(\d+)", text)
-    if match:
-        # assume lakh by default (Indian context)
-        return int(match.group(1)) * 100_000
-
-    return None
+    return extract(text)["max_price"]
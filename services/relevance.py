@@ -1,28 +1,208 @@
-def compute_relevance_score(
-    vector_score: float,
-    property_data: dict,
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.amenities import Amenity, names_from_mask, payload_mask
+
+
+@dataclass(frozen=True)
+class RelevanceWeights:
+    """
+    Boosts added to the vector score when a candidate matches the intent.
+    """
+    bhk: float = 0.15
+    budget: float = 0.15
+    # For having every requested amenity
+    amenities: float = 0.1
+    # Up to `distance` for a point at the search centre, decaying with exp(-d / distance_decay_km)
+    distance: float = 0.1
+    distance_decay_km: float = 3.0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            bhk=float(os.getenv("RELEVANCE_BHK_WEIGHT", cls.bhk)),
+            budget=float(os.getenv("RELEVANCE_BUDGET_WEIGHT", cls.budget)),
+            amenities=float(os.getenv("RELEVANCE_AMENITY_WEIGHT", cls.amenities)),
+            distance=float(os.getenv("DISTANCE_WEIGHT", cls.distance)),
+            distance_decay_km=float(os.getenv("DISTANCE_DECAY_KM", cls.distance_decay_km))
+        )
+
+
+WEIGHTS = RelevanceWeights.from_env()
+
+
+def _payload_columns(payloads) -> dict:
+    return {
+        # None (missing field) becomes NaN, which never matches
+        "bhk": np.array([p.get("bhk") for p in payloads], dtype=float),
+        "price": np.array([p.get("price") for p in payloads], dtype=float),
+        "amenity_mask": np.array([payload_mask(p) for p in payloads], dtype=np.int64)
+    }
+
+
+def _store_columns(points, store) -> dict:
+    rows, found = store.positions([point.id for point in points])
+    c = store.columns
+    # Ids missing from the store (ingested since it was loaded) are read from their payloads
+    fallback = _payload_columns([
+        {} if known else (point.payload or {}) for point, known in zip(points, found.tolist())
+    ])
+    return {
+        "row": np.where(found, rows, -1),
+        "bhk": np.where(found, c["bhk"][rows], fallback["bhk"]),
+        "price": np.where(found, c["price"][rows], fallback["price"]),
+        "amenity_mask": np.where(found, c["amenity_mask"][rows], fallback["amenity_mask"])
+    }
+
+
+def candidate_columns(points, distances=None, store=None) -> dict:
+    """
+    One pass over the search results into NumPy columns: gathered from
+    the property store when given, else from the payloads.
+    """
+    if store is not None:
+        columns = _store_columns(points, store)
+    else:
+        columns = _payload_columns([point.payload for point in points])
+    columns["score"] = np.array([point.score for point in points], dtype=float)
+    columns["distance"] = (
+        np.full(len(points), np.nan) if distances is None
+        else np.asarray(distances, dtype=float)
+    )
+    return columns
+
+
+def score_columns(
+    columns: dict,
     bhk=None,
     max_price=None,
-    require_gym=False
-) -> float:
+    amenities: int = 0,
+    min_price=None,
+    weights: RelevanceWeights = WEIGHTS
+):
     """
-    Combines semantic similarity with intent signals.
+    Boosted scores for the whole batch, plus the per-signal match masks
+    (None for signals the query didn't ask about).
     """
+    final = columns["score"].copy()
+    matches = {"bhk": None, "budget": None, "amenities": None}
+
+    if bhk not in (None, 0):
+        matches["bhk"] = columns["bhk"] == bhk
+        final += weights.bhk * matches["bhk"]
+
+    if max_price not in (None, 0) or min_price not in (None, 0):
+        price = columns["price"]
+        # Unknown prices never count as within budget
+        within = ~np.isnan(price)
+        if max_price not in (None, 0):
+            within &= price <= max_price
+        if min_price not in (None, 0):
+            within &= price >= min_price
+        matches["budget"] = within
+        final += weights.budget * within
+
+    if amenities:
+        # All requested amenities, as one AND-mask test
+        matches["amenities"] = columns["amenity_mask"] & amenities == amenities
+        final += weights.amenities * matches["amenities"]
+
+    distance = columns["distance"]
+    known = ~np.isnan(distance)
+    final[known] += weights.distance * np.exp(-distance[known] / weights.distance_decay_km)
+
+    return final, matches
 
-    score = vector_score  # base semantic score
 
-    # Intent-based boosts
-    if bhk and property_data["bhk"] == bhk:
-        score += 0.25
+def _reason(row: dict, bhk, max_price, amenities) -> str:
+    reasons = []
 
-    if max_price and property_data["price"] <= max_price:
-        score += 0.25
+    if row["bhk"] is not None:
+        reasons.append(f"{bhk} BHK matched" if row["bhk"] else "Different BHK")
 
-    if require_gym and "Gymnasium" in property_data["amenities"]:
-        score += 0.15
+    if row["budget"] is not None:
+        if row["budget"]:
+            reasons.append("Within budget")
+        elif max_price not in (None, 0) and row["price"] > max_price:
+            reasons.append("Above budget")
+        else:
+            reasons.append("Below budget")
 
-    return round(score, 3)
+    if row["amenities"] is not None:
+        if amenities == Amenity.GYMNASIUM:
+            reasons.append("Gym available" if row["amenities"] else "No gym")
+        elif row["amenities"]:
+            reasons.append("All amenities available")
+        else:
+            missing = names_from_mask(amenities & ~row["amenity_mask"])
+            reasons.append("Missing " + ", ".join(missing))
+
+    if row["distance"] is not None:
+        reasons.append(f"{row['distance']:.1f} km away")
+
+    return ", ".join(reasons) or "Semantically relevant"
+
+
+def rerank(
+    points,
+    bhk=None,
+    max_price=None,
+    amenities: int = 0,
+    min_price=None,
+    distances=None,
+    top_k: int = 5,
+    weights: RelevanceWeights = WEIGHTS,
+    store=None
+) -> list[dict]:
+    """
+    Scores every candidate in one vectorized pass and builds result
+    dicts (with their reason strings) for the top_k only. With a
+    property store, fields come from its columns instead of the payloads.
+    """
+    if not points:
+        return []
 
+    columns = candidate_columns(points, distances, store)
+    final, matches = score_columns(columns, bhk, max_price, amenities, min_price, weights)
 
+    # Stable, so equal scores keep the vector search order
+    top = np.argsort(-final, kind="stable")[:top_k]
 
+    # Back to Python scalars for the few rows that are returned
+    scores = final[top].tolist()
+    prices = columns["price"][top].tolist()
+    distances = columns["distance"][top].tolist()
+    masks = columns["amenity_mask"][top].tolist()
+    rows = columns["row"][top].tolist() if store is not None else [-1] * len(top)
+    flags = {
+        name: (mask[top].tolist() if mask is not None else [None] * len(top))
+        for name, mask in matches.items()
+    }
 
+    results = []
+    for rank, i in enumerate(top.tolist()):
+        p = store.record(rows[rank]) if rows[rank] >= 0 else (points[i].payload or {})
+        distance = None if math.isnan(distances[rank]) else round(distances[rank], 2)
+        row = {
+            "bhk": flags["bhk"][rank],
+            "budget": flags["budget"][rank],
+            "amenities": flags["amenities"][rank],
+            "amenity_mask": masks[rank],
+            "price": prices[rank],
+            "distance": distance
+        }
+        results.append({
+            "id": points[i].id,
+            "locality": p.get("locality"),
+            "price": p.get("price"),
+            "bhk": p.get("bhk"),
+            "area_sqft": p.get("area_sqft"),
+            "amenities": names_from_mask(masks[rank])[:5],
+            "distance_km": distance,
+            "score": round(scores[rank], 3),
+            "reason": _reason(row, bhk, max_price, amenities)
+        })
+    return results
@@ -0,0 +1,204 @@
+import math
+import os
+import threading
+
+import numpy as np
+
+import db.property_store as property_store
+from db.property_store import get_property_store
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+# Grid cell size in degrees (~1.1 km of latitude)
+GRID_CELL_DEG = float(os.getenv("GRID_CELL_DEG", "0.01"))
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+
+def haversine_km(lat, lon, lats, lons):
+    """
+    Great-circle distance from one point to arrays of points, in km.
+    """
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Uniform lat/lon grid over the property coordinates. Points are
+    stored sorted by cell, so each row of cells covering a query circle
+    is one contiguous slice; only those candidates get an exact
+    haversine check. Amenity masks ride along so hard amenity filters
+    are one AND-mask test over the candidates.
+    """
+
+    def __init__(self, ids, lats, lons, cell_deg: float = GRID_CELL_DEG, masks=None):
+        ids = np.asarray(ids, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        # Indexes saved before masks existed can't answer amenity filters
+        self.has_masks = masks is not None
+        masks = np.zeros(len(ids), dtype=np.int64) if masks is None else np.asarray(masks, dtype=np.int64)
+        self.cell_deg = cell_deg
+
+        rows = np.floor(lats / cell_deg).astype(np.int64)
+        cols = np.floor(lons / cell_deg).astype(np.int64)
+        self._min_row, self._min_col = (int(rows.min()), int(cols.min())) if len(ids) else (0, 0)
+        self._width = int(cols.max()) - self._min_col + 1 if len(ids) else 1
+
+        keys = (rows - self._min_row) * self._width + (cols - self._min_col)
+        order = np.argsort(keys, kind="stable")
+        self.ids = ids[order]
+        self.lats = lats[order]
+        self.lons = lons[order]
+        self.masks = masks[order]
+        self._keys = keys[order]
+
+        # id -> position, for distance lookups of search results
+        self._id_order = np.argsort(self.ids)
+        self._sorted_ids = self.ids[self._id_order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        if not len(self.ids):
+            return np.empty(0, dtype=np.int64)
+
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        row_lo = max(math.floor((lat - dlat) / self.cell_deg) - self._min_row, 0)
+        row_hi = math.floor((lat + dlat) / self.cell_deg) - self._min_row
+        col_lo = max(math.floor((lon - dlon) / self.cell_deg) - self._min_col, 0)
+        col_hi = min(math.floor((lon + dlon) / self.cell_deg) - self._min_col, self._width - 1)
+        if row_hi < row_lo or col_hi < col_lo:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self._keys, rows * self._width + col_lo, side="left")
+        ends = np.searchsorted(self._keys, rows * self._width + col_hi, side="right")
+        slices = [np.arange(s, e) for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def radius(self, lat: float, lon: float, radius_km: float, required_mask: int = 0):
+        """
+        (ids, distances_km) of all points within the radius that have
+        every amenity in required_mask, nearest first.
+        """
+        positions = self._candidates(lat, lon, radius_km)
+        if required_mask:
+            positions = positions[self.masks[positions] & required_mask == required_mask]
+        distances = haversine_km(lat, lon, self.lats[positions], self.lons[positions])
+        inside = distances <= radius_km
+        positions, distances = positions[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return self.ids[positions[order]], distances[order]
+
+    def nearest(self, lat: float, lon: float, k: int):
+        """
+        (ids, distances_km) of the k nearest points.
+        """
+        k = min(k, len(self.ids))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Grow the search circle until it holds k points, then fall back to everything
+        radius_km = self.cell_deg * KM_PER_DEG_LAT
+        for _ in range(12):
+            ids, distances = self.radius(lat, lon, radius_km)
+            if len(ids) >= k:
+                return ids[:k], distances[:k]
+            radius_km *= 2
+
+        distances = haversine_km(lat, lon, self.lats, self.lons)
+        order = np.argsort(distances, kind="stable")[:k]
+        return self.ids[order], distances[order]
+
+    def distances(self, lat: float, lon: float, ids) -> np.ndarray:
+        """
+        Distance in km to each of `ids`; NaN for ids not in the index.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        found = np.searchsorted(self._sorted_ids, ids)
+        found = np.minimum(found, max(len(self._sorted_ids) - 1, 0))
+        known = (self._sorted_ids[found] == ids) if len(self._sorted_ids) else np.zeros(len(ids), bool)
+
+        result = np.full(len(ids), np.nan)
+        positions = self._id_order[found[known]]
+        result[known] = haversine_km(lat, lon, self.lats[positions], self.lons[positions])
+        return result
+
+    @classmethod
+    def from_store(cls, store):
+        c = store.columns
+        return cls(store.ids, c["lat"], c["lon"], masks=c["amenity_mask"])
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {"ids": self.ids, "lats": self.lats, "lons": self.lons, "cell_deg": self.cell_deg}
+        if self.has_masks:
+            arrays["masks"] = self.masks
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str):
+        data = np.load(path)
+        masks = data["masks"] if "masks" in data else None
+        return cls(data["ids"], data["lats"], data["lons"], float(data["cell_deg"]), masks)
+
+
+def result_distances(lat: float, lon: float, points) -> np.ndarray:
+    """
+    Distance in km to each search result: from the spatial index, else
+    from the payload's geo field; NaN when neither knows the point.
+    """
+    index = get_spatial_index()
+    if index is not None:
+        distances = index.distances(lat, lon, [p.id for p in points])
+    else:
+        distances = np.full(len(points), np.nan)
+
+    for i, point in enumerate(points):
+        geo = (point.payload or {}).get("geo")
+        if np.isnan(distances[i]) and geo:
+            distances[i] = haversine_km(lat, lon, geo["lat"], geo["lon"])
+    return distances
+
+
+_UNBUILT = object()
+
+_index = None
+_index_loaded = False
+# Version of the store _index was built from; an index set directly is kept as is
+_index_version = _UNBUILT
+_index_lock = threading.Lock()
+
+
+def _index_stale() -> bool:
+    return not _index_loaded or (
+        _index_version is not _UNBUILT and _index_version != property_store._store_version
+    )
+
+
+def get_spatial_index():
+    """
+    Index over the property store written by the last ingest, or None
+    when there is none (search then relies on Qdrant's geo filter alone).
+    Rebuilt when get_property_store() has loaded a newer store.
+    """
+    global _index, _index_loaded, _index_version
+    store = get_property_store()
+    if _index_stale():
+        with _index_lock:
+            if _index_stale():
+                _index = SpatialIndex.from_store(store) if store is not None else None
+                if _index is not None:
+                    logger.info("Spatial index built over %d points", len(_index))
+                _index_version, _index_loaded = property_store._store_version, True
+    return _index
@@ -0,0 +1,14 @@
+import re
+
+# Punctuation is dropped, except a dot inside a number ("1.5 crore")
+_PUNCTUATION = re.compile(r"(?!(?<=\d)\.(?=\d))[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form used as a cache key: lowercase,
+    no punctuation, single spaces.
+    """
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+
+from db.property_store import get_property_store
+from db.vector_db import client_ready, get_client
+from services.embedding import get_model, model_loaded
+from services.gazetteer import get_gazetteer
+from services.spatial_index import get_spatial_index
+from services.logger import get_logger
+logger = get_logger(__name__)
+
+# Load the model and open Qdrant when the API starts, rather than on the first request
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+_error = None
+_lock = threading.Lock()
+
+
+def warm_up() -> dict:
+    """
+    Loads every lazily initialized resource and runs one encode, so the
+    first request doesn't pay for it. Returns seconds per step.
+    """
+    global _error
+    steps = {
+        "vector_db": get_client,
+        "model": lambda: get_model().encode("warm up"),
+        "property_store": get_property_store,
+        "spatial_index": get_spatial_index,
+        "gazetteer": get_gazetteer
+    }
+    timings = {}
+    with _lock:
+        try:
+            for name, step in steps.items():
+                started = time.perf_counter()
+                step()
+                timings[name] = round(time.perf_counter() - started, 3)
+        except Exception as e:
+            _error = f"{name}: {e}"
+            logger.exception("Warm-up failed at %s", name)
+            raise
+        _error = None
+    logger.info("Warm-up done: %s", timings)
+    return timings
+
+
+def readiness() -> dict:
+    return {
+        "ready": model_loaded() and client_ready(),
+        "model": model_loaded(),
+        "vector_db": client_ready(),
+        "error": _error
+    }
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from models.amenities import (
+    AMENITY_COLUMNS, Amenity, has_all, mask_from_names, names_from_mask, payload_mask
+)
+from services.ingestion import build_amenity_masks
+
+
+def test_every_dataset_column_has_its_own_bit():
+    header = pd.read_csv("data/raw/Mumbai1.csv", nrows=0).columns
+    # Everything after Price, Area, Location, No. of Bedrooms, New/Resale
+    amenity_columns = list(header[6:])
+
+    assert set(amenity_columns) == set(AMENITY_COLUMNS)
+    assert len({int(flag) for flag in AMENITY_COLUMNS.values()}) == len(AMENITY_COLUMNS)
+
+
+def test_mask_round_trip():
+    mask = mask_from_names(["Swimming Pool", "Gymnasium", "Unknown"])
+
+    assert mask == Amenity.GYMNASIUM | Amenity.SWIMMING_POOL
+    assert names_from_mask(mask) == ["Gymnasium", "Swimming Pool"]
+
+
+def test_and_mask_test():
+    mask = int(Amenity.GYMNASIUM | Amenity.CAR_PARKING | Amenity.SWIMMING_POOL)
+
+    assert has_all(mask, Amenity.GYMNASIUM | Amenity.SWIMMING_POOL)
+    assert not has_all(mask, Amenity.GYMNASIUM | Amenity.LIFT_AVAILABLE)
+
+
+def test_legacy_payload_without_mask():
+    assert payload_mask({"amenities": ["Clubhouse"]}) == Amenity.CLUBHOUSE
+    assert payload_mask({"amenity_mask": 5, "amenities": []}) == 5
+
+
+def test_ingest_packs_csv_flags():
+    raw = pd.DataFrame({"Gymnasium": [1, 0], "Swimming Pool": [1, 9], "Intercom": [0, 1]})
+
+    masks = build_amenity_masks(raw)
+
+    assert masks.tolist() == [Amenity.GYMNASIUM | Amenity.SWIMMING_POOL, Amenity.INTERCOM]
@@ -0,0 +1,26 @@
+from services.cache import LRUCache, MISS
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_counters_and_ttl():
+    cache = LRUCache(maxsize=4, ttl=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is MISS
+    assert cache.get("missing") is MISS
+
+    stats = cache.stats()
+    assert stats["hits"] == 0
+    assert stats["misses"] == 2
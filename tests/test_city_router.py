@@ -0,0 +1,61 @@
+import json
+from unittest.mock import patch
+
+import services.gazetteer as gazetteer_module
+from db.vector_db import COLLECTION_NAME
+from services.city_router import CityRouter
+from services.dataset_scope import city_collection, load_metadata, save_city_metadata
+from services.gazetteer import build_gazetteer
+
+CITIES = {
+    "mumbai": {"collection": "properties_mumbai", "min_lat": 18.9, "max_lat": 19.3, "min_lon": 72.8, "max_lon": 73.0},
+    "navi mumbai": {"collection": "properties_navi_mumbai", "min_lat": 18.9, "max_lat": 19.2, "min_lon": 73.0, "max_lon": 73.1},
+    "pune": {"collection": "properties_pune", "min_lat": 18.4, "max_lat": 18.6, "min_lon": 73.7, "max_lon": 74.0}
+}
+
+
+def test_routes_by_city_name():
+    router = CityRouter(CITIES)
+
+    assert router.route("Mumbai") == ["mumbai"]
+    assert router.route("Bombay, India") == ["mumbai"]
+    assert router.route("Vashi, Navi Mumbai") == ["navi mumbai"]
+    assert router.route("Delhi") == []
+    assert router.collections(["pune"]) == ["properties_pune"]
+
+
+def test_query_city_narrows_several_locations():
+    router = CityRouter(CITIES)
+
+    assert router.route("Mumbai or Pune") == ["mumbai", "pune"]
+    assert router.route("Mumbai or Pune", "pune") == ["pune"]
+
+
+def test_routes_by_dataset_locality():
+    gazetteer = build_gazetteer({"Andheri West": (19.1364, 72.8296)}, "Mumbai")
+
+    with patch.object(gazetteer_module, "_gazetteer", gazetteer):
+        assert CityRouter(CITIES).route("Andheri West") == ["mumbai"]
+
+
+def test_shared_locality_routes_to_every_city_with_it():
+    mumbai = build_gazetteer({"Camp": (19.0760, 72.8777)}, "Mumbai")
+    gazetteer = build_gazetteer({"Camp": (18.5158, 73.8800)}, "Pune", mumbai)
+
+    with patch.object(gazetteer_module, "_gazetteer", gazetteer):
+        assert sorted(CityRouter(CITIES).route("Camp")) == ["mumbai", "pune"]
+
+
+def test_metadata_keeps_other_cities(tmp_path):
+    path = str(tmp_path / "metadata.json")
+    with open(path, "w") as f:
+        json.dump({"dataset_name": "Mumbai Real Estate Dataset", "min_lat": 18.9}, f)
+
+    # A single-city file is Mumbai in the default collection
+    assert load_metadata(path)["cities"]["mumbai"]["collection"] == COLLECTION_NAME
+
+    save_city_metadata("Pune", {"collection": city_collection("Pune")}, path)
+    cities = load_metadata(path)["cities"]
+
+    assert set(cities) == {"mumbai", "pune"}
+    assert cities["pune"]["collection"] == f"{COLLECTION_NAME}_pune"
@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+import services.embedding as embedding
+
+
+@patch.object(embedding, "EMBEDDING_BATCHING", True)
+def test_normalized_repeat_query_skips_model():
+    embedding.query_cache.clear()
+
+    with patch.object(embedding, "batcher") as mock_batcher:
+        mock_batcher.embed.return_value = np.ones(384)
+
+        first = embedding.embed("2 BHK flat, under 80 lac with gym!")
+        second = embedding.embed("  2 bhk flat under 80 LAC with gym ")
+
+    assert mock_batcher.embed.call_count == 1
+    assert second is first
+    assert first.dtype == np.float32
+
+
+def test_model_loaded_once_on_first_use():
+    # A stand-in module, so the test doesn't pay for importing torch
+    fake_module = MagicMock()
+    model_class = fake_module.SentenceTransformer
+    with patch.object(embedding, "_model", None), \
+            patch.dict(sys.modules, {"sentence_transformers": fake_module}):
+        assert not embedding.model_loaded()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            models = list(pool.map(lambda _: embedding.get_model(), range(8)))
+
+        assert embedding.model_loaded()
+
+    assert model_class.call_count == 1
+    assert all(m is models[0] for m in models)
+
+
+def test_backend_selects_model_files():
+    fake_module = MagicMock()
+    with patch.dict(sys.modules, {"sentence_transformers": fake_module}):
+        embedding.load_model("onnx-int8")
+
+    _, kwargs = fake_module.SentenceTransformer.call_args
+    assert kwargs["backend"] == "onnx"
+    assert kwargs["model_kwargs"]["file_name"] == embedding.EMBEDDING_ONNX_INT8_FILE
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        embedding.load_model("tensorrt")
+
+
+@patch.object(embedding, "EMBEDDING_BATCHING", True)
+def test_concurrent_async_queries_share_a_batch():
+    embedding.query_cache.clear()
+    batch_sizes = []
+
+    def encode_batch(texts):
+        batch_sizes.append(len(texts))
+        return np.ones((len(texts), 384))
+
+    batcher = embedding.EmbeddingBatcher(encode_batch, max_batch_size=32, max_wait_ms=50)
+
+    async def ask_all():
+        return await asyncio.gather(*(embedding.aembed(f"{n} bhk flat") for n in range(1, 17)))
+
+    with patch.object(embedding, "batcher", batcher):
+        vectors = asyncio.run(ask_all())
+
+    # No thread per waiting query: all of them fit in one or two batches
+    assert len(vectors) == 16
+    assert sum(batch_sizes) == 16
+    assert len(batch_sizes) <= 2
+
+
+@patch.object(embedding, "EMBEDDING_BATCHING", True)
+def test_cancelled_query_does_not_stall_the_batcher():
+    embedding.query_cache.clear()
+    release = threading.Event()
+
+    def encode_batch(texts):
+        release.wait(5)
+        return np.ones((len(texts), 384))
+
+    batcher = embedding.EmbeddingBatcher(encode_batch, max_wait_ms=1)
+
+    async def scenario():
+        busy = batcher.submit("keeps the worker busy")
+        waiting = asyncio.create_task(embedding.aembed("1 bhk flat"))
+        await asyncio.sleep(0.05)
+        # Client disconnect while queued behind the busy batch
+        waiting.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.wrap_future(busy)
+        return await asyncio.wait_for(embedding.aembed("2 bhk flat"), timeout=5)
+
+    with patch.object(embedding, "batcher", batcher):
+        vector = asyncio.run(scenario())
+
+    assert vector.shape == (384,)
+    assert batcher._worker.is_alive()
+
+
+def test_dead_batcher_thread_is_restarted():
+    batcher = embedding.EmbeddingBatcher(lambda texts: [[1.0] for _ in texts])
+    # A worker that has exited, as after an uncaught error
+    batcher._worker = threading.Thread(target=lambda: None)
+    batcher._worker.start()
+    batcher._worker.join()
+
+    assert batcher.submit("second").result(timeout=5) == [1.0]
@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.embedding_batcher import EmbeddingBatcher
+
+
+def test_concurrent_callers_share_batches():
+    batch_sizes = []
+
+    def encode_batch(texts):
+        batch_sizes.append(len(texts))
+        # Callers arriving meanwhile queue up for the next batch
+        time.sleep(0.02)
+        return [[len(t)] for t in texts]
+
+    batcher = EmbeddingBatcher(encode_batch, max_batch_size=8, max_wait_ms=50)
+    texts = ["x" * n for n in range(1, 17)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        vectors = list(pool.map(batcher.embed, texts))
+
+    # Every caller gets its own row back, in far fewer encode calls
+    assert vectors == [[len(t)] for t in texts]
+    assert max(batch_sizes) <= 8
+    assert len(batch_sizes) < len(texts)
+
+
+def test_encode_failure_reaches_every_caller():
+    def encode_batch(texts):
+        raise RuntimeError("model crashed")
+
+    batcher = EmbeddingBatcher(encode_batch, max_wait_ms=1)
+
+    with pytest.raises(RuntimeError):
+        batcher.embed("2 bhk flat")
+
+
+def test_lone_query_skips_the_window():
+    batcher = EmbeddingBatcher(lambda texts: [[1.0] for _ in texts], max_wait_ms=2000)
+
+    started = time.perf_counter()
+    assert batcher.embed("2 bhk flat") == [1.0]
+    assert time.perf_counter() - started < 1
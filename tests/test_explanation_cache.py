@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from services import llm_explainer
+from services.cache import MISS
+from services.explanation_cache import ExplanationCache, explanation_key
+
+RESULTS = [
+    {"id": 11, "bhk": 2, "locality": "Andheri West", "price": 7500000, "area_sqft": 650},
+    {"id": 12, "bhk": 2, "locality": "Juhu", "price": 9000000, "area_sqft": 700},
+]
+
+
+def test_key_ignores_query_formatting_but_not_result_order():
+    key = explanation_key("2 BHK flat, under 80 lac", RESULTS)
+
+    assert explanation_key("2 bhk flat under 80 LAC ", RESULTS) == key
+    assert explanation_key("2 bhk flat under 80 lac", RESULTS[::-1]) != key
+
+
+def test_repeat_search_skips_llm():
+    cache = ExplanationCache(maxsize=8, ttl=60)
+
+    with patch.object(llm_explainer, "explanation_cache", cache), \
+            patch.object(llm_explainer, "get_llm_client") as mock_client:
+        mock_client.return_value.generate.return_value = "Two flats in Andheri West and Juhu."
+
+        first = llm_explainer.explain_results("2 bhk flat", RESULTS)
+        second = llm_explainer.explain_results("2 BHK flat", RESULTS)
+
+    assert first == second
+    assert mock_client.return_value.generate.call_count == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_persisted_explanations_survive_restart(tmp_path):
+    path = str(tmp_path / "explanations.db")
+    ExplanationCache(path=path).set("k", "cached text")
+
+    restarted = ExplanationCache(path=path)
+    assert restarted.get("k") == "cached text"
+    assert restarted.stats()["disk_hits"] == 1
+
+    assert ExplanationCache(path=path, ttl=-1).get("missing") is MISS
+
+
+def test_prompt_and_key_follow_the_routed_city():
+    prompt = llm_explainer.build_prompt("2 bhk flat", RESULTS, ["pune"])
+
+    assert "city of Pune" in prompt
+    assert "Mumbai" not in prompt
+    assert explanation_key("2 bhk flat", RESULTS, ["pune"]) != explanation_key("2 bhk flat", RESULTS, ["mumbai"])
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import pytest
+
+import services.gazetteer as gazetteer_module
+import services.geocoding as geocoding
+from services.gazetteer import Gazetteer, build_gazetteer, focus_locality
+
+LOCALITIES = {
+    "Andheri West": (19.1364, 72.8296),
+    "Andheri": (19.1197, 72.8468),
+    "Bandra": (19.0596, 72.8295),
+    "Navi Mumbai": (19.0330, 73.0297)
+}
+
+
+@pytest.fixture
+def gazetteer():
+    gazetteer = build_gazetteer(LOCALITIES, "Mumbai")
+    with patch.object(gazetteer_module, "_gazetteer", gazetteer):
+        yield gazetteer
+
+
+def test_finds_every_mention_in_one_pass(gazetteer):
+    mentions = gazetteer.find("2 bhk in Andheri West or Bandra, Mumbai")
+
+    assert [m["name"] for m in mentions] == ["Andheri West", "Bandra", "mumbai"]
+
+
+def test_matches_whole_words_only(gazetteer):
+    assert gazetteer.find("punetha bandrawala") == []
+
+
+def test_longest_overlapping_name_wins(gazetteer):
+    assert [m["name"] for m in gazetteer.find("navi mumbai flats")] == ["Navi Mumbai"]
+
+
+def test_resolve_location_strings(gazetteer):
+    assert gazetteer.resolve("Andheri West, Mumbai, India")["name"] == "Andheri West"
+    assert gazetteer.resolve("Mumbai, India")["kind"] == "city"
+    assert gazetteer.resolve("Andheri West, Pune, India") is None
+    assert gazetteer.resolve("Powai, Mumbai, India") is None
+
+
+def test_save_and_load_round_trip(tmp_path, gazetteer):
+    path = str(tmp_path / "gazetteer.json")
+    gazetteer.save(path)
+
+    loaded = Gazetteer.load(path)
+
+    assert len(loaded) == len(gazetteer)
+    assert loaded.resolve("bandra")["lat"] == LOCALITIES["Bandra"][0]
+
+
+def test_geocode_hit_skips_nominatim(gazetteer):
+    with patch("services.geocoding.geocode_remote") as remote:
+        assert geocoding.geocode("Bandra, Mumbai, India") == LOCALITIES["Bandra"]
+
+    remote.assert_not_called()
+
+
+def test_focus_locality_only_for_city_locations(gazetteer):
+    assert focus_locality("2 bhk in bandra", "Mumbai")["name"] == "Bandra"
+    assert focus_locality("2 bhk in bandra", "Andheri West") is None
+    assert focus_locality("2 bhk near the station", "Mumbai") is None
+
+
+def test_adding_a_city_keeps_the_others(gazetteer):
+    thane = build_gazetteer({"Majiwada": (19.2183, 72.9781)}, "Thane", gazetteer)
+
+    assert thane.resolve("Majiwada, Thane")["city"] == "thane"
+    assert thane.resolve("Andheri West, Mumbai")["city"] == "mumbai"
+    # Re-adding Mumbai replaces its localities
+    mumbai = build_gazetteer({"Powai": (19.1176, 72.9060)}, "Mumbai", thane)
+    assert mumbai.resolve("Andheri West") is None
+    assert mumbai.resolve("Majiwada")["city"] == "thane"
+
+
+def test_locality_shared_by_two_cities_keeps_both(gazetteer):
+    both = build_gazetteer({"Camp": (18.5158, 73.8800), "Kothrud": (18.5074, 73.8077)}, "Pune",
+                           build_gazetteer({"Camp": (19.0760, 72.8777), **LOCALITIES}, "Mumbai"))
+
+    assert both.resolve("Camp, Pune")["lat"] == 18.5158
+    assert both.resolve("Camp, Mumbai")["lat"] == 19.0760
+    # No city to tell them apart
+    assert both.resolve("Camp") is None
+
+    with patch.object(gazetteer_module, "_gazetteer", both):
+        assert focus_locality("flat near camp", "Pune")["city"] == "pune"
+        assert focus_locality("flat near camp", "Mumbai")["city"] == "mumbai"
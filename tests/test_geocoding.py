@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import pytest
+
+import services.gazetteer as gazetteer_module
+import services.geocoding as geocoding
+from db.geocode_cache import GeocodeCache, MISS
+from services.gazetteer import Gazetteer
+
+
+@pytest.fixture(autouse=True)
+def empty_gazetteer():
+    # Exercise the cache / Nominatim path, whatever the local gazetteer holds
+    with patch.object(gazetteer_module, "_gazetteer", Gazetteer()):
+        yield
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def use_cache(tmp_path, **kwargs):
+    cache = GeocodeCache(str(tmp_path / "geocode.db"), **kwargs)
+    return patch.object(geocoding, "_cache", cache), cache
+
+
+def test_repeat_lookup_served_from_cache(tmp_path):
+    patched, cache = use_cache(tmp_path)
+    response = FakeResponse(200, [{"lat": "19.13", "lon": "72.83"}])
+
+    with patched, patch("services.geocoding.requests.get", return_value=response) as mock_get, \
+            patch("services.geocoding._throttle"):
+        assert geocoding.geocode("Andheri West, India") == (19.13, 72.83)
+        assert geocoding.geocode("  andheri west,   INDIA ") == (19.13, 72.83)
+
+    assert mock_get.call_count == 1
+
+
+def test_not_found_is_cached_but_errors_are_not(tmp_path):
+    patched, cache = use_cache(tmp_path)
+
+    with patched, patch("services.geocoding._throttle"):
+        with patch("services.geocoding.requests.get", return_value=FakeResponse(200, [])):
+            assert geocoding.geocode("Nowhere") is None
+        assert cache.get("nowhere") is None
+
+        with patch("services.geocoding.requests.get", return_value=FakeResponse(429, [])):
+            assert geocoding.geocode("Somewhere") is None
+        assert cache.get("somewhere") is MISS
+
+
+def test_cache_persists_and_expires(tmp_path):
+    path = str(tmp_path / "geocode.db")
+    GeocodeCache(path).set("kharghar", (19.04, 73.07))
+    assert GeocodeCache(path).get("kharghar") == (19.04, 73.07)
+
+    expired = GeocodeCache(path, ttl=-1)
+    expired.set("kharghar", (19.04, 73.07))
+    assert expired.get("kharghar") is MISS
+
+
+def test_memory_layer_is_bounded(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "geocode.db"), memory_size=2)
+    for i in range(5):
+        cache.set(f"locality {i}", (19.0 + i, 72.8))
+
+    assert len(cache._memory) == 2
+    assert cache.stats()["evictions"] == 3
+    # Evicted keys are still read back from SQLite
+    assert cache.get("locality 0") == (19.0, 72.8)
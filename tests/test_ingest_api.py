@@ -1,10 +1,76 @@
+from unittest.mock import patch
+
+import pytest
 from fastapi.testclient import TestClient
+
+import services.ingest_jobs as ingest_jobs
 from main import app
 
 client = TestClient(app)
 
+RESULT = {"city": "mumbai", "collection": "properties_mumbai", "rows": 4, "added": 1, "changed": 1,
+          "unchanged": 2, "skipped": 0, "removed": 1}
+
+
+def fake_ingest(progress=None, **params):
+    progress({"rows": 2, "added": 1})
+    return RESULT
+
+
+@pytest.fixture(autouse=True)
+def no_active_job():
+    with patch.object(ingest_jobs, "_active_job", None):
+        yield
 
-def test_ingest_endpoint():
+
+@patch("api.ingest.ingest_and_reload", side_effect=fake_ingest)
+def test_ingest_runs_as_background_job(mock_ingest):
     response = client.post("/api/ingest")
-    assert response.status_code == 200
-    assert response.json()["message"] == "Use script for ingestion"
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status_url"] == f"/api/ingest/{job_id}"
+
+    _, params = mock_ingest.call_args
+    assert params["city"] == "Mumbai"
+    assert params["csv_path"].endswith("Mumbai1.csv")
+    assert params["full"] is False
+
+    status = client.get(f"/api/ingest/{job_id}").json()
+    assert status["status"] == "done"
+    assert status["progress"] == {"rows": 2, "added": 1}
+    assert status["result"] == RESULT
+
+
+@patch("api.ingest.ingest_and_reload", side_effect=RuntimeError("Qdrant unavailable"))
+def test_failed_ingest_reported(mock_ingest):
+    job_id = client.post("/api/ingest", json={"full": True}).json()["job_id"]
+
+    status = client.get(f"/api/ingest/{job_id}").json()
+    assert status["status"] == "failed"
+    assert status["error"] == "Qdrant unavailable"
+    # The failed job no longer blocks the next one
+    assert client.post("/api/ingest").status_code == 202
+
+
+def test_second_ingest_rejected_while_one_runs():
+    with patch.object(ingest_jobs, "_active_job", "abc"):
+        response = client.post("/api/ingest")
+
+    assert response.status_code == 409
+
+
+def test_csv_outside_data_dir_rejected():
+    response = client.post("/api/ingest", json={"city": "Pune", "csv": "../../requirements.txt"})
+
+    assert response.status_code == 400
+
+
+def test_other_city_needs_csv():
+    response = client.post("/api/ingest", json={"city": "Pune"})
+
+    assert response.status_code == 400
+
+
+def test_unknown_job_is_404():
+    assert client.get("/api/ingest/missing").status_code == 404
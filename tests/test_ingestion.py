@@ -0,0 +1,122 @@
+from functools import partial
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from qdrant_client import QdrantClient
+
+import db.vector_db as vector_db
+import services.ingestion as ingestion
+from db.property_store import PropertyStore
+from services.dataset_scope import load_metadata, save_city_metadata
+
+LOCALITIES = {
+    "Andheri West": (19.1364, 72.8296),
+    "Bandra West": (19.0596, 72.8295),
+    "Powai": (19.1176, 72.9060)
+}
+
+ROWS = [
+    (12_000_000, 720, "Andheri West", 2, 0, 1),
+    (25_000_000, 1100, "Bandra West", 3, 1, 1),
+    (9_500_000, 650, "Powai", 1, 0, 0),
+    (9_500_000, 650, "Powai", 1, 0, 0)
+]
+
+
+def listing_frame(rows=ROWS) -> pd.DataFrame:
+    return pd.DataFrame(
+        [(i, *row) for i, row in enumerate(rows)],
+        columns=["Unnamed: 0", "Price", "Area", "Location", "No. of Bedrooms", "New/Resale", "Gymnasium"]
+    )
+
+
+def fake_embed_batch(texts):
+    return np.ones((len(texts), vector_db.VECTOR_SIZE), dtype=np.float32)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    client = QdrantClient(":memory:")
+    metadata_path = str(tmp_path / "dataset_metadata.json")
+    with patch.multiple(vector_db, _client=client, _client_ready=True), \
+            patch.multiple(
+                ingestion,
+                PROPERTY_STORE_PATH=str(tmp_path / "store"),
+                GAZETTEER_PATH=str(tmp_path / "gazetteer.json"),
+                INGEST_MANIFEST_DIR=str(tmp_path / "manifests"),
+                save_city_metadata=partial(save_city_metadata, path=metadata_path),
+                geocode=lambda location: LOCALITIES.get(location.split(",")[0])
+            ), \
+            patch.object(ingestion, "embed_batch", side_effect=fake_embed_batch) as embed:
+        yield tmp_path, client, embed, metadata_path
+
+
+def sync(tmp_path, frame):
+    csv_path = tmp_path / "listings.csv"
+    frame.to_csv(csv_path, index=False)
+    return ingestion.run_ingest(city="Mumbai", csv_path=str(csv_path), chunk_size=2)
+
+
+def test_ids_are_stable_and_unique_for_duplicate_listings():
+    first = ingestion.row_ids(listing_frame(), "Mumbai", {})
+    again = ingestion.row_ids(listing_frame(), "Bombay", {})
+
+    assert first.equals(again)
+    assert first.is_unique
+    assert not first.equals(ingestion.row_ids(listing_frame(), "Pune", {}))
+
+
+def test_hash_ignores_csv_row_numbers_but_not_content():
+    frame = listing_frame()
+    renumbered = frame.assign(**{"Unnamed: 0": frame["Unnamed: 0"] + 10})
+    repriced = frame.assign(Price=frame["Price"] + 1)
+
+    assert (ingestion.row_hashes(frame) == ingestion.row_hashes(renumbered)).all()
+    assert not (ingestion.row_hashes(frame) == ingestion.row_hashes(repriced)).any()
+
+
+def test_first_run_ingests_every_geocoded_row(workspace):
+    tmp_path, client, embed, metadata_path = workspace
+    result = sync(tmp_path, listing_frame(ROWS + [(5_000_000, 500, "Atlantis", 1, 0, 0)]))
+
+    assert result["added"] == 4
+    assert result["skipped"] == 1
+    assert client.count(result["collection"]).count == 4
+    assert len(PropertyStore.load(str(tmp_path / "store"))) == 4
+    assert load_metadata(metadata_path)["cities"]["mumbai"]["collection"] == "properties_mumbai"
+
+
+def test_rerun_without_changes_embeds_nothing(workspace):
+    tmp_path, client, embed, _ = workspace
+    sync(tmp_path, listing_frame())
+    embed.reset_mock()
+
+    result = sync(tmp_path, listing_frame())
+
+    assert embed.call_count == 0
+    assert (result["added"], result["changed"], result["removed"], result["unchanged"]) == (0, 0, 0, 4)
+
+
+def test_only_changed_rows_are_upserted_and_removed_rows_deleted(workspace):
+    tmp_path, client, embed, _ = workspace
+    sync(tmp_path, listing_frame())
+    embed.reset_mock()
+
+    rows = list(ROWS)
+    rows[0] = (11_000_000, *rows[0][1:])          # price drop
+    del rows[1]                                    # sold
+    rows.append((30_000_000, 1500, "Bandra West", 3, 1, 1))
+    result = sync(tmp_path, listing_frame(rows))
+
+    assert (result["added"], result["changed"], result["removed"], result["unchanged"]) == (1, 1, 1, 2)
+    assert sum(len(args[0]) for args, _ in embed.call_args_list) == 2
+    assert client.count(result["collection"]).count == 4
+
+    store = PropertyStore.load(str(tmp_path / "store"))
+    prices = sorted(store.to_frame()["price"])
+    assert prices == [9_500_000, 9_500_000, 11_000_000, 30_000_000]
+    andheri = ingestion.row_ids(listing_frame(rows), "Mumbai", {})[0]
+    point = client.retrieve(result["collection"], [int(andheri)])[0]
+    assert point.payload["price"] == 11_000_000
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services import llm_explainer
+from services.llm_client import CircuitBreaker, LLMClient, LLMUnavailable
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Minimal /api/generate stand-in for a local model server."""
+
+    fail = False
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.end_headers()
+        tokens = ["2 BHK ", "in Andheri West."]
+        if body["stream"]:
+            for token in tokens:
+                self.wfile.write(json.dumps({"response": token, "done": False}).encode() + b"\n")
+            self.wfile.write(json.dumps({"response": "", "done": True}).encode() + b"\n")
+        else:
+            self.wfile.write(json.dumps({"response": "".join(tokens)}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubOllama.fail = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_generate_and_stream(stub_server):
+    client = LLMClient(stub_server, retries=0)
+
+    assert client.generate("prompt", model="llama3.2") == "2 BHK in Andheri West."
+    assert list(client.stream("prompt", model="llama3.2")) == ["2 BHK ", "in Andheri West."]
+
+
+def test_breaker_opens_after_repeated_failures(stub_server):
+    StubOllama.fail = True
+    client = LLMClient(stub_server, retries=1, breaker=CircuitBreaker(threshold=2, cooldown=60))
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailable):
+            client.generate("prompt", model="llama3.2")
+
+    assert client.breaker.is_open
+
+    # Rejected without touching the server
+    StubOllama.fail = False
+    with pytest.raises(LLMUnavailable, match="circuit breaker open"):
+        client.generate("prompt", model="llama3.2")
+
+
+def test_explainer_falls_back_to_template(monkeypatch):
+    client = LLMClient("http://127.0.0.1:9", retries=0)
+    monkeypatch.setattr(llm_explainer, "get_llm_client", lambda: client)
+
+    results = [{"bhk": 2, "locality": "Andheri West", "price": 7500000, "area_sqft": 650}]
+    explanation = llm_explainer.explain_results("2 bhk in andheri", results)
+
+    assert explanation.startswith("1 property matches your search.")
+    assert "Andheri West" in explanation
+
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        allowed = list(pool.map(lambda _: breaker.allow(), range(8)))
+    assert allowed.count(True) == 1
+
+    # The trial failed: open again for a full cooldown
+    breaker.record_failure()
+    assert breaker.is_open
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert all(breaker.allow() for _ in range(3))
+
+
+def test_waiting_for_a_busy_slot_times_out(stub_server):
+    client = LLMClient(stub_server, max_concurrency=1, timeout=0.1, retries=0)
+    # A hung call holds the only slot
+    client._slots.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailable, match="no free LLM slot"):
+        client.generate("prompt", model="llama3.2")
+    with pytest.raises(LLMUnavailable, match="no free LLM slot"):
+        list(client.stream("prompt", model="llama3.2"))
+    assert time.monotonic() - started < 1
+    # Waiting is not a server failure
+    assert not client.breaker.is_open
+
+    client._slots.release()
+    assert client.generate("prompt", model="llama3.2") == "2 BHK in Andheri West."
@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+import pytest
+
+from main import app
+from services.metrics import Histogram, STAGE_ERRORS, STAGE_LATENCY, timed
+
+client = TestClient(app)
+
+
+def test_timed_records_latency_and_errors():
+    before = STAGE_LATENCY.count(stage="unit_test")
+
+    @timed("unit_test")
+    def failing():
+        raise ValueError("boom")
+
+    with timed("unit_test"):
+        pass
+    with pytest.raises(ValueError):
+        failing()
+
+    assert STAGE_LATENCY.count(stage="unit_test") == before + 2
+    assert STAGE_ERRORS.value(stage="unit_test") >= 1
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(
+        "test_latency_seconds", "test", ["stage"], buckets=(0.1, 1.0), register=False
+    )
+    histogram.observe(0.05, stage="embed")
+    histogram.observe(0.5, stage="embed")
+    histogram.observe(5, stage="embed")
+
+    lines = histogram.render()
+    assert 'test_latency_seconds_bucket{stage="embed",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{stage="embed",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{stage="embed",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{stage="embed"} 3' in lines
+
+
+def test_metrics_endpoint_reports_rejections():
+    client.post("/api/ask", json={"query": "iron man is awesome", "location": "Mumbai"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'georag_rejections_total{reason="non_real_estate"}' in response.text
+    assert 'georag_stage_latency_seconds_count{stage="parse"}' in response.text
+    assert 'georag_cache_hits_total{cache="embedding"}' in response.text
+    assert 'georag_cache_size{cache="embedding"}' in response.text
+
+
+def test_json_metrics_endpoint_removed():
+    # /metrics is the only metrics surface
+    assert client.get("/api/metrics").status_code == 404
@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import db.property_store as property_store
+import services.spatial_index as spatial_index
+from db.property_store import PropertyStore
+
+# Point ids deliberately out of order; the store sorts them
+FRAME = pd.DataFrame({
+    "city": ["mumbai", "mumbai", "mumbai"],
+    "locality": ["Powai", "Andheri West", "Powai"],
+    "price": [12_500_000, 7_500_000, 9_000_000],
+    "bhk": [3, 1, 2],
+    "area_sqft": [1200, 500, 850],
+    "lat": [19.1176, 19.1364, 19.1190],
+    "lon": [72.9060, 72.8296, 72.9050],
+    "amenity_mask": [5, 0, 1]
+}, index=[30, 10, 20])
+
+
+def test_positions_by_id():
+    store = PropertyStore.from_frame(FRAME)
+
+    rows, found = store.positions([20, 99, 10])
+
+    assert store.ids.tolist() == [10, 20, 30]
+    assert found.tolist() == [True, False, True]
+    assert store.columns["bhk"][rows[found]].tolist() == [2, 1]
+
+
+def test_localities_stored_as_codes():
+    store = PropertyStore.from_frame(FRAME)
+
+    assert len(store.localities) == 2
+    assert store.record(0)["locality"] == "Andheri West"
+    assert store.record(2)["locality"] == "Powai"
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    PropertyStore.from_frame(FRAME).save(str(tmp_path))
+    store = PropertyStore.load(str(tmp_path))
+
+    assert isinstance(store.columns["price"], np.memmap)
+    assert store.record(1) == {
+        "city": "mumbai",
+        "locality": "Powai",
+        "price": 9_000_000.0,
+        "bhk": 2,
+        "area_sqft": 850.0,
+        "amenity_mask": 1,
+        "geo": {"lat": 19.1190, "lon": 72.9050}
+    }
+
+
+def test_frame_round_trip_merges_cities():
+    store = PropertyStore.from_frame(FRAME)
+    pune = FRAME.iloc[:1].assign(city="pune", locality="Baner").set_axis([40])
+
+    merged = PropertyStore.from_frame(pd.concat([store.to_frame(), pune]))
+
+    assert merged.ids.tolist() == [10, 20, 30, 40]
+    assert merged.record(3)["city"] == "pune"
+    assert merged.record(0)["locality"] == "Andheri West"
+
+
+def test_store_written_by_another_process_is_reloaded(tmp_path):
+    path = str(tmp_path)
+    PropertyStore.from_frame(FRAME).save(path)
+    with patch.multiple(
+        property_store,
+        PROPERTY_STORE_PATH=path,
+        STORE_CHECK_SECONDS=0,
+        _store=None,
+        _store_loaded=False,
+        _store_version=property_store._UNLOADED
+    ), patch.multiple(spatial_index, _index=None, _index_loaded=False, _index_version=spatial_index._UNBUILT):
+        assert property_store.get_property_store().ids.tolist() == [10, 20, 30]
+        assert len(spatial_index.get_spatial_index()) == 3
+
+        # An ingest elsewhere only rewrites the files; nothing in this process is reset
+        repriced = FRAME.assign(price=FRAME["price"] - 500_000)
+        new = FRAME.iloc[:1].assign(locality="Powai").set_axis([40])
+        PropertyStore.from_frame(pd.concat([repriced, new])).save(path)
+
+        store = property_store.get_property_store()
+        assert store.ids.tolist() == [10, 20, 30, 40]
+        assert store.record(0)["price"] == 7_000_000
+        ids, _ = spatial_index.get_spatial_index().radius(19.1176, 72.9060, 1)
+        assert 40 in ids.tolist()
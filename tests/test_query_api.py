@@ -1,15 +1,28 @@
 
 
+import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch
 from main import app
+import db.property_store as property_store
+import services.spatial_index as spatial_index
+import services.city_router as city_router
+from services.city_router import CityRouter
+from models.amenities import Amenity
 
 client = TestClient(app)
 
 
+CITIES = {
+    "mumbai": {"collection": "properties_mumbai", "min_lat": 18.9, "max_lat": 19.3, "min_lon": 72.8, "max_lon": 73.0},
+    "pune": {"collection": "properties_pune", "min_lat": 18.4, "max_lat": 18.6, "min_lon": 73.7, "max_lon": 74.0}
+}
+
+
 # Helpers (simple, inline)
 class FakePoint:
-    def __init__(self, score, payload):
+    def __init__(self, score, payload, id=1):
+        self.id = id
         self.score = score
         self.payload = payload
 
@@ -33,10 +46,19 @@ FAKE_VECTOR_RESULTS = FakeResults(points=[
 ])
 
 
+@pytest.fixture(autouse=True)
+def no_local_store():
+    # Results come from the fake payloads, not a store left by a local ingest
+    with patch.multiple(property_store, _store=None, _store_loaded=True), \
+            patch.multiple(spatial_index, _index=None, _index_loaded=True), \
+            patch.object(city_router, "_router", CityRouter(CITIES)):
+        yield
+
+
 # Tests
 @patch("api.query.explain_results", return_value="Nice explanation")
 @patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
-@patch("api.query.embed", return_value=[0.1] * 384)
+@patch("api.query.aembed", return_value=[0.1] * 384)
 @patch("api.query.geocode", return_value=(19.12, 72.88))
 def test_basic_real_estate_query(
     mock_geo, mock_embed, mock_search, mock_explain
@@ -61,6 +83,10 @@ def test_basic_real_estate_query(
     assert data["results"][0]["bhk"] == 1
     assert "explanation" in data
 
+    timings = response.headers["server-timing"]
+    for stage in ("geocode", "embed", "search"):
+        assert f"{stage};dur=" in timings
+
 
 def test_irrelevant_query_rejected():
     response = client.post(
@@ -92,3 +118,131 @@ def test_city_mismatch_rejected():
     assert "searched for properties in pune" in response.json()["explanation"].lower()
 
 
+@patch("api.query.explain_results", return_value="Nice explanation")
+@patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
+@patch("api.query.aembed", return_value=[0.1] * 384)
+@patch("api.query.geocode", return_value=(19.12, 72.88))
+def test_filter_modes_shape_the_search(
+    mock_geo, mock_embed, mock_search, mock_explain
+):
+    body = {"query": "1 bhk flat with gym", "location": "Mumbai"}
+
+    client.post("/api/ask", json={**body, "filter_mode": "hard"})
+    hard = mock_search.call_args.kwargs
+    assert hard["limit"] == 5
+    assert {c.key for c in hard["conditions"]} == {"bhk"}
+    assert hard["required_amenities"] == Amenity.GYMNASIUM
+
+    client.post("/api/ask", json={**body, "filter_mode": "hybrid", "candidate_pool": 40})
+    hybrid = mock_search.call_args.kwargs
+    assert hybrid["collections"] == ["properties_mumbai"]
+    assert hybrid["limit"] == 40
+    assert hybrid["conditions"] is None
+    assert hybrid["hnsw_ef"] is None and hybrid["exact"] is False
+
+    client.post("/api/ask", json={**body, "hnsw_ef": 256, "exact": True})
+    tuned = mock_search.call_args.kwargs
+    assert tuned["hnsw_ef"] == 256 and tuned["exact"] is True
+
+
+@patch("api.query.focus_locality", return_value={"name": "Bandra", "kind": "locality"})
+@patch("api.query.explain_results", return_value="Nice explanation")
+@patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
+@patch("api.query.aembed", return_value=[0.1] * 384)
+@patch("api.query.geocode", return_value=(19.06, 72.83))
+def test_locality_in_query_centres_city_search(
+    mock_geo, mock_embed, mock_search, mock_explain, mock_focus
+):
+    client.post("/api/ask", json={"query": "2 bhk flat in bandra", "location": "Mumbai"})
+
+    mock_geo.assert_called_once_with("Bandra, Mumbai, India")
+    assert mock_search.call_args.kwargs["latitude"] == 19.06
+
+
+@patch("api.query.explain_results", return_value="Nice explanation")
+@patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
+@patch("api.query.aembed", return_value=[0.1] * 384)
+@patch("api.query.geocode", return_value=(19.12, 72.88))
+def test_explanation_delivered_after_results(
+    mock_geo, mock_embed, mock_search, mock_explain
+):
+    body = {"query": "1 bhk flat in mumbai", "location": "Mumbai"}
+
+    data = client.post("/api/ask", json=body).json()
+    assert data["results"]
+    assert data["explanation"] is None
+
+    followup = client.get(data["explanation_url"]).json()
+    assert followup["status"] == "ready"
+    assert followup["explanation"] == "Nice explanation"
+
+    skipped = client.post("/api/ask", json={**body, "explanation_mode": "none"}).json()
+    assert skipped["explanation"] is None
+    assert "explanation_url" not in skipped
+    assert mock_explain.call_count == 1
+
+
+@patch("api.explain.stream_explanation", return_value=iter(["Two ", "flats found"]))
+@patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
+@patch("api.query.aembed", return_value=[0.1] * 384)
+@patch("api.query.geocode", return_value=(19.12, 72.88))
+def test_explanation_streamed_as_sse(
+    mock_geo, mock_embed, mock_search, mock_stream
+):
+    data = client.post(
+        "/api/ask",
+        json={"query": "1 bhk flat in mumbai", "location": "Mumbai", "explanation_mode": "stream"}
+    ).json()
+
+    # Generated only by the stream, so polling points there instead of staying pending
+    poll = client.get(f"/api/explain/{data['request_id']}").json()
+    assert poll["status"] == "stream_only"
+    assert poll["stream_url"] == data["explanation_url"]
+    mock_stream.assert_not_called()
+
+    stream = client.get(data["explanation_url"])
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    assert "data: Two \n\ndata: flats found\n\n" in stream.text
+    assert stream.text.endswith("event: done\ndata: \n\n")
+
+    done = client.get(f"/api/explain/{data['request_id']}").json()
+    assert (done["status"], done["explanation"]) == ("ready", "Two flats found")
+
+
+def test_unknown_explanation_request():
+    assert client.get("/api/explain/does-not-exist").status_code == 404
+
+
+@patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
+@patch("api.query.aembed", return_value=[0.1] * 384)
+@patch("api.query.geocode", return_value=(18.52, 73.85))
+def test_routes_to_city_collection_or_rejects(mock_geo, mock_embed, mock_search):
+    client.post("/api/ask", json={"query": "2 bhk flat", "location": "Pune", "explanation_mode": "none"})
+    assert mock_search.call_args.kwargs["collections"] == ["properties_pune"]
+
+    data = client.post("/api/ask", json={"query": "2 bhk flat", "location": "Delhi"}).json()
+    assert data["results"] == []
+    assert "Mumbai, Pune" in data["explanation"]
+
+
+@patch("services.llm_explainer.get_llm_client")
+@patch("api.query.geo_vector_search", return_value=FAKE_VECTOR_RESULTS)
+@patch("api.query.aembed", return_value=[0.1] * 384)
+@patch("api.query.geocode", return_value=(19.12, 72.88))
+def test_async_explanation_counts_one_cache_lookup_per_request(
+    mock_geo, mock_embed, mock_search, mock_llm
+):
+    from services.explanation_cache import ExplanationCache
+
+    mock_llm.return_value.generate.return_value = "One flat in Andheri West."
+    cache = ExplanationCache(maxsize=8, ttl=60, path=None)
+    body = {"query": "1 bhk flat in mumbai", "location": "Mumbai", "explanation_mode": "async"}
+
+    with patch("services.explanation_cache.explanation_cache", cache), \
+            patch("services.llm_explainer.explanation_cache", cache):
+        first = client.post("/api/ask", json=body).json()
+        second = client.post("/api/ask", json=body).json()
+
+    assert first["explanation"] is None
+    assert second["explanation"] == "One flat in Andheri West."
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
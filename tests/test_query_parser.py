@@ -1,4 +1,4 @@
-from services.query_parser import parse_query
+from services.query_parser import extract, parse_query
 
 
 def test_parse_bhk_and_price_lakh():
@@ -25,3 +25,37 @@ def test_parse_no_filters():
     assert result["bhk"] is None
     assert result["max_price"] is None
     assert result["require_gym"] is False
+
+
+def test_parse_price_range():
+    result = parse_query("2bhk 50-80 lac in andheri")
+
+    assert result["bhk"] == 2
+    assert result["min_price"] == 5000000
+    assert result["max_price"] == 8000000
+
+
+def test_parse_mixed_unit_range():
+    result = parse_query("flats from 50 lakh to 1.2 cr")
+
+    assert result["min_price"] == 5000000
+    assert result["max_price"] == 12000000
+
+
+def test_parse_under_without_unit():
+    assert parse_query("flat under 80")["max_price"] == 8000000
+    assert parse_query("flat within 5 km of station")["max_price"] is None
+
+
+def test_extract_intent_and_city():
+    assert extract("iron man is awesome")["is_real_estate"] is False
+    assert extract("rentals in bombay")["city"] == "mumbai"
+    # Keywords match whole words only
+    assert extract("punetha apartments")["city"] is None
+
+
+def test_parse_amenities():
+    result = parse_query("apartment with swimming pool and lift")
+
+    assert result["amenities"] == ["Swimming Pool", "Lift Available"]
+    assert result["require_gym"] is False
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+
+def test_not_ready_until_model_and_db_loaded():
+    with patch("services.warmup.model_loaded", return_value=True), \
+            patch("services.warmup.client_ready", return_value=False):
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["model"] is True
+    assert response.json()["vector_db"] is False
+
+
+def test_ready_once_loaded():
+    with patch("services.warmup.model_loaded", return_value=True), \
+            patch("services.warmup.client_ready", return_value=True):
+        response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
@@ -0,0 +1,108 @@
+import pandas as pd
+
+from db.property_store import PropertyStore
+from models.amenities import Amenity
+from services.relevance import RelevanceWeights, rerank
+
+
+class FakePoint:
+    def __init__(self, id, score, payload):
+        self.id = id
+        self.score = score
+        self.payload = payload
+
+
+def make_points():
+    return [
+        FakePoint(1, 0.80, {"bhk": 1, "price": 9_000_000, "amenities": []}),
+        FakePoint(2, 0.75, {"bhk": 2, "price": 7_000_000, "amenities": ["Gymnasium"]}),
+        FakePoint(3, 0.70, {"bhk": 2, "price": 6_000_000, "amenity_mask": int(Amenity.SWIMMING_POOL)}),
+    ]
+
+
+def test_boosts_reorder_candidates():
+    results = rerank(make_points(), bhk=2, max_price=8_000_000, amenities=Amenity.GYMNASIUM)
+
+    assert [r["id"] for r in results] == [2, 3, 1]
+    assert results[0]["score"] == 1.15
+    assert results[0]["reason"] == "2 BHK matched, Within budget, Gym available"
+    assert results[2]["reason"] == "Different BHK, Above budget, No gym"
+
+
+def test_only_top_k_returned():
+    results = rerank(make_points(), top_k=2)
+
+    assert [r["id"] for r in results] == [1, 2]
+    assert results[0]["reason"] == "Semantically relevant"
+
+
+def test_price_range_and_distance_decay():
+    weights = RelevanceWeights(distance=0.2, distance_decay_km=1.0)
+    results = rerank(
+        make_points(), min_price=6_500_000, max_price=8_000_000,
+        distances=[10.0, 0.0, 0.5], weights=weights
+    )
+
+    assert results[0]["id"] == 2
+    assert results[0]["distance_km"] == 0.0
+    assert "Below budget" in next(r["reason"] for r in results if r["id"] == 3)
+
+
+def test_all_requested_amenities_as_one_mask():
+    wanted = Amenity.GYMNASIUM | Amenity.SWIMMING_POOL
+    points = make_points() + [FakePoint(4, 0.5, {"amenity_mask": int(wanted | Amenity.CLUBHOUSE)})]
+
+    results = rerank(points, amenities=wanted, top_k=4)
+
+    by_id = {r["id"]: r for r in results}
+    assert by_id[4]["reason"] == "All amenities available"
+    assert by_id[4]["amenities"] == ["Gymnasium", "Clubhouse", "Swimming Pool"]
+    assert by_id[2]["reason"] == "Missing Swimming Pool"
+
+
+def test_empty_batch():
+    assert rerank([]) == []
+
+
+def test_hydrates_from_property_store():
+    frame = pd.DataFrame({
+        "city": ["mumbai", "mumbai"],
+        "locality": ["Andheri West", "Bandra West"],
+        "price": [9_000_000, 7_000_000],
+        "bhk": [1, 2],
+        "area_sqft": [550, 800],
+        "lat": [19.13, 19.06],
+        "lon": [72.83, 72.83],
+        "amenity_mask": [0, int(Amenity.GYMNASIUM)]
+    }, index=[1, 2])
+    points = [FakePoint(1, 0.80, None), FakePoint(2, 0.75, None), FakePoint(99, 0.70, None)]
+
+    results = rerank(
+        points, bhk=2, amenities=Amenity.GYMNASIUM, store=PropertyStore.from_frame(frame)
+    )
+
+    assert [r["id"] for r in results] == [2, 1, 99]
+    assert results[0]["locality"] == "Bandra West"
+    assert results[0]["amenities"] == ["Gymnasium"]
+    assert results[0]["reason"] == "2 BHK matched, Gym available"
+    # Not in the store: scored as unknown, no fields
+    assert results[2]["locality"] is None
+
+
+def test_ids_missing_from_store_use_their_payloads():
+    frame = pd.DataFrame({
+        "city": ["mumbai"], "locality": ["Andheri West"], "price": [9_000_000], "bhk": [1],
+        "area_sqft": [550], "lat": [19.13], "lon": [72.83], "amenity_mask": [0]
+    }, index=[1])
+    # 7 was ingested after this store was loaded
+    new = FakePoint(7, 0.70, {"bhk": 2, "price": 6_000_000, "locality": "Powai",
+                              "amenity_mask": int(Amenity.GYMNASIUM)})
+
+    results = rerank(
+        [FakePoint(1, 0.80, None), new], bhk=2, amenities=Amenity.GYMNASIUM,
+        store=PropertyStore.from_frame(frame)
+    )
+
+    assert [r["id"] for r in results] == [7, 1]
+    assert results[0]["locality"] == "Powai"
+    assert results[0]["reason"] == "2 BHK matched, Gym available"
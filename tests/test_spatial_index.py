@@ -0,0 +1,49 @@
+import numpy as np
+
+from services.spatial_index import SpatialIndex, haversine_km
+
+# Andheri West, then points roughly 3 km, 30 km and 1,150 km (Delhi) away
+IDS = [1, 2, 3, 4]
+LATS = [19.1364, 19.1634, 19.4064, 28.6139]
+LONS = [72.8296, 72.8296, 72.8296, 77.2090]
+
+
+def test_radius_returns_nearest_first():
+    index = SpatialIndex(IDS, LATS, LONS)
+
+    ids, distances = index.radius(19.1364, 72.8296, 10)
+
+    assert ids.tolist() == [1, 2]
+    assert distances[0] == 0
+    assert 2.5 < distances[1] < 3.5
+
+
+def test_radius_matches_full_scan():
+    rng = np.random.default_rng(0)
+    lats = 19.1 + rng.uniform(-0.3, 0.3, 2000)
+    lons = 72.9 + rng.uniform(-0.3, 0.3, 2000)
+    index = SpatialIndex(np.arange(2000), lats, lons)
+
+    ids, _ = index.radius(19.1, 72.9, 7.5)
+    expected = np.flatnonzero(haversine_km(19.1, 72.9, lats, lons) <= 7.5)
+
+    assert sorted(ids.tolist()) == expected.tolist()
+
+
+def test_nearest_grows_past_the_first_cells():
+    index = SpatialIndex(IDS, LATS, LONS)
+
+    ids, _ = index.nearest(19.1364, 72.8296, 4)
+
+    assert ids.tolist() == [1, 2, 3, 4]
+
+
+def test_distances_by_id(tmp_path):
+    path = str(tmp_path / "spatial.npz")
+    SpatialIndex(IDS, LATS, LONS).save(path)
+    index = SpatialIndex.load(path)
+
+    distances = index.distances(19.1364, 72.8296, [2, 99])
+
+    assert 2.5 < distances[0] < 3.5
+    assert np.isnan(distances[1])
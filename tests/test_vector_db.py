@@ -0,0 +1,276 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+import db.property_store as property_store
+import db.vector_db as vector_db
+import services.spatial_index as spatial_index
+from models.amenities import Amenity
+from services.spatial_index import SpatialIndex
+from db.property_store import PropertyStore
+
+# Andheri West and two points roughly 3 km and 30 km away
+CENTER = (19.1364, 72.8296)
+POINTS = [
+    (1, 19.1364, 72.8296),
+    (2, 19.1634, 72.8296),
+    (3, 19.4064, 72.8296),
+]
+MASKS = {
+    1: int(Amenity.LIFT_AVAILABLE),
+    2: int(Amenity.GYMNASIUM),
+    3: int(Amenity.GYMNASIUM | Amenity.SWIMMING_POOL)
+}
+
+
+def use_client(client):
+    return patch.multiple(vector_db, _client=client, _client_ready=True)
+
+
+def no_spatial_index():
+    return patch.multiple(spatial_index, _index=None, _index_loaded=True)
+
+
+def use_store(store):
+    return patch.multiple(property_store, _store=store, _store_loaded=True)
+
+
+@pytest.fixture
+def local_client():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=vector_db.COLLECTION_NAME,
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    client.upsert(
+        collection_name=vector_db.COLLECTION_NAME,
+        points=[
+            PointStruct(
+                id=pid,
+                vector=[1.0, 0.1 * pid],
+                payload={
+                    "geo": {"lat": lat, "lon": lon},
+                    "bhk": pid,
+                    "price": pid * 4_000_000,
+                    "amenity_mask": MASKS[pid]
+                }
+            )
+            for pid, lat, lon in POINTS
+        ]
+    )
+    with use_client(client), no_spatial_index(), use_store(None):
+        yield client
+
+
+def test_geo_filter_limits_results_to_radius(local_client):
+    results = vector_db.geo_vector_search([1.0, 0.0], *CENTER, radius_km=5, limit=2)
+
+    assert {p.id for p in results.points} == {1, 2}
+
+
+def test_hard_conditions_applied_with_geo_filter(local_client):
+    conditions = vector_db.preference_conditions(bhk=2, max_price=9_000_000)
+    results = vector_db.geo_vector_search([1.0, 0.0], *CENTER, radius_km=50, conditions=conditions)
+
+    assert [p.id for p in results.points] == [2]
+
+
+def test_price_range_condition(local_client):
+    conditions = vector_db.preference_conditions(min_price=5_000_000, max_price=10_000_000)
+    results = vector_db.geo_vector_search([1.0, 0.0], *CENTER, radius_km=50, conditions=conditions)
+
+    assert [p.id for p in results.points] == [2]
+
+
+def test_spatial_index_preselects_candidate_ids(local_client):
+    index = SpatialIndex(
+        [pid for pid, _, _ in POINTS],
+        [lat for _, lat, _ in POINTS],
+        [lon for _, _, lon in POINTS]
+    )
+    with patch.multiple(spatial_index, _index=index, _index_loaded=True):
+        query_filter, _ = vector_db.spatial_filter(*CENTER, 5)
+        results = vector_db.geo_vector_search([1.0, 0.0], *CENTER, radius_km=5, limit=2)
+
+    assert sorted(query_filter.must[0].has_id) == [1, 2]
+    assert {p.id for p in results.points} == {1, 2}
+
+
+def test_amenities_filtered_by_mask(local_client):
+    wanted = Amenity.GYMNASIUM | Amenity.SWIMMING_POOL
+    results = vector_db.geo_vector_search(
+        [1.0, 0.0], *CENTER, radius_km=50, limit=3, required_amenities=wanted
+    )
+
+    assert [p.id for p in results.points] == [3]
+
+
+def test_amenities_filtered_by_spatial_index(local_client):
+    index = SpatialIndex(
+        [pid for pid, _, _ in POINTS],
+        [lat for _, lat, _ in POINTS],
+        [lon for _, _, lon in POINTS],
+        masks=[MASKS[pid] for pid, _, _ in POINTS]
+    )
+    with patch.multiple(spatial_index, _index=index, _index_loaded=True):
+        query_filter, applied = vector_db.spatial_filter(*CENTER, 50, required_amenities=Amenity.GYMNASIUM)
+
+    assert applied
+    assert sorted(query_filter.must[0].has_id) == [2, 3]
+
+
+def test_radius_expands_when_too_few_results(local_client):
+    results = vector_db.geo_vector_search([1.0, 0.0], *CENTER, radius_km=1, limit=3)
+
+    assert {p.id for p in results.points} == {1, 2, 3}
+
+
+def test_falls_back_to_semantic_search_outside_dataset(local_client):
+    results = vector_db.geo_vector_search([1.0, 0.0], 28.61, 77.21, radius_km=5, limit=2)
+
+    assert len(results.points) == 2
+
+
+@pytest.fixture
+def empty_client():
+    client = QdrantClient(":memory:")
+    with use_client(client):
+        yield client
+
+
+def test_ensure_collection_is_idempotent(empty_client):
+    vector_db.ensure_collection()
+    vector_db.insert([PointStruct(id=1, vector=[0.1] * vector_db.VECTOR_SIZE, payload={})])
+    vector_db.ensure_collection()
+
+    assert vector_db.alias_target() == vector_db.versioned_name(1)
+    assert vector_db.debug_count().count == 1
+
+
+def test_ensure_collection_rejects_wrong_vector_size(empty_client):
+    empty_client.create_collection(
+        collection_name=vector_db.COLLECTION_NAME,
+        vectors_config=VectorParams(size=768, distance=Distance.COSINE)
+    )
+
+    with pytest.raises(RuntimeError):
+        vector_db.ensure_collection()
+
+
+def test_rebuild_swaps_alias_to_new_version(empty_client):
+    vector_db.ensure_collection()
+    new_collection = vector_db.create_next_version()
+    vector_db.insert(
+        [PointStruct(id=7, vector=[0.1] * vector_db.VECTOR_SIZE, payload={})],
+        new_collection
+    )
+    vector_db.swap_alias(new_collection, drop_previous=True)
+
+    assert new_collection == vector_db.versioned_name(2)
+    assert vector_db.alias_target() == new_collection
+    assert vector_db.debug_count().count == 1
+    assert not empty_client.collection_exists(vector_db.versioned_name(1))
+
+
+def test_results_hydrate_from_property_store(local_client):
+    # Store masks disagree with the payloads, so the filter must have read the store
+    frame = pd.DataFrame({
+        "city": ["mumbai"] * 3,
+        "locality": ["A", "B", "C"],
+        "price": [4e6, 8e6, 12e6],
+        "bhk": [1, 2, 3],
+        "area_sqft": [500, 800, 1200],
+        "lat": [lat for _, lat, _ in POINTS],
+        "lon": [lon for _, _, lon in POINTS],
+        "amenity_mask": [int(Amenity.GYMNASIUM), 0, 0]
+    }, index=[pid for pid, _, _ in POINTS])
+
+    with use_store(PropertyStore.from_frame(frame)):
+        results = vector_db.geo_vector_search(
+            [1.0, 0.0], *CENTER, radius_km=50, limit=3, required_amenities=Amenity.GYMNASIUM
+        )
+
+    assert [p.id for p in results.points] == [1]
+    assert results.points[0].payload is None
+
+
+def test_ids_missing_from_store_fetch_their_payloads(local_client):
+    # Point 3 was upserted by an ingest whose store this process hasn't loaded
+    frame = pd.DataFrame({
+        "city": ["mumbai"] * 2,
+        "locality": ["A", "B"],
+        "price": [4e6, 8e6],
+        "bhk": [1, 2],
+        "area_sqft": [500, 800],
+        "lat": [lat for _, lat, _ in POINTS[:2]],
+        "lon": [lon for _, _, lon in POINTS[:2]],
+        "amenity_mask": [0, 0]
+    }, index=[1, 2])
+
+    with use_store(PropertyStore.from_frame(frame)):
+        results = vector_db.geo_vector_search(
+            [1.0, 0.0], *CENTER, radius_km=50, limit=3, required_amenities=Amenity.SWIMMING_POOL
+        )
+
+    assert [p.id for p in results.points] == [3]
+    assert results.points[0].payload["price"] == 12_000_000
+
+
+def test_client_opened_and_bootstrapped_on_first_use():
+    metadata = {"cities": {"pune": {"collection": "properties_pune"}}}
+    with patch.multiple(vector_db, _client=None, _client_ready=False, QDRANT_URL=None), \
+            patch.object(vector_db, "QdrantClient", lambda **kwargs: QdrantClient(":memory:")), \
+            patch("services.dataset_scope.load_metadata", return_value=metadata):
+        assert not vector_db.client_ready()
+
+        client = vector_db.get_client()
+
+        assert vector_db.get_client() is client
+        assert vector_db.client_ready()
+        assert vector_db.alias_target("properties_pune") == vector_db.versioned_name(1, "properties_pune")
+        # Nothing is routed to the default alias any more
+        assert not client.collection_exists(vector_db.COLLECTION_NAME)
+
+
+def test_collection_profiles():
+    default = vector_db.COLLECTION_PROFILES["default"]
+    scalar_disk = vector_db.COLLECTION_PROFILES["scalar-disk"]
+
+    config = scalar_disk.collection_config()
+    params = scalar_disk.search_params(hnsw_ef=128)
+
+    assert config["vectors_config"].on_disk is True
+    assert config["quantization_config"].scalar.always_ram is True
+    assert params.hnsw_ef == 128
+    assert params.quantization.rescore is True
+    # Nothing to tune: no params at all
+    assert default.search_params() is None
+    assert default.search_params(exact=True).exact is True
+
+
+def test_collection_created_with_profile(empty_client):
+    vector_db.create_collection("tuned", vector_db.COLLECTION_PROFILES["scalar-disk"])
+
+    assert empty_client.get_collection("tuned").config.params.vectors.on_disk is True
+
+
+def test_search_merges_city_collections(local_client):
+    local_client.create_collection(
+        collection_name="properties_pune",
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    local_client.upsert(
+        collection_name="properties_pune",
+        points=[PointStruct(id=9, vector=[1.0, 0.0], payload={"geo": {"lat": CENTER[0], "lon": CENTER[1]}})]
+    )
+
+    results = vector_db.geo_vector_search(
+        [1.0, 0.0], *CENTER, radius_km=50, limit=2,
+        collections=[vector_db.COLLECTION_NAME, "properties_pune"]
+    )
+
+    # The exact match from the second collection ranks first
+    assert [p.id for p in results.points] == [9, 1]